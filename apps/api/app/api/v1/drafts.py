@@ -10,6 +10,7 @@
 from app.schemas.draft import (
     DraftResponse,
     DraftListResponse,
+    DraftRegenerationRequest,
     DraftRevisionRequest
 )
 from app.schemas.user import User
@@ -85,17 +86,36 @@ async def get_draft(
 @router.post("/{draft_id}/regenerate", response_model=DraftResponse)
 async def regenerate_draft(
     draft_id: str,
+    regeneration: Optional[DraftRegenerationRequest] = None,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Regenerate a draft
+    Regenerate a draft, or only the selected sections, introduction, conclusion or takeaways
     """
     try:
+        regeneration = regeneration or DraftRegenerationRequest()
         draft_service = DraftService()
-        # TODO: Implement draft regeneration logic
+        draft = await draft_service.regenerate_draft(
+            draft_id=draft_id,
+            user_id=current_user.id,
+            sections=regeneration.sections,
+            introduction=regeneration.introduction,
+            conclusion=regeneration.conclusion,
+            key_takeaways=regeneration.key_takeaways,
+            changed_sections=regeneration.changed_sections
+        )
+        if not draft:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Draft not found"
+            )
+        return draft
+    except HTTPException:
+        raise
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Draft regeneration not yet implemented"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     except Exception as e:
         raise HTTPException(
@@ -3,14 +3,15 @@
 Endpoints for audio transcription and diarization
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from typing import List
 
 from app.core.auth import get_current_user
 from app.schemas.transcript import (
     TranscriptResponse,
     TranscriptListResponse,
-    TranscriptSegmentResponse
+    TranscriptSegmentResponse,
+    TranscriptionRetryResponse
 )
 from app.schemas.user import User
 from app.services.transcripts import TranscriptService
@@ -80,21 +81,36 @@ async def get_transcript_segments(
             detail=f"Failed to get segments: {str(e)}"
         )
 
-@router.post("/episodes/{episode_id}/transcript/retry")
+@router.post(
+    "/episodes/{episode_id}/transcript/retry",
+    response_model=TranscriptionRetryResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def retry_transcription(
     episode_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Retry transcription for an episode
+    Retry transcription for an episode in the background, resuming from completed chunks
     """
     try:
         transcript_service = TranscriptService()
-        # TODO: Implement retry logic
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Transcription retry not yet implemented"
+        retry = await transcript_service.retry_transcription(
+            episode_id=episode_id,
+            user_id=current_user.id
         )
+        if not retry:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Episode not found"
+            )
+        # Long episodes outlive proxy timeouts; progress arrives over the episode WebSocket
+        if not retry["already_running"]:
+            background_tasks.add_task(transcript_service.resume_transcription, episode_id, current_user.id)
+        return retry
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
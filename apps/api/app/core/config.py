@@ -54,11 +54,40 @@ class Settings(BaseSettings):
     ANTHROPIC_MODEL: str = Field(default="claude-3-sonnet-20240229", env="ANTHROPIC_MODEL")
     HUGGINGFACE_TOKEN: Optional[str] = Field(default=None, env="HUGGINGFACE_TOKEN")
     
+    GENERATION_PARALLEL: bool = Field(default=True, env="GENERATION_PARALLEL")  # Fan out section/intro/conclusion calls
+    GENERATION_MAX_CONCURRENCY: int = Field(default=4, env="GENERATION_MAX_CONCURRENCY")
+    GENERATION_REQUESTS_PER_MINUTE: Optional[int] = Field(default=None, env="GENERATION_REQUESTS_PER_MINUTE")
+    GENERATION_STREAMING: bool = Field(default=True, env="GENERATION_STREAMING")  # Stream draft text over WebSocket
+    GENERATION_STREAM_FLUSH_MS: int = Field(default=50, env="GENERATION_STREAM_FLUSH_MS")  # Delta coalescing interval
+    
+    EMBEDDING_MODEL: str = Field(default="text-embedding-ada-002", env="EMBEDDING_MODEL")
+    EMBEDDING_BATCH_SIZE: int = Field(default=512, env="EMBEDDING_BATCH_SIZE")  # Texts per API request
+    EMBEDDING_BATCH_WAIT_MS: int = Field(default=20, env="EMBEDDING_BATCH_WAIT_MS")  # How long to wait for a batch to fill
+    EMBEDDING_MAX_CONCURRENCY: int = Field(default=4, env="EMBEDDING_MAX_CONCURRENCY")
+    EMBEDDING_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024, env="EMBEDDING_CACHE_MAX_BYTES")  # 256MB in-process
+    EMBEDDING_CACHE_TTL: int = Field(default=90 * 24 * 3600, env="EMBEDDING_CACHE_TTL")  # 90 days in Redis
+    RETRIEVAL_BACKEND: str = Field(default="numpy", env="RETRIEVAL_BACKEND")  # numpy (in-process) or pgvector
+    RETRIEVAL_HYBRID: bool = Field(default=True, env="RETRIEVAL_HYBRID")  # Fuse BM25 keyword matches with vector search
+    RETRIEVAL_RRF_K: int = Field(default=60, env="RETRIEVAL_RRF_K")  # Reciprocal-rank fusion constant
+    RETRIEVAL_MMR_DIVERSITY: float = Field(default=0.3, env="RETRIEVAL_MMR_DIVERSITY")  # 0 = plain top-k per section
+    RETRIEVAL_REUSE_PENALTY: float = Field(default=0.5, env="RETRIEVAL_REUSE_PENALTY")  # Per section already citing a passage
+    SECTION_CONTEXT_TOKENS: int = Field(default=1500, env="SECTION_CONTEXT_TOKENS")  # Transcript tokens per section prompt
+    TAKEAWAYS_CONTEXT_TOKENS: int = Field(default=6000, env="TAKEAWAYS_CONTEXT_TOKENS")  # Transcript tokens for key takeaways
+    SUMMARY_WINDOW_TOKENS: int = Field(default=3000, env="SUMMARY_WINDOW_TOKENS")  # Transcript tokens per map call
+    SUMMARY_REDUCE_TOKENS: int = Field(default=6000, env="SUMMARY_REDUCE_TOKENS")  # Summary tokens merged per reduce call
+    SUMMARY_WINDOW_MS: int = Field(default=10 * 60 * 1000, env="SUMMARY_WINDOW_MS")  # Timeline span per map call; edits stay inside their span
+    SUMMARY_CACHE_TTL: int = Field(default=30 * 24 * 3600, env="SUMMARY_CACHE_TTL")  # 30 days
+    LLM_CACHE_ENABLED: bool = Field(default=True, env="LLM_CACHE_ENABLED")  # Reuse responses to identical prompts
+    LLM_CACHE_TTL: int = Field(default=7 * 24 * 3600, env="LLM_CACHE_TTL")  # 7 days
+    LLM_CACHE_MAX_ENTRY_BYTES: int = Field(default=64 * 1024, env="LLM_CACHE_MAX_ENTRY_BYTES")
+    
     # Storage
     STORAGE_BUCKET: str = Field(..., env="STORAGE_BUCKET")
     STORAGE_REGION: str = Field(default="us-east-1", env="STORAGE_REGION")
     AWS_ACCESS_KEY_ID: Optional[str] = Field(default=None, env="AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY: Optional[str] = Field(default=None, env="AWS_SECRET_ACCESS_KEY")
+    STORAGE_ENDPOINT_URL: Optional[str] = Field(default=None, env="STORAGE_ENDPOINT_URL")  # MinIO/S3-compatible
+    STORAGE_RANGE_BYTES: int = Field(default=8 * 1024 * 1024, env="STORAGE_RANGE_BYTES")  # 8MB ranged reads
     
     # Email
     SMTP_URL: Optional[str] = Field(default=None, env="SMTP_URL")
@@ -100,6 +129,45 @@ class Settings(BaseSettings):
     TRANSCRIPTION_TIMEOUT: int = Field(default=3600, env="TRANSCRIPTION_TIMEOUT")  # 1 hour
     DRAFT_GENERATION_TIMEOUT: int = Field(default=1800, env="DRAFT_GENERATION_TIMEOUT")  # 30 minutes
     
+    # Chunked Transcription
+    TRANSCRIPTION_CHUNKING_ENABLED: bool = Field(default=True, env="TRANSCRIPTION_CHUNKING_ENABLED")
+    TRANSCRIPTION_CHUNK_SECONDS: int = Field(default=600, env="TRANSCRIPTION_CHUNK_SECONDS")  # 10 minutes
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: int = Field(default=5, env="TRANSCRIPTION_CHUNK_OVERLAP_SECONDS")
+    AUDIO_WORK_DIR: Optional[str] = Field(default=None, env="AUDIO_WORK_DIR")  # Decoded audio scratch space
+    AUDIO_CACHE_DIR: Optional[str] = Field(default=None, env="AUDIO_CACHE_DIR")  # Preprocessed audio, keyed by content hash
+    AUDIO_CACHE_MAX_BYTES: int = Field(default=5 * 1024 * 1024 * 1024, env="AUDIO_CACHE_MAX_BYTES")  # 5GB
+    AUDIO_TRIM_SILENCE: bool = Field(default=True, env="AUDIO_TRIM_SILENCE")
+    ASR_UPLOAD_FORMAT: str = Field(default="ogg", env="ASR_UPLOAD_FORMAT")
+    ASR_UPLOAD_CODEC: Optional[str] = Field(default="libopus", env="ASR_UPLOAD_CODEC")
+    ASR_UPLOAD_BITRATE: str = Field(default="32k", env="ASR_UPLOAD_BITRATE")
+    VAD_ENABLED: bool = Field(default=True, env="VAD_ENABLED")  # Skip music beds and dead air before ASR
+    VAD_ENERGY_OFFSET_DB: float = Field(default=12.0, env="VAD_ENERGY_OFFSET_DB")
+    VAD_MIN_SILENCE_MS: int = Field(default=1000, env="VAD_MIN_SILENCE_MS")
+    VAD_PADDING_MS: int = Field(default=300, env="VAD_PADDING_MS")
+    ASR_BACKEND: str = Field(default="openai", env="ASR_BACKEND")  # openai or local (needs ENABLE_WHISPER_ASR)
+    LOCAL_WHISPER_MODEL: str = Field(default="small", env="LOCAL_WHISPER_MODEL")
+    LOCAL_WHISPER_WORKERS: int = Field(default=1, env="LOCAL_WHISPER_WORKERS")
+    LOCAL_WHISPER_BATCH_SIZE: int = Field(default=4, env="LOCAL_WHISPER_BATCH_SIZE")  # Windows decoded together per worker
+    LOCAL_WHISPER_QUANTIZE: bool = Field(default=True, env="LOCAL_WHISPER_QUANTIZE")  # int8 dynamic quantization
+    TRANSCRIPTION_CHECKPOINTS_ENABLED: bool = Field(default=True, env="TRANSCRIPTION_CHECKPOINTS_ENABLED")  # Resume failed runs per chunk
+    TRANSCRIPTION_CHECKPOINT_TTL: int = Field(default=7 * 24 * 3600, env="TRANSCRIPTION_CHECKPOINT_TTL")  # 7 days
+    TRANSCRIPTION_CACHE_BACKEND: str = Field(default="redis", env="TRANSCRIPTION_CACHE_BACKEND")  # redis, disk or none
+    TRANSCRIPTION_CACHE_DIR: Optional[str] = Field(default=None, env="TRANSCRIPTION_CACHE_DIR")
+    TRANSCRIPTION_CACHE_MAX_BYTES: int = Field(default=1024 * 1024 * 1024, env="TRANSCRIPTION_CACHE_MAX_BYTES")  # 1GB
+    TRANSCRIPTION_CACHE_TTL: int = Field(default=30 * 24 * 3600, env="TRANSCRIPTION_CACHE_TTL")  # 30 days
+    TRANSCRIPTION_MAX_UPLOAD_BYTES: int = Field(default=25 * 1024 * 1024, env="TRANSCRIPTION_MAX_UPLOAD_BYTES")  # 25MB API limit
+    
+    # Topic Labeling
+    TOPIC_BATCH_SIZE: int = Field(default=40, env="TOPIC_BATCH_SIZE")
+    TOPIC_MAX_CONCURRENT_BATCHES: int = Field(default=4, env="TOPIC_MAX_CONCURRENT_BATCHES")
+    TOPIC_ENGINE: str = Field(default="llm", env="TOPIC_ENGINE")  # llm, local
+    TOPIC_WINDOW_SEGMENTS: int = Field(default=6, env="TOPIC_WINDOW_SEGMENTS")
+    TOPIC_KEYWORDS: int = Field(default=3, env="TOPIC_KEYWORDS")
+    
+    # Diarization
+    DIARIZATION_MODEL: str = Field(default="pyannote/speaker-diarization-3.1", env="DIARIZATION_MODEL")
+    DIARIZATION_WORKERS: int = Field(default=1, env="DIARIZATION_WORKERS")
+    
     # Monitoring
     ENABLE_METRICS: bool = Field(default=True, env="ENABLE_METRICS")
     METRICS_PORT: int = Field(default=9090, env="METRICS_PORT")
@@ -19,6 +19,8 @@
 from app.core.logging import setup_logging
 from app.core.database import init_db
 from app.core.cache import init_cache
+from app.services.ai.diarization_worker import shutdown_diarization_pool
+from app.services.ai.whisper_worker import shutdown_whisper_pool
 
 # Setup logging
 setup_logging()
@@ -44,6 +46,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down EchoPress AI Backend...")
+    
+    # Stop model worker processes so they do not outlive the API
+    shutdown_diarization_pool()
+    shutdown_whisper_pool()
+    logger.info("Worker pools stopped")
 
 # Create FastAPI application
 app = FastAPI(
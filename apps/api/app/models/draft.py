@@ -19,6 +19,7 @@ class Draft(Base):
     status = Column(String, default="draft")  # draft, generating, completed, published
     seo_data = Column(JSON)  # SEO metadata and scores
     citations = Column(JSON)  # Citation data
+    generation_state = Column(JSON)  # Structured draft the markdown was rendered from, for partial regeneration
     brand_voice_id = Column(String, ForeignKey("brand_voices.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -6,6 +6,7 @@
 from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Float, JSON, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
 from app.core.database import Base
 
 class Transcript(Base):
@@ -17,6 +18,7 @@ class Transcript(Base):
     language = Column(String, default="en")
     confidence = Column(Float)
     diarization_data = Column(JSON)  # Speaker diarization information
+    topic_spans = Column(JSON)  # Multi-segment topic spans, used to scope section retrieval
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -34,7 +36,8 @@ class TranscriptSegment(Base):
     speaker = Column(String)
     text = Column(Text, nullable=False)
     confidence = Column(Float)
-    vector = Column(String)  # pgvector embedding
+    vector = Column(Vector(1536))  # pgvector embedding
+    vector_hash = Column(String)  # sha256 of embedding model + text, detects stale vectors
     topic = Column(String)
     
     # Relationships
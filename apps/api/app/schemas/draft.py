@@ -76,3 +76,11 @@ class DraftRevisionRequest(BaseModel):
     tone: Optional[str] = Field(None, description="Desired tone")
     length: Optional[str] = Field(None, description="Desired length")
     structure: Optional[str] = Field(None, description="Desired structure")
+
+class DraftRegenerationRequest(BaseModel):
+    """Request to regenerate parts of a draft; an empty selection regenerates the whole draft"""
+    sections: List[int] = Field(default_factory=list, description="Zero-based indices of sections to rewrite")
+    introduction: bool = Field(False, description="Rewrite the introduction")
+    conclusion: bool = Field(False, description="Rewrite the conclusion")
+    key_takeaways: bool = Field(False, description="Re-extract the key takeaways")
+    changed_sections: bool = Field(False, description="Rewrite sections whose cited transcript segments were edited")
@@ -37,6 +37,7 @@ class TranscriptBase(BaseModel):
     language: str = Field(..., description="Language code")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Overall confidence score")
     diarization_data: Optional[Dict[str, Any]] = Field(None, description="Speaker diarization data")
+    topic_spans: Optional[List[Dict[str, Any]]] = Field(None, description="Contiguous topic spans with start_ms, end_ms and topic")
 
 class TranscriptCreate(TranscriptBase):
     """Create transcript"""
@@ -58,6 +59,12 @@ class TranscriptResponse(TranscriptBase):
     class Config:
         from_attributes = True
 
+class TranscriptionRetryResponse(BaseModel):
+    """Accepted transcription retry"""
+    episode_id: str = Field(..., description="Episode being transcribed")
+    status: str = Field(..., description="Episode status while the retry runs")
+    already_running: bool = Field(False, description="A retry for this episode was already in progress")
+
 class TranscriptListResponse(BaseModel):
     """List of transcripts response"""
     transcripts: List[TranscriptResponse] = Field(..., description="List of transcripts")
@@ -0,0 +1,79 @@
+"""
+EchoPress AI Backend - ASR Backends
+Pluggable speech recognition engines returning verbose_json-shaped results
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+import openai
+
+from app.services.ai.audio_chunking import AudioChunk, AudioChunker
+from app.services.ai.whisper_worker import WhisperPool
+
+logger = logging.getLogger(__name__)
+
+class ASRBackend(ABC):
+    """Transcribes one window of a decoded WAV into a verbose_json-shaped dict"""
+    
+    model_id: str = ""
+    
+    @abstractmethod
+    async def transcribe(self, wav_path: str, chunk: AudioChunk, language: str) -> Dict[str, Any]:
+        """
+        Transcribe a chunk of a 16 kHz mono WAV
+        
+        Args:
+            wav_path: Decoded audio shared by every chunk
+            chunk: Window to transcribe
+            language: Language code
+            
+        Returns:
+            Dict with text, language, duration, segments and words, times relative to the chunk
+        """
+
+class OpenAIASRBackend(ASRBackend):
+    """Whisper through the OpenAI API, uploading compact encoded chunks"""
+    
+    def __init__(self, client: openai.AsyncOpenAI, chunker: AudioChunker, model: str = "whisper-1"):
+        self.client = client
+        self.chunker = chunker
+        self.model_id = model
+    
+    async def transcribe(self, wav_path: str, chunk: AudioChunk, language: str) -> Dict[str, Any]:
+        chunk_bytes = await asyncio.to_thread(self.chunker.export, wav_path, chunk)
+        response = await self.client.audio.transcriptions.create(
+            model=self.model_id,
+            file=(f"chunk_{chunk.index}.{self.chunker.export_format}", chunk_bytes),
+            language=language,
+            response_format="verbose_json",
+            # "word" alone drops segment timestamps, which stitching and segment creation need
+            timestamp_granularities=["word", "segment"]
+        )
+        return self._response_to_dict(response)
+    
+    def _response_to_dict(self, transcript_response: Any) -> Dict[str, Any]:
+        """Normalize a verbose_json transcription response into plain dicts"""
+        def as_dict(item):
+            return item if isinstance(item, dict) else item.model_dump()
+        
+        return {
+            "text": transcript_response.text,
+            "language": transcript_response.language,
+            "duration": transcript_response.duration,
+            "segments": [as_dict(segment) for segment in getattr(transcript_response, "segments", None) or []],
+            "words": [as_dict(word) for word in getattr(transcript_response, "words", None) or []]
+        }
+
+class LocalWhisperBackend(ASRBackend):
+    """On-prem Whisper on CPU; workers read PCM straight from the WAV, so nothing is re-encoded"""
+    
+    def __init__(self, pool: WhisperPool, model_name: str, quantize: bool = True):
+        self.pool = pool
+        # int8 weights change the output, so cached transcripts must not be shared with fp32 runs
+        self.model_id = f"local/{model_name}-int8" if quantize else f"local/{model_name}"
+    
+    async def transcribe(self, wav_path: str, chunk: AudioChunk, language: str) -> Dict[str, Any]:
+        return await self.pool.transcribe(wav_path, chunk.start_ms, chunk.end_ms, language)
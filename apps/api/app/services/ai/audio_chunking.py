@@ -0,0 +1,189 @@
+"""
+EchoPress AI Backend - Audio Chunking
+Silence-aware splitting of long episodes into overlapping transcription windows
+"""
+
+import io
+import logging
+import math
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import soundfile as sf
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Whisper and pyannote both resample to 16 kHz mono, so decoding at that rate loses nothing
+ASR_SAMPLE_RATE = 16000
+
+class AudioChunk(BaseModel):
+    """A transcription window on the original episode timeline"""
+    index: int = Field(description="Position of the chunk in the episode")
+    start_ms: int = Field(description="Window start including the leading overlap")
+    end_ms: int = Field(description="Window end including the trailing overlap")
+    keep_start_ms: int = Field(description="Start of the range this chunk owns after overlap removal")
+    keep_end_ms: int = Field(description="End of the range this chunk owns after overlap removal")
+
+class AudioChunker:
+    """Plans and exports overlapping, silence-aligned windows of a decoded WAV"""
+    
+    def __init__(
+        self,
+        chunk_ms: int,
+        overlap_ms: int,
+        max_upload_bytes: Optional[int] = None,
+        search_ms: Optional[int] = None,
+        min_silence_ms: int = 500,
+        silence_offset_db: float = 16.0,
+        export_format: str = "mp3",
+        export_codec: Optional[str] = None,
+        export_bitrate: str = "64k"
+    ):
+        if max_upload_bytes:
+            # Keep every encoded window (overlaps included) safely under the upload limit
+            bitrate_bps = int(export_bitrate.rstrip("k")) * 1000
+            max_window_ms = int(max_upload_bytes * 8 * 1000 / bitrate_bps * 0.9)
+            chunk_ms = min(chunk_ms, max_window_ms - 2 * overlap_ms)
+        self.chunk_ms = chunk_ms
+        self.overlap_ms = overlap_ms
+        # Look for a pause in the last 10% of each window before falling back to a hard cut
+        self.search_ms = search_ms if search_ms is not None else max(chunk_ms // 10, min_silence_ms)
+        self.min_silence_ms = min_silence_ms
+        self.silence_offset_db = silence_offset_db
+        self.export_format = export_format
+        self.export_codec = export_codec
+        self.export_bitrate = export_bitrate
+    
+    def plan(self, wav_path: str) -> List[AudioChunk]:
+        """Split the timeline at silences near every chunk boundary"""
+        duration_ms = self._duration_ms(wav_path)
+        silence_thresh = self._loudness_dbfs(wav_path) - self.silence_offset_db
+        
+        cuts = [0]
+        while duration_ms - cuts[-1] > self.chunk_ms:
+            target = cuts[-1] + self.chunk_ms
+            cuts.append(self._find_cut(wav_path, target, silence_thresh))
+        cuts.append(duration_ms)
+        
+        chunks = []
+        for index in range(len(cuts) - 1):
+            keep_start, keep_end = cuts[index], cuts[index + 1]
+            chunks.append(AudioChunk(
+                index=index,
+                start_ms=max(0, keep_start - self.overlap_ms),
+                end_ms=min(duration_ms, keep_end + self.overlap_ms),
+                keep_start_ms=keep_start,
+                keep_end_ms=keep_end
+            ))
+        
+        logger.info(f"Planned {len(chunks)} transcription chunks for {duration_ms / 1000:.0f}s of audio")
+        return chunks
+    
+    def single(self, wav_path: str) -> List[AudioChunk]:
+        """One window covering the whole file, for when chunking is disabled"""
+        duration_ms = self._duration_ms(wav_path)
+        return [AudioChunk(index=0, start_ms=0, end_ms=duration_ms, keep_start_ms=0, keep_end_ms=duration_ms)]
+    
+    def export(self, wav_path: str, chunk: AudioChunk) -> bytes:
+        """Encode one chunk window for upload, reading only that slice of the WAV"""
+        buffer = io.BytesIO()
+        self._read(wav_path, chunk.start_ms, chunk.end_ms).export(
+            buffer,
+            format=self.export_format,
+            codec=self.export_codec,
+            bitrate=self.export_bitrate
+        )
+        return buffer.getvalue()
+    
+    def _duration_ms(self, wav_path: str) -> int:
+        info = sf.info(wav_path)
+        return info.frames * 1000 // info.samplerate
+    
+    def _read(self, wav_path: str, start_ms: int, end_ms: int) -> AudioSegment:
+        with sf.SoundFile(wav_path) as audio_file:
+            sample_rate = audio_file.samplerate
+            audio_file.seek(start_ms * sample_rate // 1000)
+            samples = audio_file.read((end_ms - start_ms) * sample_rate // 1000, dtype="int16")
+        return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=sample_rate, channels=1)
+    
+    def _loudness_dbfs(self, wav_path: str) -> float:
+        """Whole-file RMS loudness, computed one block at a time"""
+        sum_squares, count = 0.0, 0
+        for block in sf.blocks(wav_path, blocksize=ASR_SAMPLE_RATE * 60, dtype="float32"):
+            sum_squares += float(np.dot(block, block))
+            count += len(block)
+        rms = math.sqrt(sum_squares / count) if count else 0.0
+        return 20 * math.log10(rms) if rms > 0 else -math.inf
+    
+    def _find_cut(self, wav_path: str, target_ms: int, silence_thresh: float) -> int:
+        """Return the midpoint of the silence closest to target, or target itself"""
+        if math.isinf(silence_thresh):
+            return target_ms
+        
+        window_start = max(0, target_ms - self.search_ms)
+        silences = detect_silence(
+            self._read(wav_path, window_start, target_ms),
+            min_silence_len=self.min_silence_ms,
+            silence_thresh=silence_thresh,
+            seek_step=10
+        )
+        if not silences:
+            return target_ms
+        
+        midpoints = [window_start + (start + end) // 2 for start, end in silences]
+        return min(midpoints, key=lambda midpoint: abs(target_ms - midpoint))
+
+def _owns(chunk: AudioChunk, start_s: float, end_s: float) -> bool:
+    """An item belongs to the chunk whose keep range contains its midpoint"""
+    midpoint_ms = (start_s + end_s) * 500
+    return chunk.keep_start_ms <= midpoint_ms < chunk.keep_end_ms
+
+def trim_chunk_result(chunk: AudioChunk, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shift a chunk's segments and words onto the episode timeline and drop the overlaps"""
+    offset_s = chunk.start_ms / 1000
+    
+    segments = []
+    for segment in result.get("segments", []):
+        start, end = segment["start"] + offset_s, segment["end"] + offset_s
+        if _owns(chunk, start, end):
+            segments.append({**segment, "start": start, "end": end})
+    
+    words = []
+    for word in result.get("words", []):
+        start, end = word["start"] + offset_s, word["end"] + offset_s
+        if _owns(chunk, start, end):
+            words.append({**word, "start": start, "end": end})
+    
+    return {"segments": segments, "words": words}
+
+def stitch_chunk_results(
+    chunks: List[AudioChunk],
+    results: List[Dict[str, Any]],
+    duration_ms: int
+) -> Dict[str, Any]:
+    """Merge per-chunk verbose_json results into one ordered, overlap-free timeline"""
+    segments: List[Dict[str, Any]] = []
+    words: List[Dict[str, Any]] = []
+    language = None
+    
+    for chunk, result in sorted(zip(chunks, results), key=lambda pair: pair[0].index):
+        trimmed = trim_chunk_result(chunk, result)
+        segments.extend(trimmed["segments"])
+        words.extend(trimmed["words"])
+        language = language or result.get("language")
+    
+    segments.sort(key=lambda segment: segment["start"])
+    words.sort(key=lambda word: word["start"])
+    for segment_id, segment in enumerate(segments):
+        segment["id"] = segment_id
+    
+    return {
+        "text": " ".join(segment["text"].strip() for segment in segments),
+        "language": language,
+        "duration": duration_ms / 1000,
+        "segments": segments,
+        "words": words
+    }
@@ -0,0 +1,271 @@
+"""
+EchoPress AI Backend - Audio Ingestion
+Streams uploads from object storage through ffmpeg into one decoded 16 kHz mono buffer
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import struct
+import tempfile
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import boto3
+import httpx
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.services.ai.audio_chunking import ASR_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_SAMPLE = 2  # PCM 16-bit mono
+READ_BLOCK_BYTES = 64 * 1024
+CONTENT_RANGE_PATTERN = re.compile(r"bytes \d+-\d+/(\d+|\*)")
+# MP4-family containers may keep their index at the end, so ffmpeg has to seek them itself
+SEEKABLE_CONTAINERS = {"m4a", "mp4", "mov"}
+
+class DecodedAudio(BaseModel):
+    """Decoded 16 kHz mono PCM WAV shared by the transcriber and the diarizer"""
+    path: str = Field(description="Path to the decoded WAV file")
+    sample_rate: int = Field(description="Sample rate in Hz")
+    num_samples: int = Field(description="Number of decoded samples")
+    source_bytes: int = Field(description="Size of the encoded source in bytes")
+    
+    @property
+    def duration_ms(self) -> int:
+        return self.num_samples * 1000 // self.sample_rate
+
+def _wav_header(num_samples: int, sample_rate: int) -> bytes:
+    """Canonical 44-byte RIFF header for 16-bit mono PCM"""
+    data_size = num_samples * BYTES_PER_SAMPLE
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * BYTES_PER_SAMPLE, BYTES_PER_SAMPLE, 16,
+        b"data", data_size
+    )
+
+class AudioIngestor:
+    """Decodes local files, storage keys or URLs without materializing the encoded upload"""
+    
+    def __init__(self, sample_rate: int = ASR_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.range_bytes = settings.STORAGE_RANGE_BYTES
+        self.max_source_bytes = settings.MAX_FILE_SIZE
+    
+    async def ingest(self, source: str, output_path: Optional[str] = None) -> DecodedAudio:
+        """
+        Decode an audio source into a 16 kHz mono WAV
+        
+        Args:
+            source: Local path, storage object key, s3:// URI or HTTP(S) URL
+            output_path: Where to write the decoded WAV (default: a new temp file)
+            
+        Returns:
+            DecodedAudio describing the shared decoded buffer
+        """
+        if output_path is None:
+            handle, output_path = tempfile.mkstemp(suffix=".wav", dir=settings.AUDIO_WORK_DIR)
+            os.close(handle)
+        
+        local_path = self._local_path(source)
+        url = None
+        if not local_path:
+            url = source if source.startswith(("http://", "https://")) else await self._presigned_url(source)
+        
+        # Everything else is piped through in blocks; ffmpeg range-reads seek-dependent containers directly
+        direct_input = None
+        if os.path.splitext(source.split("?")[0])[1].lstrip(".").lower() in SEEKABLE_CONTAINERS:
+            direct_input = local_path or url
+        
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", direct_input or "pipe:0",
+            "-ac", "1", "-ar", str(self.sample_rate),
+            "-f", "s16le", "pipe:1",
+            stdin=asyncio.subprocess.DEVNULL if direct_input else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        if direct_input:
+            feed = self._source_size(local_path)
+        else:
+            feed = self._feed(self._read_source(local_path, url), process)
+        
+        try:
+            source_bytes, num_samples, _ = await asyncio.gather(
+                feed,
+                self._drain(process, output_path),
+                self._check_stderr(process)
+            )
+            if await process.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with status {process.returncode}")
+        except Exception:
+            if process.returncode is None:
+                process.kill()
+            os.remove(output_path)
+            raise
+        
+        decoded = DecodedAudio(
+            path=output_path,
+            sample_rate=self.sample_rate,
+            num_samples=num_samples,
+            source_bytes=source_bytes
+        )
+        logger.info(
+            f"Decoded {source_bytes / 1e6:.1f} MB source into {decoded.duration_ms / 1000:.0f}s of 16 kHz mono audio"
+        )
+        return decoded
+    
+    async def _feed(self, blocks: AsyncIterator[bytes], process) -> int:
+        """Pipe encoded blocks into ffmpeg, honouring pipe backpressure"""
+        total = 0
+        try:
+            async for block in blocks:
+                total += len(block)
+                if total > self.max_source_bytes:
+                    raise ValueError(f"Audio source exceeds MAX_FILE_SIZE ({self.max_source_bytes} bytes)")
+                process.stdin.write(block)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+        return total
+    
+    async def _drain(self, process, output_path: str) -> int:
+        """Write decoded PCM to the WAV file as it arrives, then patch the header"""
+        data_bytes = 0
+        async with aiofiles.open(output_path, "wb") as output:
+            await output.write(_wav_header(0, self.sample_rate))
+            while True:
+                block = await process.stdout.read(READ_BLOCK_BYTES)
+                if not block:
+                    break
+                data_bytes += len(block)
+                await output.write(block)
+            num_samples = data_bytes // BYTES_PER_SAMPLE
+            await output.seek(0)
+            await output.write(_wav_header(num_samples, self.sample_rate))
+        return num_samples
+    
+    async def _check_stderr(self, process):
+        stderr = await process.stderr.read()
+        if stderr:
+            logger.warning(f"ffmpeg: {stderr.decode(errors='replace').strip()}")
+    
+    async def _source_size(self, local_path: Optional[str]) -> int:
+        return os.path.getsize(local_path) if local_path else 0
+    
+    async def _read_source(self, local_path: Optional[str], url: Optional[str]) -> AsyncIterator[bytes]:
+        """Yield encoded bytes from a local file or ranged object storage reads"""
+        if local_path:
+            async with aiofiles.open(local_path, "rb") as audio_file:
+                while True:
+                    block = await audio_file.read(READ_BLOCK_BYTES)
+                    if not block:
+                        return
+                    yield block
+        
+        async for block in self._read_ranges(url):
+            yield block
+    
+    def _local_path(self, source: str) -> Optional[str]:
+        if os.path.isfile(source):
+            return source
+        # Development setups point STORAGE_BUCKET at a local directory
+        candidate = os.path.join(settings.STORAGE_BUCKET, source)
+        if os.path.isdir(settings.STORAGE_BUCKET) and os.path.isfile(candidate):
+            return candidate
+        return None
+    
+    async def fingerprint(self, source: str) -> Optional[str]:
+        """
+        Content identity of a source, obtained without decoding it
+        
+        Local files are hashed outright; storage objects are identified by ETag and size,
+        which S3-compatible stores derive from the object content.
+        """
+        local_path = self._local_path(source)
+        if local_path:
+            digest = hashlib.sha256()
+            async with aiofiles.open(local_path, "rb") as audio_file:
+                while True:
+                    block = await audio_file.read(1024 * 1024)
+                    if not block:
+                        break
+                    digest.update(block)
+            return digest.hexdigest()
+        
+        try:
+            if source.startswith(("http://", "https://")):
+                async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
+                    response = await client.head(source)
+                    response.raise_for_status()
+                etag, length = response.headers.get("etag"), response.headers.get("content-length")
+            else:
+                bucket, key = self._bucket_key(source)
+                head = await asyncio.to_thread(self._s3_client().head_object, Bucket=bucket, Key=key)
+                etag, length = head.get("ETag"), head.get("ContentLength")
+        except Exception as e:
+            logger.warning(f"Failed to fingerprint audio source: {e}")
+            return None
+        
+        if not etag:
+            return None
+        return hashlib.sha256(f"{etag}:{length}".encode()).hexdigest()
+    
+    def _bucket_key(self, source: str):
+        if source.startswith("s3://"):
+            bucket, _, key = source[len("s3://"):].partition("/")
+            return bucket, key
+        return settings.STORAGE_BUCKET, source
+    
+    def _s3_client(self):
+        return boto3.client(
+            "s3",
+            region_name=settings.STORAGE_REGION,
+            endpoint_url=settings.STORAGE_ENDPOINT_URL,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+        )
+    
+    async def _presigned_url(self, source: str) -> str:
+        """Sign a GET for an object key in STORAGE_BUCKET (or an explicit s3:// URI)"""
+        bucket, key = self._bucket_key(source)
+        return await asyncio.to_thread(
+            self._s3_client().generate_presigned_url,
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=3600
+        )
+    
+    async def _read_ranges(self, url: str) -> AsyncIterator[bytes]:
+        """Stream an object in fixed-size byte ranges so a dropped connection costs one range"""
+        offset = 0
+        total: Optional[int] = None
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+            while total is None or offset < total:
+                headers = {"Range": f"bytes={offset}-{offset + self.range_bytes - 1}"}
+                async with client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 416:
+                        return
+                    response.raise_for_status()
+                    
+                    received = 0
+                    async for block in response.aiter_bytes(READ_BLOCK_BYTES):
+                        received += len(block)
+                        yield block
+                    offset += received
+                    
+                    # Servers that ignore Range send the whole object with 200
+                    if response.status_code == 200:
+                        return
+                    match = CONTENT_RANGE_PATTERN.match(response.headers.get("content-range", ""))
+                    if match and match.group(1) != "*":
+                        total = int(match.group(1))
+                    elif received < self.range_bytes:
+                        return
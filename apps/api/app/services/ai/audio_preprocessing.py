@@ -0,0 +1,288 @@
+"""
+EchoPress AI Backend - Audio Preprocessing
+Downmix, resample and trim uploads once, caching the result by content hash
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.services.ai.audio_ingestion import AudioIngestor
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 10
+TRIM_PADDING_MS = 250
+
+# Pins carry the host so pids are only checked where they mean something; dots would break parsing
+PIN_HOST = socket.gethostname().replace(".", "-")
+# Liveness of pins from other hosts cannot be checked, so they lapse after this long instead
+FOREIGN_PIN_TTL_S = 24 * 3600
+
+class PreparedAudio(BaseModel):
+    """16 kHz mono WAV ready for ASR and diarization"""
+    path: str = Field(description="Path to the preprocessed WAV")
+    sample_rate: int = Field(description="Sample rate in Hz")
+    num_samples: int = Field(description="Number of samples after trimming")
+    offset_ms: int = Field(default=0, description="Audio trimmed from the start of the original timeline")
+    content_hash: Optional[str] = Field(default=None, description="Source content hash, None if uncached")
+    pin_path: Optional[str] = Field(default=None, description="Lock file protecting the cached WAV from eviction")
+    
+    @property
+    def duration_ms(self) -> int:
+        return self.num_samples * 1000 // self.sample_rate
+    
+    @property
+    def cached(self) -> bool:
+        return self.content_hash is not None
+
+class AudioPreprocessor:
+    """Turns any upload into a trimmed 16 kHz mono WAV, reusing earlier work for identical content"""
+    
+    def __init__(
+        self,
+        ingestor: AudioIngestor,
+        cache_dir: Optional[str] = None,
+        max_cache_bytes: int = 5 * 1024 ** 3,
+        trim_silence: bool = True,
+        trim_threshold_db: float = -50.0
+    ):
+        self.ingestor = ingestor
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "echopress_audio_cache")
+        self.max_cache_bytes = max_cache_bytes
+        self.trim_silence = trim_silence
+        self.trim_threshold_db = trim_threshold_db
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    async def prepare(self, source: str) -> PreparedAudio:
+        """
+        Decode, downmix, resample and trim an audio source
+        
+        Args:
+            source: Local path, storage object key, s3:// URI or HTTP(S) URL
+            
+        Returns:
+            PreparedAudio; hand it to release() when done, never delete cached artifacts directly
+        """
+        content_hash = await self.ingestor.fingerprint(source)
+        if not content_hash:
+            return await self._prepare(source, None, None)
+        
+        # Pinned before the cache is read so concurrent jobs cannot evict the entry under us
+        pin_path = self._pin(content_hash)
+        try:
+            cached = self._load_cached(content_hash)
+            if cached:
+                logger.info(f"Reusing preprocessed audio {content_hash[:12]}")
+                return cached.model_copy(update={"pin_path": pin_path})
+            return await self._prepare(source, content_hash, pin_path)
+        except BaseException:
+            self._unpin(pin_path)
+            raise
+    
+    async def _prepare(self, source: str, content_hash: Optional[str], pin_path: Optional[str]) -> PreparedAudio:
+        """Decode and trim a source that is not in the cache"""
+        # Decoding downmixes to mono and resamples to 16 kHz
+        decoded = await self.ingestor.ingest(source)
+        path = decoded.path
+        try:
+            start, end = (0, decoded.num_samples)
+            if self.trim_silence:
+                start, end = await asyncio.to_thread(self._speech_bounds, decoded.path)
+            
+            if content_hash:
+                path = await asyncio.to_thread(self._copy_range, decoded.path, start, end, self._wav_path(content_hash))
+            elif (start, end) != (0, decoded.num_samples):
+                path = await asyncio.to_thread(self._copy_range, decoded.path, start, end, None)
+        except Exception:
+            os.remove(decoded.path)
+            raise
+        if path != decoded.path:
+            os.remove(decoded.path)
+        
+        if not content_hash:
+            return PreparedAudio(
+                path=path,
+                sample_rate=decoded.sample_rate,
+                num_samples=end - start,
+                offset_ms=start * 1000 // decoded.sample_rate
+            )
+        
+        prepared = PreparedAudio(
+            path=path,
+            sample_rate=decoded.sample_rate,
+            num_samples=end - start,
+            offset_ms=start * 1000 // decoded.sample_rate,
+            content_hash=content_hash,
+            pin_path=pin_path
+        )
+        self._store_metadata(prepared)
+        await asyncio.to_thread(self._evict)
+        
+        trimmed_ms = decoded.duration_ms - prepared.duration_ms
+        logger.info(f"Preprocessed audio {content_hash[:12]}: {prepared.duration_ms / 1000:.0f}s kept, {trimmed_ms / 1000:.1f}s of silence trimmed")
+        return prepared
+    
+    def release(self, prepared: PreparedAudio):
+        """Unpin a cached artifact, or delete an uncached one, once the caller is done with it"""
+        if prepared.cached:
+            self._unpin(prepared.pin_path)
+        elif os.path.exists(prepared.path):
+            os.remove(prepared.path)
+    
+    def _pin(self, content_hash: str) -> str:
+        """Create a lock file marking the entry as in use by this process"""
+        pin_path = os.path.join(self.cache_dir, f"{content_hash}.{PIN_HOST}.{os.getpid()}.{uuid.uuid4().hex}.pin")
+        open(pin_path, "w").close()
+        return pin_path
+    
+    def _unpin(self, pin_path: Optional[str]):
+        if pin_path and os.path.exists(pin_path):
+            os.remove(pin_path)
+    
+    def _is_pinned(self, content_hash: str) -> bool:
+        """Whether a live process holds a pin on the entry; pins left by crashed workers are removed"""
+        pinned = False
+        for pin_path in glob.glob(os.path.join(self.cache_dir, f"{content_hash}.*.pin")):
+            if self._pin_alive(pin_path):
+                pinned = True
+            else:
+                self._unpin(pin_path)
+        return pinned
+    
+    def _pin_alive(self, pin_path: str) -> bool:
+        """Check a local pin's process; a pin from another host or container only lapses with age"""
+        parts = os.path.basename(pin_path).split(".")
+        if len(parts) != 5 or parts[1] != PIN_HOST:
+            try:
+                return time.time() - os.path.getmtime(pin_path) < FOREIGN_PIN_TTL_S
+            except FileNotFoundError:
+                return False
+        try:
+            os.kill(int(parts[2]), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # The process exists but belongs to another user
+            pass
+        return True
+    
+    def _wav_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.wav")
+    
+    def _metadata_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.json")
+    
+    def _load_cached(self, content_hash: str) -> Optional[PreparedAudio]:
+        wav_path, metadata_path = self._wav_path(content_hash), self._metadata_path(content_hash)
+        if not (os.path.exists(wav_path) and os.path.exists(metadata_path)):
+            return None
+        try:
+            with open(metadata_path) as metadata_file:
+                metadata: Dict[str, Any] = json.load(metadata_file)
+            # Touch so eviction treats the entry as recently used
+            os.utime(wav_path)
+            return PreparedAudio(path=wav_path, content_hash=content_hash, **metadata)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable audio cache entry {content_hash[:12]}: {e}")
+            return None
+    
+    def _store_metadata(self, prepared: PreparedAudio):
+        metadata = {
+            "sample_rate": prepared.sample_rate,
+            "num_samples": prepared.num_samples,
+            "offset_ms": prepared.offset_ms
+        }
+        # Unique temp name so concurrent writers never share a half-written file
+        handle, temp_path = tempfile.mkstemp(prefix=f"{prepared.content_hash}.", suffix=".json.tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(handle, "w") as metadata_file:
+                json.dump(metadata, metadata_file)
+            os.replace(temp_path, self._metadata_path(prepared.content_hash))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    
+    def _speech_bounds(self, wav_path: str) -> Tuple[int, int]:
+        """First and last sample of non-silent audio, padded, found one block at a time"""
+        info = sf.info(wav_path)
+        frame = info.samplerate * FRAME_MS // 1000
+        threshold = 10 ** (self.trim_threshold_db / 20)
+        
+        first_loud, last_loud, position = None, None, 0
+        for block in sf.blocks(wav_path, blocksize=frame * 6000, dtype="float32"):
+            usable = len(block) // frame * frame
+            if usable:
+                frames = block[:usable].reshape(-1, frame)
+                loud = np.flatnonzero(np.sqrt(np.mean(frames ** 2, axis=1)) > threshold)
+                if loud.size:
+                    if first_loud is None:
+                        first_loud = position + int(loud[0]) * frame
+                    last_loud = position + (int(loud[-1]) + 1) * frame
+            position += len(block)
+        
+        if first_loud is None:
+            return 0, info.frames
+        padding = info.samplerate * TRIM_PADDING_MS // 1000
+        return max(0, first_loud - padding), min(info.frames, last_loud + padding)
+    
+    def _copy_range(self, wav_path: str, start: int, end: int, output_path: Optional[str]) -> str:
+        """Copy [start, end) samples to a new WAV without loading the whole file"""
+        if output_path is None:
+            handle, output_path = tempfile.mkstemp(suffix=".wav", dir=settings.AUDIO_WORK_DIR)
+            os.close(handle)
+        # Unique temp name so two workers preparing the same episode never write one file
+        handle, temp_path = tempfile.mkstemp(
+            prefix=f"{os.path.basename(output_path)}.", suffix=".tmp", dir=os.path.dirname(output_path)
+        )
+        os.close(handle)
+        
+        try:
+            with sf.SoundFile(wav_path) as source:
+                with sf.SoundFile(temp_path, "w", samplerate=source.samplerate, channels=1, subtype="PCM_16", format="WAV") as target:
+                    source.seek(start)
+                    remaining = end - start
+                    while remaining > 0:
+                        block = source.read(min(remaining, source.samplerate * 60), dtype="int16")
+                        if not len(block):
+                            break
+                        target.write(block)
+                        remaining -= len(block)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return output_path
+    
+    def _evict(self):
+        """Drop least recently used artifacts until the cache fits its byte budget, skipping pinned ones"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".wav"):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, name[:-len(".wav")]))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, content_hash in sorted(entries):
+            if total <= self.max_cache_bytes:
+                break
+            # Checked per entry, right before deleting, to keep the window for a new pin small
+            if self._is_pinned(content_hash):
+                continue
+            for path in (self._wav_path(content_hash), self._metadata_path(content_hash)):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
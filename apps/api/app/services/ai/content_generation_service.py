@@ -5,15 +5,13 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Union
 import json
 from datetime import datetime
 
 import openai
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import PGVector
-from langchain.schema import Document
+from langchain.schema import BaseMessage, Document
 from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
@@ -24,9 +22,21 @@
 from app.models.transcript import Transcript, TranscriptSegment
 from app.models.draft import Draft
 from app.models.brand_voice import BrandVoice
+from app.services.ai.context_packing import ContextPacker
+from app.services.ai.embedding_service import get_embedding_service
+from app.services.ai.generation_streaming import DeltaCoalescer, stream_episode, streaming_to
+from app.services.ai.hybrid_retrieval import HybridRetriever, get_keyword_index
+from app.services.ai.llm_cache import LLMResponseCache, bypass_llm_cache
+from app.services.ai.llm_throttle import LLMThrottle
+from app.services.ai.segment_embeddings import SegmentEmbeddingStore, SegmentVectorIndex
+from app.services.ai.summarization import MapReduceSummarizer
+from app.services.ai.vector_index import NumpyVectorIndex
 
 logger = logging.getLogger(__name__)
 
+# Retrieval backend selected by RETRIEVAL_BACKEND
+EpisodeIndex = Union[NumpyVectorIndex, SegmentVectorIndex]
+
 class Citation(BaseModel):
     """Citation model for RAG-generated content"""
     text: str = Field(description="The cited text from the transcript")
@@ -38,8 +48,10 @@ class Citation(BaseModel):
 class BlogPostSection(BaseModel):
     """Blog post section with citations"""
     title: str = Field(description="Section title")
+    description: str = Field(default="", description="Outline description, used as the retrieval query")
     content: str = Field(description="Section content")
     citations: List[Citation] = Field(description="Citations for this section")
+    span: Optional[Dict[str, int]] = Field(default=None, description="Transcript topic span (start_ms, end_ms) the section covers")
 
 class BlogPostDraft(BaseModel):
     """Complete blog post draft"""
@@ -54,7 +66,7 @@ class ContentGenerationService:
     
     def __init__(self):
         self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.embeddings = OpenAIEmbeddings(openai_api_key=settings.OPENAI_API_KEY)
+        self.embeddings = get_embedding_service()
         self.llm = ChatOpenAI(
             model=settings.OPENAI_MODEL,
             temperature=0.7,
@@ -65,13 +77,40 @@ def __init__(self):
             chunk_overlap=200,
             length_function=len
         )
+        self.segment_embeddings = SegmentEmbeddingStore(self.embeddings, self.embeddings.model)
+        self.context_packer = ContextPacker(settings.OPENAI_MODEL)
+        self.throttle = LLMThrottle(
+            max_concurrency=settings.GENERATION_MAX_CONCURRENCY,
+            requests_per_minute=settings.GENERATION_REQUESTS_PER_MINUTE
+        )
+        self.summarizer = MapReduceSummarizer(
+            ChatOpenAI(
+                model=settings.OPENAI_MODEL,
+                temperature=0,
+                openai_api_key=settings.OPENAI_API_KEY
+            ),
+            settings.OPENAI_MODEL,
+            self.throttle,
+            window_tokens=settings.SUMMARY_WINDOW_TOKENS,
+            reduce_tokens=settings.SUMMARY_REDUCE_TOKENS,
+            cache_ttl_seconds=settings.SUMMARY_CACHE_TTL,
+            window_ms=settings.SUMMARY_WINDOW_MS
+        )
+        self.response_cache = LLMResponseCache(
+            enabled=settings.LLM_CACHE_ENABLED,
+            ttl_seconds=settings.LLM_CACHE_TTL,
+            max_entry_bytes=settings.LLM_CACHE_MAX_ENTRY_BYTES
+        )
     
     async def generate_blog_post(
         self,
         episode: Episode,
         transcript: Transcript,
         segments: List[TranscriptSegment],
-        brand_voice: Optional[BrandVoice] = None
+        brand_voice: Optional[BrandVoice] = None,
+        precomputed_embeddings: Optional[Dict[str, List[float]]] = None,
+        fresh: bool = False,
+        stream: bool = False
     ) -> BlogPostDraft:
         """
         Generate blog post using RAG with transcript grounding
@@ -81,33 +120,57 @@ async def generate_blog_post(
             transcript: Transcript model instance
             segments: List of transcript segments
             brand_voice: Optional brand voice configuration
+            precomputed_embeddings: Vectors already computed during transcription, keyed by text
+            fresh: Ignore cached LLM responses and generate new text
+            stream: Send introduction, section and conclusion tokens to the episode's WebSocket clients as they arrive
             
         Returns:
             BlogPostDraft with citations
         """
+        if fresh:
+            with bypass_llm_cache():
+                return await self.generate_blog_post(
+                    episode, transcript, segments, brand_voice, precomputed_embeddings, stream=stream
+                )
+        if stream:
+            with streaming_to(episode.id):
+                return await self.generate_blog_post(
+                    episode, transcript, segments, brand_voice, precomputed_embeddings
+                )
+        
         try:
             logger.info(f"Starting blog post generation for episode {episode.id}")
             
-            # Create vector store from transcript segments
-            vector_store = await self._create_vector_store(segments)
+            if settings.GENERATION_PARALLEL:
+                blog_post = await self._generate_blog_post_concurrently(
+                    episode, transcript, segments, brand_voice, precomputed_embeddings
+                )
+                logger.info(f"Blog post generation completed for episode {episode.id}")
+                return blog_post
+            
+            # Create keyword and vector indexes from transcript segments
+            retriever = await self._create_retriever(segments, precomputed_embeddings)
             
             # Generate blog post structure
             blog_structure = await self._generate_structure(episode, transcript, brand_voice)
             
-            # Generate content for each section
+            # Retrieve supporting segments for every section at once, then write each section
+            section_docs = await self._retrieve_for_sections(retriever, blog_structure["sections"])
             sections = []
-            for section_info in blog_structure["sections"]:
+            for index, (section_info, relevant_docs) in enumerate(zip(blog_structure["sections"], section_docs)):
                 section_content = await self._generate_section_content(
+                    index,
                     section_info,
-                    vector_store,
+                    relevant_docs,
                     brand_voice
                 )
                 sections.append(section_content)
             
-            # Generate introduction and conclusion
-            introduction = await self._generate_introduction(episode, transcript, brand_voice)
-            conclusion = await self._generate_conclusion(episode, transcript, brand_voice)
-            key_takeaways = await self._extract_key_takeaways(transcript, brand_voice)
+            # Generate introduction and conclusion from a summary of the whole episode
+            summary = await self._summarize_episode(transcript, segments)
+            introduction = await self._generate_introduction(episode, transcript, brand_voice, summary)
+            conclusion = await self._generate_conclusion(episode, transcript, brand_voice, summary)
+            key_takeaways = await self._extract_key_takeaways(transcript, brand_voice, segments, summary)
             
             blog_post = BlogPostDraft(
                 title=blog_structure["title"],
@@ -124,41 +187,327 @@ async def generate_blog_post(
             logger.error(f"Blog post generation failed for episode {episode.id}: {e}")
             raise
     
-    async def _create_vector_store(self, segments: List[TranscriptSegment]) -> PGVector:
-        """Create vector store from transcript segments"""
-        try:
-            # Create documents from segments
-            documents = []
-            for segment in segments:
-                doc = Document(
-                    page_content=segment.text,
-                    metadata={
-                        "start_ms": segment.start_ms,
-                        "end_ms": segment.end_ms,
-                        "speaker": segment.speaker,
-                        "confidence": segment.confidence,
-                        "topic": segment.topic
-                    }
+    async def regenerate_blog_post(
+        self,
+        episode: Episode,
+        transcript: Transcript,
+        segments: List[TranscriptSegment],
+        previous: BlogPostDraft,
+        sections: Optional[List[int]] = None,
+        introduction: bool = False,
+        conclusion: bool = False,
+        key_takeaways: bool = False,
+        changed_sections: bool = False,
+        brand_voice: Optional[BrandVoice] = None,
+        precomputed_embeddings: Optional[Dict[str, List[float]]] = None,
+        stream: bool = False
+    ) -> BlogPostDraft:
+        """
+        Rewrite selected parts of an existing draft and keep everything else verbatim
+        
+        The outline is reused as is. Requested sections are rewritten from the passages
+        they already cite; sections whose cited segments were edited are retrieved again.
+        
+        Args:
+            episode: Episode model instance
+            transcript: Transcript model instance
+            segments: Current transcript segments
+            previous: Draft to update, as returned by generate_blog_post
+            sections: Indices of sections to rewrite
+            introduction: Rewrite the introduction
+            conclusion: Rewrite the conclusion
+            key_takeaways: Re-extract the key takeaways
+            changed_sections: Also rewrite sections citing segments whose text or timing changed
+            brand_voice: Optional brand voice configuration
+            precomputed_embeddings: Vectors already computed during transcription, keyed by text
+            stream: Send rewritten parts to the episode's WebSocket clients as they arrive
+            
+        Returns:
+            BlogPostDraft with the selected parts replaced
+        """
+        if stream:
+            with streaming_to(episode.id):
+                return await self.regenerate_blog_post(
+                    episode, transcript, segments, previous, sections, introduction, conclusion,
+                    key_takeaways, changed_sections, brand_voice, precomputed_embeddings
                 )
-                documents.append(doc)
+        
+        targets = set(sections or [])
+        for index in targets:
+            if not 0 <= index < len(previous.sections):
+                raise ValueError(f"Draft has no section {index}")
+        
+        stale = self._stale_sections(previous, segments)
+        if changed_sections:
+            targets |= stale
+        # Sections citing edited segments, or nothing at all, need fresh retrieval; the rest keep their grounding
+        retrieve = sorted(index for index in targets if index in stale or not previous.sections[index].citations)
+        logger.info(
+            f"Regenerating draft for episode {episode.id}: sections {sorted(targets)} "
+            f"({len(retrieve)} re-retrieved), introduction={introduction}, "
+            f"conclusion={conclusion}, key_takeaways={key_takeaways}"
+        )
+        
+        # Unchanged prompts would otherwise be answered with the text being replaced
+        with bypass_llm_cache():
+            section_docs = {
+                index: self._citation_documents(previous.sections[index])
+                for index in targets if index not in retrieve
+            }
+            if retrieve:
+                retriever = await self._create_retriever(segments, precomputed_embeddings)
+                retrieved = await self._retrieve_for_sections(
+                    retriever, [self._section_info(previous.sections[index]) for index in retrieve]
+                )
+                section_docs.update(zip(retrieve, retrieved))
+            
+            order = sorted(section_docs)
+            rewritten, framing = await asyncio.gather(
+                asyncio.gather(*(
+                    self.throttle.run(self._generate_section_content(
+                        index, self._section_info(previous.sections[index]), section_docs[index], brand_voice
+                    ))
+                    for index in order
+                )),
+                self._regenerate_framing(
+                    episode, transcript, segments, brand_voice, previous, introduction, conclusion, key_takeaways
+                )
+            )
+        
+        new_sections = list(previous.sections)
+        for index, section in zip(order, rewritten):
+            new_sections[index] = section
+        introduction_text, conclusion_text, takeaways = framing
+        return previous.model_copy(update={
+            "introduction": introduction_text,
+            "sections": new_sections,
+            "conclusion": conclusion_text,
+            "key_takeaways": takeaways
+        })
+    
+    def _stale_sections(self, draft: BlogPostDraft, segments: List[TranscriptSegment]) -> Set[int]:
+        """Sections citing a span that no longer exists or whose text was edited"""
+        current = {(segment.start_ms, segment.end_ms): segment.text for segment in segments}
+        return {
+            index for index, section in enumerate(draft.sections)
+            if any(current.get((citation.start_ms, citation.end_ms)) != citation.text for citation in section.citations)
+        }
+    
+    def _section_info(self, section: BlogPostSection) -> Dict[str, Any]:
+        """Outline entry of an existing section; drafts stored without a description query by title"""
+        return {"title": section.title, "description": section.description or section.title, "span": section.span}
+    
+    def _citation_documents(self, section: BlogPostSection) -> List[Document]:
+        """A section's citations as retrieved passages, in their original order"""
+        return [
+            Document(
+                page_content=citation.text,
+                metadata={
+                    "start_ms": citation.start_ms,
+                    "end_ms": citation.end_ms,
+                    "speaker": citation.speaker,
+                    "confidence": citation.confidence
+                }
+            )
+            for citation in section.citations
+        ]
+    
+    async def _regenerate_framing(
+        self,
+        episode: Episode,
+        transcript: Transcript,
+        segments: List[TranscriptSegment],
+        brand_voice: Optional[BrandVoice],
+        previous: BlogPostDraft,
+        introduction: bool,
+        conclusion: bool,
+        key_takeaways: bool
+    ):
+        """Requested framing parts rewritten from the episode summary, the others kept"""
+        if not (introduction or conclusion or key_takeaways):
+            return previous.introduction, previous.conclusion, previous.key_takeaways
+        
+        async def keep(value):
+            return value
+        
+        # Summaries are cached per transcript window, so only edited windows are summarized again
+        summary = await self._summarize_episode(transcript, segments)
+        return await asyncio.gather(
+            self.throttle.run(self._generate_introduction(episode, transcript, brand_voice, summary))
+            if introduction else keep(previous.introduction),
+            self.throttle.run(self._generate_conclusion(episode, transcript, brand_voice, summary))
+            if conclusion else keep(previous.conclusion),
+            self.throttle.run(self._extract_key_takeaways(transcript, brand_voice, segments, summary))
+            if key_takeaways else keep(previous.key_takeaways)
+        )
+    
+    async def _generate_blog_post_concurrently(
+        self,
+        episode: Episode,
+        transcript: Transcript,
+        segments: List[TranscriptSegment],
+        brand_voice: Optional[BrandVoice],
+        precomputed_embeddings: Optional[Dict[str, List[float]]]
+    ) -> BlogPostDraft:
+        """Fan out every independent LLM call under the throttle; results keep outline order"""
+        # Introduction, conclusion and takeaways only need the episode summary
+        framing = asyncio.ensure_future(self._generate_framing(episode, transcript, segments, brand_voice))
+        try:
+            retriever, blog_structure = await asyncio.gather(
+                self._create_retriever(segments, precomputed_embeddings),
+                self.throttle.run(self._generate_structure(episode, transcript, brand_voice))
+            )
             
-            # Split documents if needed
-            split_docs = self.text_splitter.split_documents(documents)
+            section_docs = await self._retrieve_for_sections(retriever, blog_structure["sections"])
             
-            # Create vector store
-            vector_store = PGVector.from_documents(
-                documents=split_docs,
-                embedding=self.embeddings,
-                collection_name=f"episode_{segments[0].transcript_id}",
-                connection_string=settings.DATABASE_URL
+            # gather returns results in argument order, so sections follow the outline
+            sections = await asyncio.gather(*(
+                self.throttle.run(self._generate_section_content(index, section_info, relevant_docs, brand_voice))
+                for index, (section_info, relevant_docs) in enumerate(zip(blog_structure["sections"], section_docs))
+            ))
+            introduction, conclusion, key_takeaways = await framing
+        except Exception:
+            framing.cancel()
+            raise
+        
+        return BlogPostDraft(
+            title=blog_structure["title"],
+            introduction=introduction,
+            sections=list(sections),
+            conclusion=conclusion,
+            key_takeaways=key_takeaways
+        )
+    
+    async def _generate_framing(
+        self,
+        episode: Episode,
+        transcript: Transcript,
+        segments: List[TranscriptSegment],
+        brand_voice: Optional[BrandVoice]
+    ):
+        """Summarize the episode, then write introduction, conclusion and takeaways concurrently"""
+        summary = await self._summarize_episode(transcript, segments)
+        return await asyncio.gather(
+            self.throttle.run(self._generate_introduction(episode, transcript, brand_voice, summary)),
+            self.throttle.run(self._generate_conclusion(episode, transcript, brand_voice, summary)),
+            self.throttle.run(self._extract_key_takeaways(transcript, brand_voice, segments, summary))
+        )
+    
+    async def _summarize_episode(
+        self,
+        transcript: Transcript,
+        segments: Optional[List[TranscriptSegment]]
+    ) -> str:
+        """Map-reduce summary of the whole transcript; empty if summarization fails"""
+        documents = self._segment_documents(segments) if segments else self.text_splitter.create_documents([transcript.text])
+        try:
+            return await self.summarizer.summarize(documents)
+        except Exception as e:
+            logger.warning(f"Episode summarization failed, prompts fall back to transcript excerpts: {e}")
+            return ""
+    
+    async def _create_retriever(
+        self,
+        segments: List[TranscriptSegment],
+        precomputed_embeddings: Optional[Dict[str, List[float]]] = None
+    ) -> HybridRetriever:
+        """Keyword index plus vector store over the segments; keyword search alone if embedding fails"""
+        documents = self._segment_documents(segments)
+        
+        keyword_index = None
+        if settings.RETRIEVAL_HYBRID:
+            keyword_index = await asyncio.to_thread(get_keyword_index, [doc.page_content for doc in documents])
+        
+        try:
+            vector_store = await self._create_vector_store(segments, documents, precomputed_embeddings)
+        except Exception as e:
+            if keyword_index is None:
+                raise
+            logger.warning(f"Falling back to keyword-only retrieval: {e}")
+            vector_store = None
+        
+        return HybridRetriever(documents, keyword_index, vector_store, rrf_k=settings.RETRIEVAL_RRF_K)
+    
+    def _segment_documents(self, segments: List[TranscriptSegment]) -> List[Document]:
+        """One document per segment so each vector maps to a transcript_segments row"""
+        documents = []
+        for segment in segments:
+            doc = Document(
+                page_content=segment.text,
+                metadata={
+                    "start_ms": segment.start_ms,
+                    "end_ms": segment.end_ms,
+                    "speaker": segment.speaker,
+                    "confidence": segment.confidence,
+                    "topic": segment.topic
+                }
             )
+            documents.append(doc)
+        return documents
+    
+    async def _create_vector_store(
+        self,
+        segments: List[TranscriptSegment],
+        documents: List[Document],
+        precomputed_embeddings: Optional[Dict[str, List[float]]] = None
+    ) -> EpisodeIndex:
+        """Create vector store from transcript segments, reusing vectors stored on the segments"""
+        try:
+            # Only new or edited segments are embedded; the rest come from transcript_segments.vector
+            vectors = await self.segment_embeddings.ensure(segments, precomputed_embeddings)
+            
+            if settings.RETRIEVAL_BACKEND == "numpy":
+                # A few hundred segments fit in memory; searching them skips a DB round trip per section
+                return NumpyVectorIndex(documents, vectors, self.embeddings)
             
-            return vector_store
+            # Search the stored vectors in place; nothing is copied into a per-draft collection
+            vector_store = SegmentVectorIndex(documents, segments, self.segment_embeddings.model)
+            if await vector_store.available():
+                return vector_store
+            
+            # Unsaved segments, or vectors that failed to persist, are only in memory
+            logger.warning("Stored segment vectors are incomplete, searching them in memory")
+            return NumpyVectorIndex(documents, vectors, self.embeddings)
             
         except Exception as e:
             logger.error(f"Vector store creation failed: {e}")
             raise
     
+    async def _retrieve_for_sections(
+        self,
+        retriever: HybridRetriever,
+        sections_info: List[Dict[str, Any]],
+        k: int = 5
+    ) -> List[List[Document]]:
+        """Distinct supporting segments for every section, planned across the whole outline"""
+        queries = [section_info["description"] for section_info in sections_info]
+        query_vectors = None
+        if retriever.vector_store is not None:
+            try:
+                query_vectors = await self.embeddings.aembed_documents(queries)
+            except Exception as e:
+                if retriever.keyword_index is None:
+                    raise
+                logger.warning(f"Section query embedding failed, using keyword retrieval only: {e}")
+        
+        # Titles often carry the names and terms the keyword index matches on
+        keyword_queries = [f"{section_info['title']} {section_info['description']}" for section_info in sections_info]
+        
+        # Sections mapped to a topic span favour passages from that part of the episode
+        scopes = [
+            (section_info["span"]["start_ms"], section_info["span"]["end_ms"]) if section_info.get("span") else None
+            for section_info in sections_info
+        ]
+        
+        return await retriever.aplan(
+            keyword_queries,
+            query_vectors,
+            k,
+            settings.RETRIEVAL_MMR_DIVERSITY,
+            settings.RETRIEVAL_REUSE_PENALTY,
+            scopes
+        )
+    
     async def _generate_structure(
         self,
         episode: Episode,
@@ -176,31 +525,44 @@ async def _generate_structure(
         
         Brand voice: {brand_voice}
         
+        Topics in the order they are discussed:
+        {topic_outline}
+        
         Generate a structure with:
         1. A compelling title
         2. 3-5 main sections with descriptive titles
+        3. For each section, the number of the topic it mainly covers, or null if none fits
         
         Return as JSON:
         {{
             "title": "Compelling Blog Post Title",
             "sections": [
-                {{"title": "Section Title", "description": "What this section covers"}}
+                {{"title": "Section Title", "description": "What this section covers", "topic": 0}}
             ]
         }}
         """)
         
+        # Spans from the local topic engine; transcripts without them get a generic outline
+        topic_spans = getattr(transcript, "topic_spans", None) or []
+        topic_outline = "\n".join(
+            f"[{index}] {span['start_ms'] // 60000:02d}:{span['start_ms'] // 1000 % 60:02d}-"
+            f"{span['end_ms'] // 60000:02d}:{span['end_ms'] // 1000 % 60:02d} {span['topic']}"
+            for index, span in enumerate(topic_spans)
+        ) or "Not available"
+        
         # Get brand voice instructions
         brand_voice_instructions = ""
         if brand_voice:
             brand_voice_instructions = f"Tone: {brand_voice.tone}, Style: {brand_voice.style_guide}"
         
         # Generate structure
-        response = await self.llm.agenerate([
+        response = await self.response_cache.agenerate(self.llm, [
             structure_prompt.format_messages(
                 title=episode.title,
                 description=episode.description or "",
                 transcript_length=len(transcript.text.split()),
-                brand_voice=brand_voice_instructions
+                brand_voice=brand_voice_instructions,
+                topic_outline=topic_outline
             )
         ])
         
@@ -208,6 +570,11 @@ async def _generate_structure(
         structure_text = response.generations[0][0].text
         try:
             structure = json.loads(structure_text)
+            for section_info in structure.get("sections", []):
+                topic = section_info.pop("topic", None)
+                if isinstance(topic, int) and 0 <= topic < len(topic_spans):
+                    span = topic_spans[topic]
+                    section_info["span"] = {"start_ms": span["start_ms"], "end_ms": span["end_ms"]}
             return structure
         except json.JSONDecodeError:
             logger.warning("Failed to parse structure JSON, using fallback")
@@ -222,21 +589,23 @@ async def _generate_structure(
     
     async def _generate_section_content(
         self,
-        section_info: Dict[str, str],
-        vector_store: PGVector,
+        index: int,
+        section_info: Dict[str, Any],
+        relevant_docs: List[Document],
         brand_voice: Optional[BrandVoice]
     ) -> BlogPostSection:
-        """Generate content for a specific section using RAG"""
+        """Generate content for a specific section from its retrieved segments"""
         
-        # Retrieve relevant segments
-        relevant_docs = vector_store.similarity_search(
-            section_info["description"],
-            k=5
+        # Best passages first until the section's token budget is spent
+        packed = self.context_packer.pack(relevant_docs, settings.SECTION_CONTEXT_TOKENS)
+        logger.info(
+            f"Section '{section_info['title']}' context: {packed.tokens}/{packed.budget} tokens, "
+            f"{len(packed.kept)} passages ({packed.dropped} over budget)"
         )
         
-        # Create citations from retrieved documents
+        # Create citations from the passages the prompt actually contains
         citations = []
-        for doc in relevant_docs:
+        for doc in (relevant_docs[index] for index in packed.kept):
             citation = Citation(
                 text=doc.page_content,
                 start_ms=doc.metadata["start_ms"],
@@ -266,40 +635,53 @@ async def _generate_section_content(
         Return only the content text, no additional formatting.
         """)
         
-        # Format transcript segments
-        transcript_text = "\n\n".join([
-            f"Speaker {doc.metadata.get('speaker', 'Unknown')}: {doc.page_content}"
-            for doc in relevant_docs
-        ])
-        
         # Get brand voice instructions
         brand_voice_instructions = ""
         if brand_voice:
             brand_voice_instructions = f"Tone: {brand_voice.tone}, Style: {brand_voice.style_guide}"
         
         # Generate content
-        response = await self.llm.agenerate([
+        content = await self._generate_prose(
             content_prompt.format_messages(
                 section_title=section_info["title"],
                 section_description=section_info["description"],
-                transcript_segments=transcript_text,
+                transcript_segments=packed.text,
                 brand_voice=brand_voice_instructions
-            )
-        ])
-        
-        content = response.generations[0][0].text.strip()
+            ),
+            # Titles can repeat within an outline; the position cannot
+            part=f"section:{index}"
+        )
         
         return BlogPostSection(
             title=section_info["title"],
+            description=section_info["description"],
             content=content,
-            citations=citations
+            citations=citations,
+            span=section_info.get("span")
         )
     
+    async def _generate_prose(self, messages: List[BaseMessage], part: str) -> str:
+        """Complete a prose prompt, streaming coalesced deltas when the draft is being streamed"""
+        episode_id = stream_episode()
+        if episode_id is None:
+            response = await self.response_cache.agenerate(self.llm, [messages])
+            return response.generations[0][0].text.strip()
+        
+        coalescer = DeltaCoalescer(episode_id, part, flush_interval=settings.GENERATION_STREAM_FLUSH_MS / 1000)
+        coalescer.start()
+        try:
+            text = await self.response_cache.astream(self.llm, messages, coalescer.feed)
+        finally:
+            await coalescer.close()
+        # Same post-processing as the non-streaming path so the assembled draft is identical
+        return text.strip()
+    
     async def _generate_introduction(
         self,
         episode: Episode,
         transcript: Transcript,
-        brand_voice: Optional[BrandVoice]
+        brand_voice: Optional[BrandVoice],
+        summary: str = ""
     ) -> str:
         """Generate blog post introduction"""
         
@@ -309,6 +691,8 @@ async def _generate_introduction(
         Episode description: {description}
         Transcript length: {transcript_length} words
         
+        Episode summary: {summary}
+        
         Brand voice: {brand_voice}
         
         The introduction should:
@@ -324,28 +708,31 @@ async def _generate_introduction(
         if brand_voice:
             brand_voice_instructions = f"Tone: {brand_voice.tone}, Style: {brand_voice.style_guide}"
         
-        response = await self.llm.agenerate([
+        return await self._generate_prose(
             intro_prompt.format_messages(
                 title=episode.title,
                 description=episode.description or "",
                 transcript_length=len(transcript.text.split()),
+                summary=summary or "Not available",
                 brand_voice=brand_voice_instructions
-            )
-        ])
-        
-        return response.generations[0][0].text.strip()
+            ),
+            part="introduction"
+        )
     
     async def _generate_conclusion(
         self,
         episode: Episode,
         transcript: Transcript,
-        brand_voice: Optional[BrandVoice]
+        brand_voice: Optional[BrandVoice],
+        summary: str = ""
     ) -> str:
         """Generate blog post conclusion"""
         
         conclusion_prompt = ChatPromptTemplate.from_template("""
         Write a conclusion for a blog post about the podcast episode "{title}".
         
+        Episode summary: {summary}
+        
         Brand voice: {brand_voice}
         
         The conclusion should:
@@ -361,21 +748,34 @@ async def _generate_conclusion(
         if brand_voice:
             brand_voice_instructions = f"Tone: {brand_voice.tone}, Style: {brand_voice.style_guide}"
         
-        response = await self.llm.agenerate([
+        return await self._generate_prose(
             conclusion_prompt.format_messages(
                 title=episode.title,
+                summary=summary or "Not available",
                 brand_voice=brand_voice_instructions
-            )
-        ])
-        
-        return response.generations[0][0].text.strip()
+            ),
+            part="conclusion"
+        )
     
     async def _extract_key_takeaways(
         self,
         transcript: Transcript,
-        brand_voice: Optional[BrandVoice]
+        brand_voice: Optional[BrandVoice],
+        segments: Optional[List[TranscriptSegment]] = None,
+        summary: str = ""
     ) -> List[str]:
-        """Extract key takeaways from the transcript"""
+        """Extract key takeaways from the episode summary, or passages sampled across the transcript"""
+        
+        if summary:
+            transcript_context = summary
+        else:
+            documents = self._segment_documents(segments) if segments else self.text_splitter.create_documents([transcript.text])
+            packed = self.context_packer.pack_timeline(documents, settings.TAKEAWAYS_CONTEXT_TOKENS)
+            logger.info(
+                f"Takeaways context: {packed.tokens}/{packed.budget} tokens, "
+                f"{len(packed.kept)}/{len(documents)} passages across the episode"
+            )
+            transcript_context = packed.text
         
         takeaways_prompt = ChatPromptTemplate.from_template("""
         Extract 3-5 key takeaways from this podcast transcript:
@@ -392,9 +792,9 @@ async def _extract_key_takeaways(
         if brand_voice:
             brand_voice_instructions = f"Tone: {brand_voice.tone}, Style: {brand_voice.style_guide}"
         
-        response = await self.llm.agenerate([
+        response = await self.response_cache.agenerate(self.llm, [
             takeaways_prompt.format_messages(
-                transcript=transcript.text[:2000],  # Limit length
+                transcript=transcript_context,
                 brand_voice=brand_voice_instructions
             )
         ])
@@ -413,6 +813,18 @@ async def create_draft_from_blog_post(
         blog_post: BlogPostDraft
     ) -> Draft:
         """Create a Draft model from generated blog post"""
+        draft = Draft(
+            id=f"draft_{episode.id}_v1",
+            episode_id=episode.id,
+            version=1,
+            status="completed",
+            **self.draft_fields(blog_post)
+        )
+        
+        return draft
+    
+    def draft_fields(self, blog_post: BlogPostDraft) -> Dict[str, Any]:
+        """Rendered draft columns for a blog post, shared by new and regenerated drafts"""
         
         # Convert blog post to markdown
         markdown_content = self._convert_to_markdown(blog_post)
@@ -430,24 +842,19 @@ async def create_draft_from_blog_post(
                     "section": section.title
                 })
         
-        # Create draft
-        draft = Draft(
-            id=f"draft_{episode.id}_v1",
-            episode_id=episode.id,
-            title=blog_post.title,
-            content=markdown_content,
-            version=1,
-            status="completed",
-            citations=all_citations,
-            seo_data={
+        return {
+            "title": blog_post.title,
+            "content": markdown_content,
+            "citations": all_citations,
+            "seo_data": {
                 "title": blog_post.title,
                 "key_takeaways": blog_post.key_takeaways,
                 "word_count": len(markdown_content.split()),
                 "generated_at": datetime.now().isoformat()
-            }
-        )
-        
-        return draft
+            },
+            # Kept so later regenerations can replace single parts without rerunning the pipeline
+            "generation_state": blog_post.model_dump()
+        }
     
     def _convert_to_markdown(self, blog_post: BlogPostDraft) -> str:
         """Convert blog post to markdown format"""
@@ -0,0 +1,141 @@
+"""
+EchoPress AI Backend - Context Packing
+Fits transcript passages into a per-prompt token budget
+"""
+
+import logging
+from functools import lru_cache
+from typing import List
+
+from langchain.schema import Document
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token for English when no tokenizer is installed
+FALLBACK_CHARS_PER_TOKEN = 4
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed, estimating token counts from text length")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str) -> int:
+    """Tokens in text for the model's tokenizer, estimated if tiktoken is missing"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // FALLBACK_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+class PackedContext(BaseModel):
+    """Prompt-ready transcript excerpt and how much of its budget it used"""
+    text: str = Field(description="Formatted passages, chronological, same-speaker neighbours merged")
+    kept: List[int] = Field(description="Indices of the input passages that fit, in input order")
+    tokens: int = Field(description="Tokens used by text")
+    budget: int = Field(description="Token budget the text was packed into")
+    dropped: int = Field(description="Input passages left out to stay within the budget")
+
+class ContextPacker:
+    """Selects and formats passages so a prompt's transcript context never exceeds its token budget"""
+    
+    def __init__(self, model: str, merge_gap_ms: int = 2000):
+        self.model = model
+        self.merge_gap_ms = merge_gap_ms
+    
+    def _line(self, speaker, text: str) -> str:
+        return f"Speaker {speaker or 'Unknown'}: {text}"
+    
+    def pack(self, documents: List[Document], budget: int) -> PackedContext:
+        """
+        Keep the highest-value passages that fit the budget
+        
+        Args:
+            documents: Passages ordered from most to least valuable
+            budget: Token budget for the formatted context
+            
+        Returns:
+            PackedContext with the kept passages in transcript order
+        """
+        kept, used = [], 0
+        for index, doc in enumerate(documents):
+            cost = count_tokens(self._line(doc.metadata.get("speaker"), doc.page_content), self.model) + 1
+            # Skip a passage that does not fit but keep trying smaller ones further down
+            if used + cost <= budget:
+                kept.append(index)
+                used += cost
+        return self._format(documents, kept, budget)
+    
+    def pack_timeline(self, documents: List[Document], budget: int) -> PackedContext:
+        """
+        Keep passages spread evenly across the whole transcript
+        
+        Args:
+            documents: Passages in transcript order
+            budget: Token budget for the formatted context
+            
+        Returns:
+            PackedContext covering the full timeline at the density the budget allows
+        """
+        costs = [
+            count_tokens(self._line(doc.metadata.get("speaker"), doc.page_content), self.model) + 1
+            for doc in documents
+        ]
+        total = sum(costs)
+        if total <= budget:
+            return self._format(documents, list(range(len(documents))), budget)
+        
+        # Each passage earns its share of the budget; it is kept once enough share has accrued
+        ratio, allowance, used, kept = budget / total, 0.0, 0, []
+        for index, cost in enumerate(costs):
+            allowance += cost * ratio
+            if cost <= allowance and used + cost <= budget:
+                kept.append(index)
+                allowance -= cost
+                used += cost
+        return self._format(documents, kept, budget)
+    
+    def format(self, documents: List[Document]) -> str:
+        """Every passage formatted the same way as packed context, with no budget applied"""
+        return self._format(documents, list(range(len(documents))), 0).text
+    
+    def _format(self, documents: List[Document], kept: List[int], budget: int) -> PackedContext:
+        """Order kept passages by time and merge adjacent turns by the same speaker"""
+        ordered = sorted(kept, key=lambda index: documents[index].metadata.get("start_ms", index))
+        turns: List[List] = []
+        previous_end = None
+        for index in ordered:
+            doc = documents[index]
+            speaker = doc.metadata.get("speaker")
+            start_ms = doc.metadata.get("start_ms")
+            if (
+                turns
+                and turns[-1][0] == speaker
+                and start_ms is not None
+                and previous_end is not None
+                and start_ms - previous_end <= self.merge_gap_ms
+            ):
+                turns[-1][1].append(doc.page_content)
+            else:
+                turns.append([speaker, [doc.page_content]])
+            previous_end = doc.metadata.get("end_ms")
+        
+        text = "\n\n".join(self._line(speaker, " ".join(texts)) for speaker, texts in turns)
+        tokens = count_tokens(text, self.model)
+        logger.debug(
+            f"Packed {len(kept)}/{len(documents)} passages into {tokens}/{budget} tokens "
+            f"({len(ordered) - len(turns)} merged)"
+        )
+        return PackedContext(
+            text=text,
+            kept=sorted(kept),
+            tokens=tokens,
+            budget=budget,
+            dropped=len(documents) - len(kept)
+        )
@@ -0,0 +1,148 @@
+"""
+EchoPress AI Backend - Diarization Workers
+Speaker diarization in a dedicated process pool, off the API event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+from pyannote.audio.pipelines.utils.hook import ProgressHook
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, int, int], Awaitable[None]]
+
+# Loaded once per worker process by _init_worker
+_pipeline = None
+
+def _init_worker(model_name: str, auth_token: Optional[str]):
+    """Load the pyannote pipeline once when a worker process starts"""
+    global _pipeline
+    from pyannote.audio import Pipeline
+    _pipeline = Pipeline.from_pretrained(model_name, use_auth_token=auth_token)
+
+class QueueProgressHook(ProgressHook):
+    """ProgressHook that also forwards step progress to the parent process"""
+    
+    def __init__(self, progress_queue):
+        super().__init__(transient=True)
+        self.progress_queue = progress_queue
+    
+    def __call__(self, step_name, step_artifact, file=None, total=None, completed=None):
+        super().__call__(step_name, step_artifact, file=file, total=total, completed=completed)
+        # Steps reported without counts are single-shot
+        if completed is None:
+            completed = total = 1
+        self.progress_queue.put((step_name, int(completed), int(total)))
+
+def _diarize(audio_file_path: str, progress_queue) -> List[Dict[str, Any]]:
+    """Run diarization inside a worker and return plain, picklable speaker turns"""
+    if _pipeline is None:
+        raise RuntimeError("Diarization pipeline not loaded in worker")
+    
+    with QueueProgressHook(progress_queue) as hook:
+        diarization = _pipeline(audio_file_path, hook=hook)
+    
+    return [
+        {"start": turn.start, "end": turn.end, "speaker": speaker}
+        for turn, _, speaker in diarization.itertracks(yield_label=True)
+    ]
+
+class DiarizationPool:
+    """Process pool of pyannote workers with progress relayed back to the event loop"""
+    
+    def __init__(
+        self,
+        max_workers: int,
+        model_name: str,
+        auth_token: Optional[str] = None,
+        poll_interval: float = 0.5
+    ):
+        # spawn avoids inheriting CUDA/torch thread state from the API process
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(model_name, auth_token)
+        )
+        self.poll_interval = poll_interval
+        self._manager = None
+    
+    def _progress_queue(self):
+        if self._manager is None:
+            self._manager = self.mp_context.Manager()
+        return self._manager.Queue()
+    
+    async def diarize(
+        self,
+        audio_file_path: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """Diarize a file in a worker process without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        # Manager proxies talk to the manager process synchronously
+        progress_queue = await asyncio.to_thread(self._progress_queue)
+        future = loop.run_in_executor(self.executor, _diarize, audio_file_path, progress_queue)
+        relay = asyncio.create_task(self._relay_progress(progress_queue, on_progress))
+        try:
+            return await future
+        finally:
+            relay.cancel()
+    
+    async def _relay_progress(self, progress_queue, on_progress: Optional[ProgressCallback]):
+        """Drain worker progress messages until cancelled"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                messages = await asyncio.to_thread(self._drain, progress_queue)
+            except Exception:
+                return
+            if not on_progress:
+                continue
+            # Only the latest count per step is worth sending for each poll
+            latest: Dict[str, Tuple[int, int]] = {}
+            for step_name, completed, total in messages:
+                latest[step_name] = (completed, total)
+            for step_name, (completed, total) in latest.items():
+                try:
+                    await on_progress(step_name, completed, total)
+                except Exception as e:
+                    logger.debug(f"Diarization progress callback failed: {e}")
+    
+    @staticmethod
+    def _drain(progress_queue) -> List[Tuple[str, int, int]]:
+        """Everything queued so far; each get is a blocking round trip to the manager process"""
+        messages = []
+        while True:
+            try:
+                messages.append(progress_queue.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def shutdown(self):
+        """Stop worker processes"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+_diarization_pool: Optional[DiarizationPool] = None
+
+def get_diarization_pool(max_workers: int, model_name: str, auth_token: Optional[str] = None) -> DiarizationPool:
+    """Shared pool so every TranscriptionService reuses the same loaded workers"""
+    global _diarization_pool
+    if _diarization_pool is None:
+        _diarization_pool = DiarizationPool(max_workers, model_name, auth_token)
+    return _diarization_pool
+
+def shutdown_diarization_pool():
+    """Stop the shared pool if it was started"""
+    global _diarization_pool
+    if _diarization_pool is not None:
+        _diarization_pool.shutdown()
+        _diarization_pool = None
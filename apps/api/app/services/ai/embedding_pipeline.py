@@ -0,0 +1,70 @@
+"""
+EchoPress AI Backend - Embedding Pipeline
+Embeds transcript segments from a queue while transcription is still running
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from langchain.embeddings.base import Embeddings
+
+logger = logging.getLogger(__name__)
+
+class SegmentEmbeddingPipeline:
+    """Consumes finalized segments as they arrive and embeds them in batches, keyed by exact segment text"""
+    
+    def __init__(self, embeddings: Embeddings, batch_size: int = 64):
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.vectors: Dict[str, List[float]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background consumer"""
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+    
+    async def feed(self, segments: List[Dict[str, Any]]):
+        """Queue finalized segments; usable directly as a transcription on_partial callback"""
+        # One item per segment, unstripped, so keys match the lookup in SegmentEmbeddingStore.ensure
+        for segment in segments:
+            if segment.get("text"):
+                await self._queue.put(segment["text"])
+    
+    async def close(self) -> Dict[str, List[float]]:
+        """Flush the queue and return every embedding computed so far"""
+        if self._consumer is not None:
+            await self._queue.put(None)
+            await self._consumer
+            self._consumer = None
+        return self.vectors
+    
+    def cancel(self):
+        """Stop the consumer without waiting for queued segments"""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+    
+    async def _consume(self):
+        done = False
+        while not done:
+            # Whatever accumulated while the previous batch was embedding goes into the next one
+            texts = [await self._queue.get()]
+            while len(texts) < self.batch_size and not self._queue.empty():
+                texts.append(self._queue.get_nowait())
+            if None in texts:
+                done = True
+                texts = [text for text in texts if text is not None]
+            
+            pending = list(dict.fromkeys(text for text in texts if text not in self.vectors))
+            if not pending:
+                continue
+            try:
+                vectors = await self.embeddings.aembed_documents(pending)
+                self.vectors.update(zip(pending, vectors))
+                logger.debug(f"Embedded {len(pending)} transcript segments ahead of generation")
+            except Exception as e:
+                # Anything missed here is embedded when the index is finalized
+                logger.warning(f"Streaming embedding batch failed: {e}")
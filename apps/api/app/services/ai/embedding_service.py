@@ -0,0 +1,264 @@
+"""
+EchoPress AI Backend - Embedding Service
+Batched, deduplicated and cached OpenAI embeddings behind the LangChain Embeddings interface
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import openai
+from langchain.embeddings.base import Embeddings
+
+from app.core.cache import get_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "embedding"
+
+def embedding_cache_key(text: str, model: str) -> str:
+    """Cache identity of a vector: the model plus a sha256 of the exact text"""
+    return f"{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+class EmbeddingLRU:
+    """In-process LRU of float32 vectors bounded by total bytes"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+class EmbeddingService(Embeddings):
+    """
+    Embeddings client shared by every episode in the process
+    
+    Concurrent aembed_documents calls are coalesced into full API batches, identical texts
+    are embedded once, and vectors are cached by (model, sha256(text)) as float32 both in
+    memory and in Redis, so boilerplate repeated across a show's episodes is embedded once.
+    """
+    
+    def __init__(
+        self,
+        model: str = "text-embedding-ada-002",
+        batch_size: int = 512,
+        batch_wait: float = 0.02,
+        max_concurrency: int = 4,
+        cache_max_bytes: int = 256 * 1024 * 1024,
+        cache_ttl_seconds: int = 90 * 24 * 3600
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_concurrency = max_concurrency
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.memory = EmbeddingLRU(cache_max_bytes)
+        self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.sync_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, paying only for texts not embedded before by this model
+        
+        Args:
+            texts: Texts to embed, duplicates allowed
+            
+        Returns:
+            One vector per input text, in input order
+        """
+        keys = [embedding_cache_key(text, self.model) for text in texts]
+        unique = dict(zip(keys, texts))
+        
+        vectors = {}
+        for key in unique:
+            cached = self.memory.get(key)
+            if cached is not None:
+                vectors[key] = cached
+        
+        missing = [key for key in unique if key not in vectors]
+        if missing:
+            vectors.update(await self._load_redis(missing))
+        
+        pending = {key: unique[key] for key in unique if key not in vectors}
+        if pending:
+            # Shielded so one cancelled caller does not fail other callers waiting on the same text
+            futures = [asyncio.shield(self._submit(key, text)) for key, text in pending.items()]
+            for key, value in zip(pending, await asyncio.gather(*futures)):
+                vectors[key] = value
+        
+        if len(unique) < len(texts) or len(pending) < len(unique):
+            logger.debug(
+                f"Embedding {len(texts)} texts: {len(unique)} unique, {len(pending)} sent to the API"
+            )
+        return [self._decode(vectors[key]) for key in keys]
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Blocking variant for LangChain callers; uses the in-memory cache but not the coalescer"""
+        keys = [embedding_cache_key(text, self.model) for text in texts]
+        unique = dict(zip(keys, texts))
+        vectors = {}
+        for key in unique:
+            cached = self.memory.get(key)
+            if cached is not None:
+                vectors[key] = cached
+        
+        pending = [key for key in unique if key not in vectors]
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            response = self.sync_client.embeddings.create(model=self.model, input=[unique[key] for key in batch])
+            for key, item in zip(batch, response.data):
+                vectors[key] = self._encode(item.embedding)
+                self.memory.put(key, vectors[key])
+        # Read from the local results; a call larger than the LRU would evict its own early entries
+        return [self._decode(vectors[key]) for key in keys]
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+    
+    def _encode(self, vector: List[float]) -> bytes:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+    
+    def _decode(self, value: bytes) -> List[float]:
+        return np.frombuffer(value, dtype=np.float32).tolist()
+    
+    async def _load_redis(self, keys: List[str]) -> Dict[str, bytes]:
+        """Second-tier lookup; vectors are stored base64-encoded because the client decodes responses"""
+        try:
+            cache = await get_cache()
+            values = await cache.mget([f"{REDIS_KEY_PREFIX}:{key}" for key in keys])
+        except Exception as e:
+            logger.debug(f"Embedding cache unavailable: {e}")
+            return {}
+        
+        found = {}
+        for key, value in zip(keys, values):
+            if value is not None:
+                found[key] = base64.b64decode(value)
+                self.memory.put(key, found[key])
+        return found
+    
+    async def _store_redis(self, entries: Dict[str, bytes]):
+        try:
+            cache = await get_cache()
+            pipeline = cache.pipeline(transaction=False)
+            for key, value in entries.items():
+                pipeline.set(f"{REDIS_KEY_PREFIX}:{key}", base64.b64encode(value).decode(), ex=self.cache_ttl_seconds)
+            await pipeline.execute()
+        except Exception as e:
+            logger.debug(f"Failed to store embeddings in cache: {e}")
+    
+    def _submit(self, key: str, text: str) -> asyncio.Future:
+        """Queue one text for the coalescer, sharing the future with identical in-flight texts"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            # Worker tasks may run each job on a fresh event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._inflight = {}
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[key] = future
+            self._queue.put_nowait((key, text))
+        return future
+    
+    async def _dispatch(self):
+        """Fill API batches from every caller's queued texts and keep a bounded number in flight"""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            await slots.acquire()
+            task = asyncio.create_task(self._embed_batch(batch))
+            task.add_done_callback(lambda _: slots.release())
+    
+    async def _embed_batch(self, batch: List[Tuple[str, str]]):
+        try:
+            response = await self.client.embeddings.create(model=self.model, input=[text for _, text in batch])
+            encoded = {key: self._encode(item.embedding) for (key, _), item in zip(batch, response.data)}
+        except openai.BadRequestError as e:
+            if len(batch) == 1:
+                logger.error(f"Embedding input rejected: {e}")
+                self._fail(batch, e)
+                return
+            # One rejected input fails the whole request; bisect so only its own callers fail
+            middle = len(batch) // 2
+            await self._embed_batch(batch[:middle])
+            await self._embed_batch(batch[middle:])
+            return
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} texts failed: {e}")
+            self._fail(batch, e)
+            return
+        
+        for key, value in encoded.items():
+            self.memory.put(key, value)
+            future = self._inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(value)
+        await self._store_redis(encoded)
+    
+    def _fail(self, batch: List[Tuple[str, str]], error: Exception):
+        for key, _ in batch:
+            future = self._inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+_embedding_service: Optional[EmbeddingService] = None
+
+def get_embedding_service() -> EmbeddingService:
+    """Shared service so concurrent episodes coalesce into the same batches and cache"""
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService(
+            model=settings.EMBEDDING_MODEL,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            batch_wait=settings.EMBEDDING_BATCH_WAIT_MS / 1000,
+            max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+            cache_max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            cache_ttl_seconds=settings.EMBEDDING_CACHE_TTL
+        )
+    return _embedding_service
@@ -0,0 +1,83 @@
+"""
+EchoPress AI Backend - Generation Streaming
+Coalesced token deltas from streaming LLM calls forwarded over WebSocket
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.services.websocket_manager import websocket_manager
+
+logger = logging.getLogger(__name__)
+
+# Episode whose draft is streaming; set through streaming_to(), inherited by tasks started inside it
+_stream_episode: ContextVar[Optional[str]] = ContextVar("generation_stream_episode", default=None)
+
+@contextmanager
+def streaming_to(episode_id: str):
+    """Stream every prose LLM call made inside the block to the episode's WebSocket clients"""
+    token = _stream_episode.set(episode_id)
+    try:
+        yield
+    finally:
+        _stream_episode.reset(token)
+
+def stream_episode() -> Optional[str]:
+    """Episode the current generation streams to, if any"""
+    return _stream_episode.get()
+
+class DeltaCoalescer:
+    """
+    Buffers tokens for one draft part and flushes them at most every flush_interval
+    
+    The token consumer never waits on the socket. While a send is in flight new tokens
+    accumulate and go out together in the next flush, so slow clients get fewer,
+    larger deltas instead of stalling generation.
+    """
+    
+    def __init__(self, episode_id: str, part: str, flush_interval: float = 0.05):
+        self.episode_id = episode_id
+        self.part = part
+        self.flush_interval = flush_interval
+        self._buffer: list = []
+        self._closed = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+    
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+    
+    def feed(self, text: str):
+        """Queue a token without blocking"""
+        if text:
+            self._buffer.append(text)
+    
+    async def close(self):
+        """Flush what is left and send the part's final delta"""
+        self._closed.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+    
+    async def _run(self):
+        while not self._closed.is_set():
+            try:
+                await asyncio.wait_for(self._closed.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if not self._closed.is_set():
+                await self._flush(done=False)
+        await self._flush(done=True)
+    
+    async def _flush(self, done: bool):
+        if not self._buffer and not done:
+            return
+        delta, self._buffer = "".join(self._buffer), []
+        try:
+            await websocket_manager.send_content_generation_delta(self.episode_id, self.part, delta, done)
+        except Exception as e:
+            # Clients can recover the full text from the finished draft
+            logger.warning(f"Failed to stream {self.part} delta for episode {self.episode_id}: {e}")
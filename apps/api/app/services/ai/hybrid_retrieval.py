@@ -0,0 +1,272 @@
+"""
+EchoPress AI Backend - Hybrid Retrieval
+BM25 keyword index fused with vector search by reciprocal-rank fusion
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain.schema import Document
+
+from app.services.ai.retrieval_planner import plan_section_citations
+from app.services.ai.vector_index import NumpyVectorIndex
+
+if TYPE_CHECKING:
+    # Annotation only, so ranking code does not pull in the database layer
+    from app.services.ai.segment_embeddings import SegmentVectorIndex
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['.][a-z0-9]+)*")
+KEYWORD_INDEX_CACHE_SIZE = 64
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word and number tokens; decimals like 3.5 and contractions stay whole"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of texts, stored as term-major CSR postings
+    
+    Postings for term t are doc_ids[indptr[t]:indptr[t + 1]] with precomputed BM25
+    weights alongside, so a query is a handful of slice-and-add operations.
+    """
+    
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.num_docs = len(texts)
+        term_docs: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = np.zeros(self.num_docs, dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                term_docs.setdefault(term, []).append((doc_id, tf))
+        
+        average_length = float(lengths.mean()) if self.num_docs and lengths.mean() > 0 else 1.0
+        self.vocabulary: Dict[str, int] = {}
+        self.indptr = np.zeros(len(term_docs) + 1, dtype=np.int32)
+        self.doc_ids = np.empty(sum(len(postings) for postings in term_docs.values()), dtype=np.int32)
+        self.weights = np.empty(len(self.doc_ids), dtype=np.float32)
+        
+        position = 0
+        for term_id, (term, postings) in enumerate(term_docs.items()):
+            self.vocabulary[term] = term_id
+            doc_ids = np.fromiter((doc_id for doc_id, _ in postings), dtype=np.int32, count=len(postings))
+            tf = np.fromiter((tf for _, tf in postings), dtype=np.float32, count=len(postings))
+            idf = math.log(1 + (self.num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            norm = k1 * (1 - b + b * lengths[doc_ids] / average_length)
+            
+            end = position + len(postings)
+            self.doc_ids[position:end] = doc_ids
+            self.weights[position:end] = idf * tf * (k1 + 1) / (tf + norm)
+            self.indptr[term_id + 1] = end
+            position = end
+    
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (doc index, BM25 score) pairs for a query, best first; documents sharing no term are omitted"""
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                start, end = self.indptr[term_id], self.indptr[term_id + 1]
+                scores[self.doc_ids[start:end]] += self.weights[start:end]
+        
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        ordered = matched[np.lexsort((matched, -scores[matched]))]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in ordered]
+
+_keyword_indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+_keyword_indexes_lock = threading.Lock()
+
+def get_keyword_index(texts: Sequence[str]) -> BM25Index:
+    """BM25 index for a transcript's segment texts, built once and reused by later drafts"""
+    digest = hashlib.sha256("\x00".join(texts).encode()).hexdigest()
+    with _keyword_indexes_lock:
+        index = _keyword_indexes.get(digest)
+        if index is not None:
+            _keyword_indexes.move_to_end(digest)
+            return index
+    
+    index = BM25Index(texts)
+    with _keyword_indexes_lock:
+        _keyword_indexes[digest] = index
+        while len(_keyword_indexes) > KEYWORD_INDEX_CACHE_SIZE:
+            _keyword_indexes.popitem(last=False)
+    return index
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse ranked lists of doc indices by sum(1 / (k + rank)); ties keep document order"""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+class HybridRetriever:
+    """Episode documents searchable by keywords, by vectors, or both fused"""
+    
+    def __init__(
+        self,
+        documents: List[Document],
+        keyword_index: Optional[BM25Index],
+        vector_store: Optional[Union[NumpyVectorIndex, "SegmentVectorIndex"]],
+        rrf_k: int = 60,
+        candidates: int = 20
+    ):
+        self.documents = documents
+        self.keyword_index = keyword_index
+        self.vector_store = vector_store
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        # Results are mapped back to document indices by content and position
+        self._positions = {
+            (doc.page_content, doc.metadata.get("start_ms")): index
+            for index, doc in enumerate(documents)
+        }
+    
+    def _vector_rankings(
+        self,
+        query_vectors: List[List[float]],
+        matches: Optional[List[List[Tuple[Document, float]]]] = None
+    ) -> List[List[int]]:
+        if matches is None:
+            # Database-backed indexes are only searchable asynchronously; see aplan
+            matches = self.vector_store.search_by_vectors(query_vectors, k=self.candidates)
+        return [
+            [
+                self._positions[key]
+                for key in ((doc.page_content, doc.metadata.get("start_ms")) for doc, _ in results)
+                if key in self._positions
+            ]
+            for results in matches
+        ]
+    
+    def rank(
+        self,
+        queries: List[str],
+        query_vectors: Optional[List[List[float]]] = None,
+        scopes: Optional[List[Optional[Tuple[int, int]]]] = None,
+        vector_matches: Optional[List[List[Tuple[Document, float]]]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Fused candidate rankings per query; blocking, so call through asyncio.to_thread
+        
+        Args:
+            queries: Keyword queries, one per section
+            query_vectors: Embeddings of the section queries, or None when embeddings are unavailable
+            scopes: Optional (start_ms, end_ms) topic span per query whose passages are boosted
+            vector_matches: Vector search results already fetched per query, as aplan does
+            
+        Returns:
+            (document index, fused score) pairs per query, best first
+        """
+        rankings: List[List[List[int]]] = [[] for _ in queries]
+        if query_vectors is not None and self.vector_store is not None:
+            for per_query, ranking in zip(rankings, self._vector_rankings(query_vectors, vector_matches)):
+                per_query.append(ranking)
+        if self.keyword_index is not None:
+            for per_query, query in zip(rankings, queries):
+                per_query.append([doc_id for doc_id, _ in self.keyword_index.search(query, k=self.candidates)])
+        for per_query, scope in zip(rankings, scopes or []):
+            if scope is not None:
+                per_query.append(self._scope_ranking(per_query, scope))
+        return [reciprocal_rank_fusion(per_query, k=self.rrf_k)[:self.candidates] for per_query in rankings]
+    
+    def _scope_ranking(self, rankings: List[List[int]], scope: Tuple[int, int]) -> List[int]:
+        """
+        Passages starting inside a topic span, as one more list to fuse
+        
+        Span passages the other rankings found keep their fused order; the rest of the
+        span follows in timeline order, so a section can cite its span even when the
+        query words never appear in it.
+        """
+        start_ms, end_ms = scope
+        in_scope = [
+            doc_id for doc_id, doc in enumerate(self.documents)
+            if start_ms <= doc.metadata.get("start_ms", -1) < end_ms
+        ]
+        members = set(in_scope)
+        ranked = [doc_id for doc_id, _ in reciprocal_rank_fusion(rankings, k=self.rrf_k) if doc_id in members]
+        seen = set(ranked)
+        return ranked + [doc_id for doc_id in in_scope if doc_id not in seen]
+    
+    def search(
+        self,
+        queries: List[str],
+        query_vectors: Optional[List[List[float]]] = None,
+        k: int = 5
+    ) -> List[List[Document]]:
+        """Top-k fused documents per query"""
+        return [
+            [self.documents[doc_id] for doc_id, _ in ranked[:k]]
+            for ranked in self.rank(queries, query_vectors)
+        ]
+    
+    def similarity(self, doc_ids: Sequence[int]) -> Tuple[np.ndarray, Dict[int, int]]:
+        """Pairwise similarity of documents: cosine on stored vectors, else token-set Jaccard"""
+        positions = {doc_id: row for row, doc_id in enumerate(doc_ids)}
+        if isinstance(self.vector_store, NumpyVectorIndex):
+            vectors = self.vector_store.matrix[list(doc_ids)]
+            return vectors @ vectors.T, positions
+        
+        token_sets = [set(tokenize(self.documents[doc_id].page_content)) for doc_id in doc_ids]
+        matrix = np.zeros((len(doc_ids), len(doc_ids)), dtype=np.float32)
+        for row, tokens in enumerate(token_sets):
+            for column in range(row, len(token_sets)):
+                union = len(tokens | token_sets[column])
+                matrix[row, column] = matrix[column, row] = len(tokens & token_sets[column]) / union if union else 0.0
+        return matrix, positions
+    
+    def plan(
+        self,
+        queries: List[str],
+        query_vectors: Optional[List[List[float]]] = None,
+        k: int = 5,
+        diversity: float = 0.3,
+        reuse_penalty: float = 0.5,
+        scopes: Optional[List[Optional[Tuple[int, int]]]] = None,
+        vector_matches: Optional[List[List[Tuple[Document, float]]]] = None
+    ) -> List[List[Document]]:
+        """Rank every section's candidates together, then spread distinct passages across sections"""
+        rankings = self.rank(queries, query_vectors, scopes, vector_matches)
+        doc_ids = sorted({doc_id for ranked in rankings for doc_id, _ in ranked})
+        similarity, positions = self.similarity(doc_ids)
+        plans = plan_section_citations(
+            rankings,
+            similarity,
+            positions,
+            k=k,
+            diversity=diversity,
+            reuse_penalty=reuse_penalty
+        )
+        return [[self.documents[doc_id] for doc_id in plan] for plan in plans]
+    
+    async def aplan(
+        self,
+        queries: List[str],
+        query_vectors: Optional[List[List[float]]] = None,
+        k: int = 5,
+        diversity: float = 0.3,
+        reuse_penalty: float = 0.5,
+        scopes: Optional[List[Optional[Tuple[int, int]]]] = None
+    ) -> List[List[Document]]:
+        """plan without blocking the event loop; database vector search runs as async queries first"""
+        vector_matches = None
+        # Anything but the in-memory index is a database index, searchable only asynchronously
+        if query_vectors is not None and self.vector_store is not None and not isinstance(self.vector_store, NumpyVectorIndex):
+            vector_matches = await self.vector_store.asearch_by_vectors(query_vectors, k=self.candidates)
+        # Ranking and planning run on a worker thread so framing LLM calls keep progressing meanwhile
+        return await asyncio.to_thread(
+            self.plan, queries, query_vectors, k, diversity, reuse_penalty, scopes, vector_matches
+        )
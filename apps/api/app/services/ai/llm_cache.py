@@ -0,0 +1,117 @@
+"""
+EchoPress AI Backend - LLM Response Cache
+Redis cache of chat completions keyed by model, temperature and rendered messages
+"""
+
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List
+
+from langchain.chat_models.base import BaseChatModel
+from langchain.schema import AIMessage, BaseMessage, ChatGeneration, LLMResult
+
+from app.core.cache import get_cache_value, set_cache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "llm_response"
+
+# Set through bypass_llm_cache(); tasks started inside the block inherit it
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+@contextmanager
+def bypass_llm_cache():
+    """Force fresh completions inside the block; fresh results still replace cached ones"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+def prompt_key(llm: BaseChatModel, prompts: List[List[BaseMessage]]) -> str:
+    """Hash of everything that determines a completion: model, temperature and the exact messages"""
+    identity = {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "prompts": [[[message.type, message.content] for message in messages] for messages in prompts]
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+class LLMResponseCache:
+    """Serves repeated prompts from Redis so retries and partial regenerations skip the LLM"""
+    
+    def __init__(self, enabled: bool = True, ttl_seconds: int = 7 * 24 * 3600, max_entry_bytes: int = 64 * 1024):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes
+    
+    async def agenerate(self, llm: BaseChatModel, prompts: List[List[BaseMessage]]) -> LLMResult:
+        """
+        Drop-in for llm.agenerate that reads and fills the cache
+        
+        Args:
+            llm: Chat model to call on a miss
+            prompts: Message lists, as passed to agenerate
+            
+        Returns:
+            LLMResult with the same generations shape agenerate returns
+        """
+        if not self.enabled:
+            return await llm.agenerate(prompts)
+        
+        key = f"{REDIS_KEY_PREFIX}:{prompt_key(llm, prompts)}"
+        if not _bypass.get():
+            cached = await get_cache_value(key)
+            if isinstance(cached, list):
+                return LLMResult(generations=[
+                    [ChatGeneration(message=AIMessage(content=text)) for text in texts]
+                    for texts in cached
+                ])
+        
+        response = await llm.agenerate(prompts)
+        payload = json.dumps([[generation.text for generation in generations] for generations in response.generations])
+        if len(payload) > self.max_entry_bytes:
+            logger.debug(f"LLM response too large to cache ({len(payload)} bytes)")
+        else:
+            # Redis bounds total memory through TTLs and its maxmemory eviction policy
+            await set_cache(key, payload, expire=self.ttl_seconds)
+        return response
+    
+    async def astream(
+        self,
+        llm: BaseChatModel,
+        messages: List[BaseMessage],
+        on_token: Callable[[str], None]
+    ) -> str:
+        """
+        Stream one completion token by token, sharing cache entries with agenerate
+        
+        Args:
+            llm: Chat model to stream from on a miss
+            messages: Rendered prompt messages
+            on_token: Called with each new piece of text; a cache hit arrives as one piece
+            
+        Returns:
+            The full completion text
+        """
+        key = f"{REDIS_KEY_PREFIX}:{prompt_key(llm, [messages])}"
+        if self.enabled and not _bypass.get():
+            cached = await get_cache_value(key)
+            if isinstance(cached, list) and cached and cached[0]:
+                on_token(cached[0][0])
+                return cached[0][0]
+        
+        pieces = []
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                pieces.append(chunk.content)
+                on_token(chunk.content)
+        text = "".join(pieces)
+        
+        payload = json.dumps([[text]])
+        if self.enabled and len(payload) <= self.max_entry_bytes:
+            await set_cache(key, payload, expire=self.ttl_seconds)
+        return text
@@ -0,0 +1,44 @@
+"""
+EchoPress AI Backend - LLM Throttle
+Concurrency and request-rate limits shared by fanned-out LLM calls
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+class LLMThrottle:
+    """Async context manager bounding in-flight LLM calls and spacing their starts"""
+    
+    def __init__(self, max_concurrency: int = 4, requests_per_minute: Optional[int] = None):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            if self.interval:
+                # Reserve the next start slot under the lock, then sleep outside it
+                async with self._lock:
+                    loop = asyncio.get_running_loop()
+                    start = max(loop.time(), self._next_start)
+                    self._next_start = start + self.interval
+                delay = start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.semaphore.release()
+    
+    async def run(self, awaitable: Awaitable[Any]) -> Any:
+        """Await a coroutine inside the throttle"""
+        async with self:
+            return await awaitable
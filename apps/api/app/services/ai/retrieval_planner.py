@@ -0,0 +1,66 @@
+"""
+EchoPress AI Backend - Retrieval Planner
+Distributes distinct, well-spread passages across all sections of a draft
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def plan_section_citations(
+    rankings: Sequence[Sequence[Tuple[int, float]]],
+    similarity: np.ndarray,
+    positions: Dict[int, int],
+    k: int = 5,
+    diversity: float = 0.3,
+    reuse_penalty: float = 0.5
+) -> List[List[int]]:
+    """
+    Pick k passages per section by maximal marginal relevance with a cross-section reuse penalty
+    
+    Sections pick one passage at a time in turns, so the first section in the outline
+    cannot claim every strong passage before the others get a chance.
+    
+    Args:
+        rankings: Candidate (document index, relevance) pairs per section, best first
+        similarity: Pairwise similarity between all candidates
+        positions: Row of each candidate document index in the similarity matrix
+        k: Passages per section
+        diversity: Weight of redundancy against relevance within a section (0 = plain top-k)
+        reuse_penalty: Score subtracted for each section already citing a passage
+        
+    Returns:
+        Chosen document indices per section, in pick order
+    """
+    relevance = []
+    for ranked in rankings:
+        top = max((score for _, score in ranked), default=0.0)
+        # Fused scores are tiny and query-dependent; scale each section's best to 1
+        relevance.append({doc_id: score / top if top > 0 else 0.0 for doc_id, score in ranked})
+    
+    uses: Dict[int, int] = {}
+    plans: List[List[int]] = [[] for _ in rankings]
+    for _ in range(k):
+        for section, candidates in enumerate(relevance):
+            chosen = plans[section]
+            best, best_score = None, -np.inf
+            for doc_id, score in candidates.items():
+                if doc_id in chosen:
+                    continue
+                redundancy = max(
+                    (similarity[positions[doc_id], positions[other]] for other in chosen),
+                    default=0.0
+                )
+                mmr = (1 - diversity) * score - diversity * redundancy - reuse_penalty * uses.get(doc_id, 0)
+                if mmr > best_score:
+                    best, best_score = doc_id, mmr
+            if best is not None:
+                chosen.append(best)
+                uses[best] = uses.get(best, 0) + 1
+    
+    reused = sum(count - 1 for count in uses.values() if count > 1)
+    logger.debug(f"Planned {sum(len(plan) for plan in plans)} citations across {len(plans)} sections, {reused} reused")
+    return plans
@@ -0,0 +1,153 @@
+"""
+EchoPress AI Backend - Segment Embeddings
+Embeddings persisted on transcript segments and reused until the text changes
+"""
+
+import hashlib
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
+from sqlalchemy import and_, func, select, tuple_, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.transcript import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+def embedding_hash(text: str, model: str) -> str:
+    """Staleness key for a stored vector: the embedding model plus the exact text it embedded"""
+    return hashlib.sha256(f"{model}\n{text}".encode()).hexdigest()
+
+class SegmentEmbeddingStore:
+    """Reads, refreshes and writes back transcript_segments.vector"""
+    
+    def __init__(self, embeddings: Embeddings, model: str):
+        self.embeddings = embeddings
+        self.model = model
+    
+    async def ensure(
+        self,
+        segments: List[TranscriptSegment],
+        precomputed: Optional[Dict[str, List[float]]] = None
+    ) -> List[List[float]]:
+        """
+        Return one vector per segment, embedding only segments that are new or changed
+        
+        Args:
+            segments: Transcript segments, possibly already carrying stored vectors
+            precomputed: Vectors computed earlier in this run, keyed by text
+            
+        Returns:
+            Vectors in segment order
+        """
+        precomputed = precomputed or {}
+        vectors: List[Optional[List[float]]] = []
+        stale: List[TranscriptSegment] = []
+        for segment in segments:
+            expected = embedding_hash(segment.text, self.model)
+            if segment.vector is not None and segment.vector_hash == expected:
+                vectors.append(list(segment.vector))
+            else:
+                vectors.append(precomputed.get(segment.text))
+                stale.append(segment)
+        
+        missing = list(dict.fromkeys(
+            segment.text for segment, vector in zip(segments, vectors) if vector is None
+        ))
+        if missing:
+            embedded = dict(zip(missing, await self.embeddings.aembed_documents(missing)))
+            vectors = [vector if vector is not None else embedded[segment.text] for segment, vector in zip(segments, vectors)]
+        
+        stale_ids = {id(segment) for segment in stale}
+        for segment, vector in zip(segments, vectors):
+            if id(segment) in stale_ids:
+                segment.vector = vector
+                segment.vector_hash = embedding_hash(segment.text, self.model)
+        
+        logger.info(
+            f"Segment embeddings: {len(segments) - len(stale)} reused, "
+            f"{len(stale)} refreshed ({len(missing)} newly embedded)"
+        )
+        if stale:
+            await self._persist(stale)
+        return vectors
+    
+    async def _persist(self, segments: List[TranscriptSegment]):
+        """Write refreshed vectors back so later drafts and regenerations skip embedding"""
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(TranscriptSegment),
+                    [
+                        {"id": segment.id, "vector": segment.vector, "vector_hash": segment.vector_hash}
+                        for segment in segments
+                    ]
+                )
+                await session.commit()
+        except Exception as e:
+            # Segments not saved yet keep their vectors in memory and are stored with the segment rows
+            logger.warning(f"Failed to persist segment embeddings: {e}")
+
+class SegmentVectorIndex:
+    """pgvector search straight over one transcript's stored transcript_segments.vector"""
+    
+    def __init__(self, documents: List[Document], segments: List[TranscriptSegment], model: str):
+        self.documents = documents
+        self.transcript_id = segments[0].transcript_id if segments else None
+        self._current = [(segment.id, embedding_hash(segment.text, model)) for segment in segments]
+        self._positions = {segment.id: index for index, segment in enumerate(segments)}
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    async def available(self) -> bool:
+        """Whether every segment is stored with the vector of its current text"""
+        if not self._current or any(segment_id is None for segment_id, _ in self._current):
+            return False
+        async with AsyncSessionLocal() as session:
+            stored = await session.scalar(
+                select(func.count()).select_from(TranscriptSegment).where(and_(
+                    TranscriptSegment.transcript_id == self.transcript_id,
+                    tuple_(TranscriptSegment.id, TranscriptSegment.vector_hash).in_(self._current)
+                ))
+            )
+        return stored == len(self._current)
+    
+    async def asearch_by_vectors(
+        self,
+        queries: Sequence[Sequence[float]],
+        k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Exact top-k cosine search of the transcript's segments for each query
+        
+        Args:
+            queries: Query embeddings
+            k: Results per query
+            
+        Returns:
+            (document, cosine similarity) pairs per query, most similar first
+        """
+        # Materialized so the planner scans this transcript's rows exactly instead of probing
+        # the table-wide ivfflat index and filtering what few neighbours it returns
+        episode = (
+            select(TranscriptSegment.id, TranscriptSegment.start_ms, TranscriptSegment.vector)
+            .where(TranscriptSegment.transcript_id == self.transcript_id, TranscriptSegment.vector.is_not(None))
+            .cte("episode_segments")
+            .prefix_with("MATERIALIZED")
+        )
+        results = []
+        async with AsyncSessionLocal() as session:
+            for query in queries:
+                distance = episode.c.vector.cosine_distance(query)
+                rows = await session.execute(
+                    select(episode.c.id, distance).order_by(distance, episode.c.start_ms).limit(k)
+                )
+                results.append([
+                    (self.documents[self._positions[segment_id]], 1.0 - float(value))
+                    for segment_id, value in rows
+                    if segment_id in self._positions
+                ])
+        return results
@@ -0,0 +1,151 @@
+"""
+EchoPress AI Backend - Speaker Alignment
+Maps diarization turns onto transcript segments and words
+"""
+
+import bisect
+import logging
+from collections import defaultdict
+from itertools import accumulate
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class SpeakerIndex:
+    """Sorted interval index over diarization turns (times in seconds)"""
+    
+    def __init__(self, turns: List[Dict[str, Any]]):
+        self.turns = sorted(turns, key=lambda turn: turn["start"])
+        self.starts = [turn["start"] for turn in self.turns]
+        # Running max of turn ends is monotone, so bisect finds the first turn that can still overlap
+        self.max_ends = list(accumulate((turn["end"] for turn in self.turns), max))
+    
+    def overlaps(self, start: float, end: float) -> Dict[str, float]:
+        """Seconds of overlap per speaker for the interval [start, end)"""
+        first = bisect.bisect_right(self.max_ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        
+        totals: Dict[str, float] = defaultdict(float)
+        for turn in self.turns[first:last]:
+            overlap = min(end, turn["end"]) - max(start, turn["start"])
+            if overlap > 0:
+                totals[turn["speaker"]] += overlap
+        return totals
+    
+    def speaker_for(self, start: float, end: float) -> Optional[str]:
+        """Speaker with the most overlap, or None if nobody speaks in the interval"""
+        totals = self.overlaps(start, end)
+        if not totals:
+            return None
+        return max(totals, key=totals.get)
+
+def _words_by_segment(segments: List[Dict[str, Any]], words: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Bucket words into the segment whose span contains each word's midpoint"""
+    starts = [segment["start_ms"] for segment in segments]
+    buckets: List[List[Dict[str, Any]]] = [[] for _ in segments]
+    for word in words:
+        midpoint_ms = (word["start"] + word["end"]) * 500
+        index = bisect.bisect_right(starts, midpoint_ms) - 1
+        if 0 <= index < len(segments) and midpoint_ms <= segments[index]["end_ms"]:
+            buckets[index].append(word)
+    return buckets
+
+def _run_speaker(run: List[Dict[str, Any]]) -> Optional[str]:
+    """Speaker holding the most word time in a run; merged runs can start with a folded-in word"""
+    totals: Dict[str, float] = defaultdict(float)
+    for word in run:
+        if word["speaker"] is not None:
+            totals[word["speaker"]] += word["end"] - word["start"]
+    if not totals:
+        return None
+    return max(totals, key=totals.get)
+
+def _speaker_runs(words: List[Dict[str, Any]], min_run_ms: int) -> List[List[Dict[str, Any]]]:
+    """Group consecutive words by speaker, folding runs shorter than min_run_ms into a neighbour"""
+    runs: List[List[Dict[str, Any]]] = []
+    for word in words:
+        if runs and runs[-1][-1]["speaker"] == word["speaker"]:
+            runs[-1].append(word)
+        else:
+            runs.append([word])
+    
+    merged: List[List[Dict[str, Any]]] = []
+    for run in runs:
+        duration_ms = (run[-1]["end"] - run[0]["start"]) * 1000
+        if merged and (duration_ms < min_run_ms or run[0]["speaker"] is None):
+            merged[-1].extend(run)
+        elif merged and _run_speaker(merged[-1]) == run[0]["speaker"]:
+            merged[-1].extend(run)
+        else:
+            merged.append(run)
+    
+    # A short opening run joins the run that follows it
+    if len(merged) > 1 and (merged[0][-1]["end"] - merged[0][0]["start"]) * 1000 < min_run_ms:
+        opening = merged.pop(0)
+        merged[0][:0] = opening
+    return merged
+
+def _split_segment(
+    segment: Dict[str, Any],
+    words: List[Dict[str, Any]],
+    runs: List[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Split a segment at speaker changes, keeping Whisper's punctuation when tokens line up"""
+    tokens = segment["text"].split()
+    use_tokens = len(tokens) == len(words)
+    
+    pieces = []
+    position = 0
+    for index, run in enumerate(runs):
+        if use_tokens:
+            text = " ".join(tokens[position:position + len(run)])
+        else:
+            text = " ".join(word["word"].strip() for word in run)
+        position += len(run)
+        pieces.append({
+            **segment,
+            "start_ms": segment["start_ms"] if index == 0 else int(run[0]["start"] * 1000),
+            "end_ms": segment["end_ms"] if index == len(runs) - 1 else int(runs[index + 1][0]["start"] * 1000),
+            "text": text,
+            "speaker": _run_speaker(run)
+        })
+    return pieces
+
+def align_speakers(
+    segments: List[Dict[str, Any]],
+    words: List[Dict[str, Any]],
+    turns: List[Dict[str, Any]],
+    min_run_ms: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Attribute speakers to transcript segments and words
+    
+    Args:
+        segments: Segment dicts with start_ms/end_ms, in timeline order
+        words: Whisper word timestamps in seconds, in timeline order
+        turns: Diarization turns with start/end in seconds and a speaker label
+        min_run_ms: Shortest speaker run that justifies splitting a segment
+        
+    Returns:
+        Segments with a speaker set, split where the speaker changes mid-segment
+    """
+    index = SpeakerIndex(turns)
+    for word in words:
+        word["speaker"] = index.speaker_for(word["start"], word["end"])
+    
+    aligned = []
+    split_count = 0
+    for segment, segment_words in zip(segments, _words_by_segment(segments, words)):
+        runs = _speaker_runs(segment_words, min_run_ms) if segment_words else []
+        if len(runs) > 1:
+            aligned.extend(_split_segment(segment, segment_words, runs))
+            split_count += 1
+            continue
+        
+        speaker = _run_speaker(runs[0]) if runs else None
+        if speaker is None:
+            speaker = index.speaker_for(segment["start_ms"] / 1000, segment["end_ms"] / 1000)
+        aligned.append({**segment, "speaker": speaker})
+    
+    logger.info(f"Aligned speakers onto {len(segments)} segments ({split_count} split at speaker turns)")
+    return aligned
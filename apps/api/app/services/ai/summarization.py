@@ -0,0 +1,164 @@
+"""
+EchoPress AI Backend - Transcript Summarization
+Hierarchical map-reduce summaries of whole episodes with cached intermediate results
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional
+
+from langchain.chat_models.base import BaseChatModel
+from langchain.prompts import ChatPromptTemplate
+from langchain.schema import Document
+
+from app.core.cache import get_cache_value, set_cache
+from app.services.ai.context_packing import ContextPacker, count_tokens
+from app.services.ai.llm_throttle import LLMThrottle
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts, windowing or cached format change so stale summaries are not reused
+SUMMARY_VERSION = 2
+REDIS_KEY_PREFIX = "summary"
+
+MAP_PROMPT = ChatPromptTemplate.from_template("""
+Summarize this part of a podcast transcript in a few dense paragraphs.
+Keep names, numbers, claims, examples and who said what; drop filler and ads.
+
+{text}
+
+Return only the summary.
+""")
+
+REDUCE_PROMPT = ChatPromptTemplate.from_template("""
+These are summaries of consecutive parts of one podcast episode, in order.
+Merge them into a single summary that preserves the episode's arc, key points,
+names and numbers without repeating itself.
+
+{text}
+
+Return only the merged summary.
+""")
+
+class MapReduceSummarizer:
+    """
+    Summarizes transcript windows concurrently, then merges summaries in a tree
+    
+    Map windows are fixed spans of the episode timeline, so editing a segment only
+    changes its own window's input and every other window's summary stays cached.
+    Reduce groups are filled up to a token budget rather than a fixed fan-in, so
+    typical episodes of any length finish in one map step and one reduce step.
+    """
+    
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        model: str,
+        throttle: LLMThrottle,
+        window_tokens: int = 3000,
+        reduce_tokens: int = 6000,
+        cache_ttl_seconds: int = 30 * 24 * 3600,
+        window_ms: int = 10 * 60 * 1000
+    ):
+        self.llm = llm
+        self.model = model
+        self.throttle = throttle
+        self.packer = ContextPacker(model)
+        self.window_tokens = window_tokens
+        self.reduce_tokens = reduce_tokens
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.window_ms = window_ms
+    
+    async def summarize(self, documents: List[Document]) -> str:
+        """
+        Summary of a whole transcript
+        
+        Args:
+            documents: Transcript passages in order, with speaker and timing metadata
+            
+        Returns:
+            One summary covering every passage, or an empty string for an empty transcript
+        """
+        windows = self._windows(documents)
+        if not windows:
+            return ""
+        
+        # Map: every window at once, bounded only by the shared throttle
+        summaries = await asyncio.gather(*(self._summarize("map", window) for window in windows))
+        level = 0
+        while len(summaries) > 1:
+            level += 1
+            groups = self._group(summaries)
+            summaries = await asyncio.gather(*(
+                self._summarize("reduce", "\n\n---\n\n".join(group)) for group in groups
+            ))
+            logger.debug(f"Summary reduce level {level}: {len(groups)} groups")
+        
+        logger.info(f"Summarized {len(windows)} transcript windows in {level + 1} serial steps")
+        return summaries[0]
+    
+    def _windows(self, documents: List[Document]) -> List[str]:
+        """Passages grouped by fixed spans of the timeline, each split further only if over window_tokens"""
+        # Passages without timings, e.g. split from plain transcript text, form one span
+        spans: Dict[int, List[Document]] = {}
+        for doc in documents:
+            start_ms = doc.metadata.get("start_ms")
+            spans.setdefault(start_ms // self.window_ms if start_ms is not None else 0, []).append(doc)
+        
+        windows = []
+        for span in spans.values():
+            windows.extend(self._split_by_tokens(span))
+        return [self.packer.format(window) for window in windows]
+    
+    def _split_by_tokens(self, documents: List[Document]) -> List[List[Document]]:
+        """Consecutive passages grouped up to window_tokens"""
+        windows, current, used = [], [], 0
+        for doc in documents:
+            cost = count_tokens(doc.page_content, self.model)
+            if current and used + cost > self.window_tokens:
+                windows.append(current)
+                current, used = [], 0
+            current.append(doc)
+            used += cost
+        if current:
+            windows.append(current)
+        return windows
+    
+    def _group(self, summaries: List[str]) -> List[List[str]]:
+        """Consecutive summaries grouped up to reduce_tokens, at least two per group"""
+        groups, current, used = [], [], 0
+        for summary in summaries:
+            cost = count_tokens(summary, self.model)
+            if len(current) >= 2 and used + cost > self.reduce_tokens:
+                groups.append(current)
+                current, used = [], 0
+            current.append(summary)
+            used += cost
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].extend(current)
+            else:
+                groups.append(current)
+        return groups
+    
+    def _cache_key(self, kind: str, text: str) -> str:
+        identity = json.dumps([SUMMARY_VERSION, self.model, kind, text])
+        return f"{REDIS_KEY_PREFIX}:{hashlib.sha256(identity.encode()).hexdigest()}"
+    
+    async def _summarize(self, kind: str, text: str) -> str:
+        """One map or reduce call, served from the cache when the same input was summarized before"""
+        key = self._cache_key(kind, text)
+        cached: Optional[str] = await get_cache_value(key)
+        if isinstance(cached, str):
+            return cached
+        
+        prompt = MAP_PROMPT if kind == "map" else REDUCE_PROMPT
+        async with self.throttle:
+            response = await self.llm.agenerate([prompt.format_messages(text=text)])
+        summary = response.generations[0][0].text.strip()
+        
+        # JSON-encoded because get_cache_value decodes, and a bare summary like "42" would come back an int
+        await set_cache(key, json.dumps(summary), expire=self.cache_ttl_seconds)
+        return summary
@@ -0,0 +1,98 @@
+"""
+EchoPress AI Backend - Topic Labeling
+Batched LLM topic extraction for transcript segments
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPIC = "general"
+
+# An indented JSON-mode entry such as {"index": 12, "topic": "Startup Fundraising"} takes ~18 tokens
+TOKENS_PER_TOPIC = 32
+
+TOPIC_SYSTEM_PROMPT = (
+    "You label podcast transcript segments with a short topic (1-3 words). "
+    "Each segment is given as [index] text. Respond with JSON of the form "
+    '{"topics": [{"index": 0, "topic": "Topic"}]} containing one entry per segment.'
+)
+
+class BatchTopicLabeler:
+    """Labels many transcript segments per chat completion, with bounded concurrency"""
+    
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        model: str,
+        batch_size: int = 40,
+        max_concurrency: int = 4,
+        max_segment_chars: int = 500
+    ):
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.max_segment_chars = max_segment_chars
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def label(self, texts: List[str]) -> List[str]:
+        """Return one topic per input text, in input order"""
+        topics = [DEFAULT_TOPIC] * len(texts)
+        
+        async def label_batch(start: int):
+            batch = texts[start:start + self.batch_size]
+            async with self.semaphore:
+                batch_topics = await self._label_batch(batch)
+            for offset, topic in batch_topics.items():
+                topics[start + offset] = topic
+        
+        await asyncio.gather(*(
+            label_batch(start) for start in range(0, len(texts), self.batch_size)
+        ))
+        return topics
+    
+    async def _label_batch(self, batch: List[str]) -> Dict[int, str]:
+        """Label one batch; indices in the result are relative to the batch"""
+        numbered = "\n".join(
+            f"[{index}] {text.strip()[:self.max_segment_chars]}"
+            for index, text in enumerate(batch)
+        )
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": TOPIC_SYSTEM_PROMPT},
+                    {"role": "user", "content": numbered}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=TOKENS_PER_TOPIC * len(batch) + 32,
+                temperature=0.1
+            )
+            choice = response.choices[0]
+            if choice.finish_reason == "length" and len(batch) > 1:
+                # Truncated JSON would not parse; halves get the same per-segment budget with less overhead
+                logger.info(f"Topic batch of {len(batch)} segments hit max_tokens, retrying in halves")
+                middle = len(batch) // 2
+                first = await self._label_batch(batch[:middle])
+                second = await self._label_batch(batch[middle:])
+                return {**first, **{middle + offset: topic for offset, topic in second.items()}}
+            payload = json.loads(choice.message.content)
+        except Exception as e:
+            logger.warning(f"Batch topic extraction failed for {len(batch)} segments: {e}")
+            return {}
+        
+        topics = {}
+        for item in payload.get("topics", []):
+            try:
+                index = int(item["index"])
+                topic = str(item["topic"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < len(batch) and topic:
+                topics[index] = topic
+        return topics
@@ -0,0 +1,170 @@
+"""
+EchoPress AI Backend - Topic Segmentation
+Offline TextTiling-style topic segmentation over transcript segments
+"""
+
+import logging
+import re
+from typing import Dict, Any, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'\-]*[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't did didn't do does doesn't doing
+don't down during each even few for from further get gets getting go going gonna got had hadn't has
+hasn't have haven't having he he'd he'll he's her here here's hers herself him himself his how
+how's i i'd i'll i'm i've if in into is isn't it it's its itself just kind know let's like lot
+maybe me mean more most mustn't my myself no nor not now of off okay on once one only or other
+ought our ours ourselves out over own pretty really right said same say says see shan't she she'd
+she'll she's should shouldn't so some something sort such sure than that that's the their theirs
+them themselves then there there's these they they'd they'll they're they've thing things think
+this those through to too um uh under until up us very want was wasn't way we we'd we'll we're
+we've well were weren't what what's when when's where where's which while who who's whom why why's
+will with won't would wouldn't yeah yes you you'd you'll you're you've your yours yourself
+yourselves
+""".split())
+
+class TopicSegmenter:
+    """Finds topic boundaries with TF-IDF block similarity and TextTiling depth scores"""
+    
+    def __init__(self, window_segments: int = 6, num_keywords: int = 3, min_span_segments: int = 3):
+        self.window_segments = window_segments
+        self.num_keywords = num_keywords
+        self.min_span_segments = min_span_segments
+    
+    def segment(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Group consecutive transcript segments into labeled topic spans
+        
+        Args:
+            segments: Segment dicts with text, start_ms and end_ms, in timeline order
+            
+        Returns:
+            Topic spans with segment index range, time range, keywords and label
+        """
+        if not segments:
+            return []
+        
+        tokens = [self._tokenize(segment["text"]) for segment in segments]
+        vocabulary = {term: index for index, term in enumerate(sorted({t for ts in tokens for t in ts}))}
+        if not vocabulary:
+            return [self._build_span(segments, 0, len(segments), [])]
+        
+        term_counts = self._term_counts(tokens, vocabulary)
+        idf = self._inverse_document_frequency(term_counts)
+        boundaries = self._find_boundaries(term_counts * idf)
+        
+        terms = np.array(sorted(vocabulary, key=vocabulary.get))
+        edges = [0, *boundaries, len(segments)]
+        spans = []
+        for start, end in zip(edges[:-1], edges[1:]):
+            weights = term_counts[start:end].sum(axis=0) * idf
+            top = np.argsort(weights)[::-1][:self.num_keywords]
+            keywords = [str(terms[index]) for index in top if weights[index] > 0]
+            spans.append(self._build_span(segments, start, end, keywords))
+        
+        logger.info(f"Segmented {len(segments)} transcript segments into {len(spans)} topic spans")
+        return spans
+    
+    def _tokenize(self, text: str) -> List[str]:
+        return [
+            token for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 2 and token not in STOPWORDS
+        ]
+    
+    def _term_counts(self, tokens: List[List[str]], vocabulary: Dict[str, int]) -> np.ndarray:
+        """Dense segment x term count matrix"""
+        counts = np.zeros((len(tokens), len(vocabulary)), dtype=np.float32)
+        rows = np.repeat(np.arange(len(tokens)), [len(ts) for ts in tokens])
+        cols = np.fromiter((vocabulary[t] for ts in tokens for t in ts), dtype=np.int64, count=len(rows))
+        np.add.at(counts, (rows, cols), 1.0)
+        return counts
+    
+    def _inverse_document_frequency(self, term_counts: np.ndarray) -> np.ndarray:
+        document_frequency = (term_counts > 0).sum(axis=0)
+        return np.log((1 + term_counts.shape[0]) / (1 + document_frequency)).astype(np.float32) + 1.0
+    
+    def _gap_similarities(self, weighted: np.ndarray) -> np.ndarray:
+        """Cosine similarity between the blocks left and right of every segment gap"""
+        n, window = weighted.shape[0], self.window_segments
+        cumulative = np.vstack([np.zeros((1, weighted.shape[1]), dtype=np.float32), np.cumsum(weighted, axis=0)])
+        
+        gaps = np.arange(1, n)
+        left = cumulative[gaps] - cumulative[np.maximum(gaps - window, 0)]
+        right = cumulative[np.minimum(gaps + window, n)] - cumulative[gaps]
+        
+        norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+        dots = np.einsum("ij,ij->i", left, right)
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    
+    def _depth_scores(self, similarities: np.ndarray) -> np.ndarray:
+        """TextTiling depth: how far each gap sits below the peaks on either side"""
+        depths = np.zeros_like(similarities)
+        for gap, value in enumerate(similarities):
+            left_peak = value
+            for index in range(gap - 1, -1, -1):
+                if similarities[index] < left_peak:
+                    break
+                left_peak = similarities[index]
+            right_peak = value
+            for index in range(gap + 1, len(similarities)):
+                if similarities[index] < right_peak:
+                    break
+                right_peak = similarities[index]
+            depths[gap] = (left_peak - value) + (right_peak - value)
+        return depths
+    
+    def _find_boundaries(self, weighted: np.ndarray) -> List[int]:
+        """Segment indices where a new topic span starts"""
+        if weighted.shape[0] < 2 * self.min_span_segments:
+            return []
+        
+        similarities = self._gap_similarities(weighted)
+        smoothed = np.convolve(similarities, np.ones(3, dtype=np.float32) / 3, mode="same")
+        depths = self._depth_scores(smoothed)
+        
+        # Only valleys of the similarity curve are boundary candidates (Hearst, 1997)
+        padded = np.pad(smoothed, 1, mode="edge")
+        valleys = np.flatnonzero((smoothed <= padded[:-2]) & (smoothed <= padded[2:]) & (depths > 0))
+        if valleys.size == 0:
+            return []
+        cutoff = depths[valleys].mean() - depths[valleys].std() / 2
+        
+        # Deepest valleys first, keeping every span at least min_span_segments long
+        boundaries: List[int] = []
+        for gap in valleys[np.argsort(depths[valleys])[::-1]]:
+            if depths[gap] <= cutoff:
+                break
+            boundary = int(gap) + 1
+            if boundary < self.min_span_segments or weighted.shape[0] - boundary < self.min_span_segments:
+                continue
+            if all(abs(boundary - existing) >= self.min_span_segments for existing in boundaries):
+                boundaries.append(boundary)
+        return sorted(boundaries)
+    
+    def _build_span(
+        self,
+        segments: List[Dict[str, Any]],
+        start: int,
+        end: int,
+        keywords: List[str]
+    ) -> Dict[str, Any]:
+        return {
+            "start_index": start,
+            "end_index": end,
+            "start_ms": segments[start]["start_ms"],
+            "end_ms": segments[end - 1]["end_ms"],
+            "keywords": keywords,
+            "topic": ", ".join(keyword.title() for keyword in keywords) or "general"
+        }
+
+def assign_span_topics(segments: List[Dict[str, Any]], spans: List[Dict[str, Any]]) -> None:
+    """Label every segment with the topic of the span that contains it"""
+    for span in spans:
+        for segment in segments[span["start_index"]:span["end_index"]]:
+            segment["topic"] = span["topic"]
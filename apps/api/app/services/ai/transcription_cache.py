@@ -0,0 +1,138 @@
+"""
+EchoPress AI Backend - Transcription Cache
+Content-addressed cache of finished transcription results
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Any, Optional
+
+import soundfile as sf
+
+from app.core.cache import get_cache_value, set_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached result layout or pipeline output changes meaningfully
+CACHE_VERSION = 1
+REDIS_KEY_PREFIX = "transcription"
+HASH_BLOCK_SAMPLES = 16000 * 60
+
+def fingerprint_pcm(wav_path: str) -> str:
+    """Streaming sha256 of decoded PCM samples, independent of the WAV header"""
+    digest = hashlib.sha256()
+    for block in sf.blocks(wav_path, blocksize=HASH_BLOCK_SAMPLES, dtype="int16"):
+        digest.update(block.tobytes())
+    return digest.hexdigest()
+
+class TranscriptionCache:
+    """Stores transcription results in Redis or on disk, keyed by audio content and pipeline settings"""
+    
+    def __init__(
+        self,
+        backend: str = "redis",
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 1024 ** 3,
+        ttl_seconds: int = 30 * 24 * 3600
+    ):
+        self.backend = backend
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "echopress_transcription_cache")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        if self.backend == "disk":
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend in ("redis", "disk")
+    
+    def key_for(self, audio_hash: str, offset_ms: int, language: str, model: str) -> str:
+        """
+        Cache key for preprocessed audio under the current transcription settings
+        
+        Args:
+            audio_hash: fingerprint_pcm of the preprocessed 16 kHz mono WAV
+            offset_ms: Audio trimmed before wav_path starts, which shifts every timestamp
+            language: Requested transcription language
+            model: ASR backend model identifier
+            
+        Returns:
+            Hex digest identifying the audio and every setting that shapes the result
+        """
+        parameters = {
+            "version": CACHE_VERSION,
+            "audio": audio_hash,
+            "offset_ms": offset_ms,
+            "model": model,
+            "language": language,
+            "chunk_seconds": settings.TRANSCRIPTION_CHUNK_SECONDS if settings.TRANSCRIPTION_CHUNKING_ENABLED else None,
+            "diarization": settings.DIARIZATION_MODEL if settings.ENABLE_PYANNOTE_DIARIZATION else None,
+            "vad": [settings.VAD_ENERGY_OFFSET_DB, settings.VAD_MIN_SILENCE_MS, settings.VAD_PADDING_MS] if settings.VAD_ENABLED else None,
+            "topic_engine": settings.TOPIC_ENGINE
+        }
+        return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a key, or None on a miss"""
+        if self.backend == "redis":
+            return await get_cache_value(f"{REDIS_KEY_PREFIX}:{key}")
+        if self.backend == "disk":
+            return await asyncio.to_thread(self._read_file, key)
+        return None
+    
+    async def set(self, key: str, result: Dict[str, Any]):
+        """Store a finished result, skipping entries larger than the whole cache budget"""
+        payload = json.dumps(result, default=str)
+        if len(payload) > self.max_bytes:
+            logger.warning(f"Transcription result too large to cache ({len(payload)} bytes)")
+            return
+        
+        if self.backend == "redis":
+            # Redis bounds its own memory through TTLs and its maxmemory eviction policy
+            await set_cache(f"{REDIS_KEY_PREFIX}:{key}", payload, expire=self.ttl_seconds)
+        elif self.backend == "disk":
+            await asyncio.to_thread(self._write_file, key, payload)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _read_file(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as cache_file:
+                result = json.load(cache_file)
+            # Touch so eviction treats the entry as recently used
+            os.utime(path)
+            return result
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable transcription cache entry {key[:12]}: {e}")
+            return None
+    
+    def _write_file(self, key: str, payload: str):
+        temp_path = f"{self._path(key)}.tmp"
+        with open(temp_path, "w") as cache_file:
+            cache_file.write(payload)
+        os.replace(temp_path, self._path(key))
+        self._evict()
+    
+    def _evict(self):
+        """Drop least recently used results until the cache fits its byte budget"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
@@ -0,0 +1,77 @@
+"""
+EchoPress AI Backend - Transcription Checkpoints
+Per-chunk transcription results persisted as they arrive so retries resume
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Any, List
+
+from app.core.cache import get_cache, set_cache
+from app.services.ai.audio_chunking import AudioChunk
+from app.services.ai.voice_activity import SpeechRegion
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "transcription_checkpoint"
+
+def plan_key(
+    audio_hash: str,
+    language: str,
+    model: str,
+    regions: List[SpeechRegion],
+    chunks: List[AudioChunk]
+) -> str:
+    """Identity of a chunk plan; any change to the audio, model, speech regions or boundaries starts fresh"""
+    parameters = {
+        "audio": audio_hash,
+        "language": language,
+        "model": model,
+        "regions": [[region.start_ms, region.end_ms] for region in regions],
+        "chunks": [[chunk.start_ms, chunk.end_ms, chunk.keep_start_ms, chunk.keep_end_ms] for chunk in chunks]
+    }
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+
+class ChunkCheckpointStore:
+    """Redis-backed store of raw per-chunk ASR results for one chunk plan"""
+    
+    def __init__(self, ttl_seconds: int = 7 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+    
+    def _key(self, plan: str, index: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:{plan}:{index}"
+    
+    async def load(self, plan: str, chunks: List[AudioChunk]) -> Dict[int, Dict[str, Any]]:
+        """Results already checkpointed for a plan, by chunk index"""
+        try:
+            cache = await get_cache()
+            values = await cache.mget([self._key(plan, chunk.index) for chunk in chunks])
+        except Exception as e:
+            logger.warning(f"Transcription checkpoints unavailable: {e}")
+            return {}
+        
+        completed = {}
+        for chunk, value in zip(chunks, values):
+            if value is None:
+                continue
+            try:
+                completed[chunk.index] = json.loads(value)
+            except (TypeError, ValueError) as e:
+                # A corrupt entry only costs its own chunk, which is transcribed again
+                logger.warning(f"Dropping unreadable checkpoint for chunk {chunk.index} of plan {plan[:12]}: {e}")
+        return completed
+    
+    async def save(self, plan: str, chunk: AudioChunk, result: Dict[str, Any]) -> bool:
+        """Persist one chunk's result the moment it arrives"""
+        return await set_cache(self._key(plan, chunk.index), json.dumps(result), expire=self.ttl_seconds)
+    
+    async def clear(self, plan: str, chunks: List[AudioChunk]) -> int:
+        """Drop a plan's checkpoints once the whole episode is stitched"""
+        # The plan fixes every chunk index, so delete exact keys instead of scanning with KEYS
+        try:
+            cache = await get_cache()
+            return await cache.delete(*(self._key(plan, chunk.index) for chunk in chunks))
+        except Exception as e:
+            logger.warning(f"Failed to clear transcription checkpoints for plan {plan[:12]}: {e}")
+            return 0
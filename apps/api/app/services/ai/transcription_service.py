@@ -5,58 +5,132 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 import json
 import tempfile
 import os
 from datetime import datetime
 
 import openai
-from pyannote.audio import Pipeline
-from pyannote.audio.pipelines.utils.hook import ProgressHook
 import torch
 
 from app.core.config import settings
 from app.models.transcript import Transcript, TranscriptSegment
 from app.models.episode import Episode
+from app.services.ai.asr_backends import ASRBackend, LocalWhisperBackend, OpenAIASRBackend
+from app.services.ai.audio_chunking import AudioChunk, AudioChunker, stitch_chunk_results, trim_chunk_result
+from app.services.ai.audio_ingestion import AudioIngestor
+from app.services.ai.audio_preprocessing import AudioPreprocessor, PreparedAudio
+from app.services.ai.diarization_worker import get_diarization_pool
+from app.services.ai.speaker_alignment import align_speakers
+from app.services.ai.transcription_cache import TranscriptionCache, fingerprint_pcm
+from app.services.ai.transcription_checkpoints import ChunkCheckpointStore, plan_key
+from app.services.ai.voice_activity import SpeechTimeline, VoiceActivityDetector, write_speech_audio
+from app.services.ai.whisper_worker import get_whisper_pool
+from app.services.websocket_manager import websocket_manager
+from app.services.ai.topic_labeling import BatchTopicLabeler
+from app.services.ai.topic_segmentation import TopicSegmenter, assign_span_topics
 
 logger = logging.getLogger(__name__)
 
+# Receives each chunk's finalized segments, in completion order, while transcription runs
+PartialCallback = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
 class TranscriptionService:
     """Service for audio transcription and speaker diarization"""
     
     def __init__(self):
         self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.diarization_pipeline = None
+        self.diarization_pool = None
+        # Shared across episodes so MAX_CONCURRENT_TRANSCRIPTIONS bounds total in-flight requests
+        self.transcription_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_TRANSCRIPTIONS)
+        self.chunker = AudioChunker(
+            chunk_ms=settings.TRANSCRIPTION_CHUNK_SECONDS * 1000,
+            overlap_ms=settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS * 1000,
+            max_upload_bytes=settings.TRANSCRIPTION_MAX_UPLOAD_BYTES,
+            export_format=settings.ASR_UPLOAD_FORMAT,
+            export_codec=settings.ASR_UPLOAD_CODEC,
+            export_bitrate=settings.ASR_UPLOAD_BITRATE
+        )
+        self.asr_backend = self._init_asr_backend()
+        self.preprocessor = AudioPreprocessor(
+            AudioIngestor(),
+            cache_dir=settings.AUDIO_CACHE_DIR,
+            max_cache_bytes=settings.AUDIO_CACHE_MAX_BYTES,
+            trim_silence=settings.AUDIO_TRIM_SILENCE
+        )
+        self.result_cache = TranscriptionCache(
+            backend=settings.TRANSCRIPTION_CACHE_BACKEND,
+            cache_dir=settings.TRANSCRIPTION_CACHE_DIR,
+            max_bytes=settings.TRANSCRIPTION_CACHE_MAX_BYTES,
+            ttl_seconds=settings.TRANSCRIPTION_CACHE_TTL
+        )
+        self.checkpoints = ChunkCheckpointStore(ttl_seconds=settings.TRANSCRIPTION_CHECKPOINT_TTL)
+        self.voice_activity_detector = VoiceActivityDetector(
+            energy_offset_db=settings.VAD_ENERGY_OFFSET_DB,
+            min_silence_ms=settings.VAD_MIN_SILENCE_MS,
+            padding_ms=settings.VAD_PADDING_MS
+        )
+        self.topic_labeler = BatchTopicLabeler(
+            self.openai_client,
+            model=settings.OPENAI_MODEL,
+            batch_size=settings.TOPIC_BATCH_SIZE,
+            max_concurrency=settings.TOPIC_MAX_CONCURRENT_BATCHES
+        )
+        self.topic_segmenter = TopicSegmenter(
+            window_segments=settings.TOPIC_WINDOW_SEGMENTS,
+            num_keywords=settings.TOPIC_KEYWORDS
+        )
         self._init_diarization()
     
+    def _init_asr_backend(self) -> ASRBackend:
+        """Pick the speech recognition engine configured by ASR_BACKEND"""
+        if settings.ASR_BACKEND == "local":
+            if settings.ENABLE_WHISPER_ASR:
+                # Each worker process loads (and quantizes) the model once, on first use
+                pool = get_whisper_pool(
+                    max_workers=settings.LOCAL_WHISPER_WORKERS,
+                    model_name=settings.LOCAL_WHISPER_MODEL,
+                    quantize=settings.LOCAL_WHISPER_QUANTIZE,
+                    batch_size=settings.LOCAL_WHISPER_BATCH_SIZE
+                )
+                logger.info(f"Using local Whisper backend ({settings.LOCAL_WHISPER_MODEL})")
+                return LocalWhisperBackend(pool, settings.LOCAL_WHISPER_MODEL, settings.LOCAL_WHISPER_QUANTIZE)
+            # Same switch as ENABLE_PYANNOTE_DIARIZATION: off means no model is loaded in-process
+            logger.warning("ASR_BACKEND=local but ENABLE_WHISPER_ASR is off, using the OpenAI API")
+        return OpenAIASRBackend(self.openai_client, self.chunker)
+    
     def _init_diarization(self):
-        """Initialize pyannote.audio diarization pipeline"""
+        """Attach the shared pyannote.audio diarization worker pool"""
         try:
             if settings.ENABLE_PYANNOTE_DIARIZATION:
                 # Note: Requires HuggingFace token for pyannote/speaker-diarization
-                self.diarization_pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=settings.HUGGINGFACE_TOKEN
+                # Each worker process loads the pipeline once, on first use
+                self.diarization_pool = get_diarization_pool(
+                    max_workers=settings.DIARIZATION_WORKERS,
+                    model_name=settings.DIARIZATION_MODEL,
+                    auth_token=settings.HUGGINGFACE_TOKEN
                 )
-                logger.info("Diarization pipeline initialized successfully")
+                logger.info("Diarization worker pool initialized successfully")
         except Exception as e:
-            logger.warning(f"Failed to initialize diarization pipeline: {e}")
-            self.diarization_pipeline = None
+            logger.warning(f"Failed to initialize diarization worker pool: {e}")
+            self.diarization_pool = None
     
     async def transcribe_audio(
         self, 
         audio_file_path: str, 
         episode: Episode,
-        language: str = "en"
+        language: str = "en",
+        on_partial: Optional[PartialCallback] = None
     ) -> Dict[str, Any]:
         """
         Transcribe audio file using OpenAI Whisper API
         
         Args:
-            audio_file_path: Path to audio file
+            audio_file_path: Local path, storage key or URL of the audio
             episode: Episode model instance
             language: Language code (default: "en")
+            on_partial: Awaited with each chunk's finalized segments as soon as it is ready
             
         Returns:
             Dict containing transcription data
@@ -67,62 +141,218 @@ async def transcribe_audio(
             # Update episode status
             episode.status = "transcribing"
             
-            # Transcribe with Whisper
-            with open(audio_file_path, "rb") as audio_file:
-                transcript_response = await self.openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language,
-                    response_format="verbose_json",
-                    timestamp_granularities=["word"]
-                )
-            
-            # Extract transcription data
-            transcription_data = {
-                "text": transcript_response.text,
-                "language": transcript_response.language,
-                "duration": transcript_response.duration,
-                "segments": transcript_response.segments,
-                "words": transcript_response.words if hasattr(transcript_response, 'words') else []
-            }
-            
-            # Perform diarization if enabled
-            if self.diarization_pipeline and settings.ENABLE_PYANNOTE_DIARIZATION:
-                diarization_data = await self._perform_diarization(audio_file_path)
-                transcription_data["diarization"] = diarization_data
+            # Downmix, resample and trim once into a shared 16 kHz mono buffer for Whisper and pyannote
+            prepared = await self.preprocessor.prepare(audio_file_path)
+            try:
+                audio_hash = await asyncio.to_thread(fingerprint_pcm, prepared.path)
+                
+                # Identical audio under identical settings yields the finished result instantly
+                cache_key = None
+                if self.result_cache.enabled:
+                    cache_key = self.result_cache.key_for(audio_hash, prepared.offset_ms, language, self.asr_backend.model_id)
+                    cached_result = await self.result_cache.get(cache_key)
+                    if cached_result:
+                        logger.info(f"Reusing cached transcription for episode {episode.id}")
+                        return cached_result
+                
+                # Only detected speech goes to Whisper and pyannote
+                speech_path, timeline = await self._speech_audio(prepared)
+                try:
+                    # Start diarization in the worker pool so it overlaps with Whisper
+                    diarization_task = None
+                    if self.diarization_pool and settings.ENABLE_PYANNOTE_DIARIZATION:
+                        diarization_task = asyncio.create_task(
+                            self._perform_diarization(speech_path, timeline, episode.id)
+                        )
+                    
+                    # Transcribe with Whisper, splitting long episodes into concurrent chunks
+                    try:
+                        transcription_data, checkpoint_plan, chunks = await self._transcribe_chunks(
+                            speech_path, language, audio_hash, timeline, episode.id, on_partial, diarization_task
+                        )
+                        transcription_data = timeline.remap_result(transcription_data)
+                    except Exception:
+                        if diarization_task:
+                            diarization_task.cancel()
+                        raise
+                    transcription_data["duration"] = (prepared.offset_ms + prepared.duration_ms) / 1000
+                    
+                    if diarization_task:
+                        transcription_data["diarization"] = await diarization_task
+                finally:
+                    if speech_path != prepared.path:
+                        os.remove(speech_path)
+            finally:
+                self.preprocessor.release(prepared)
             
             # Create transcript segments
             segments = await self._create_segments(transcription_data)
             
+            # Attribute speakers, splitting segments that span a speaker change
+            speaker_segments = (transcription_data.get("diarization") or {}).get("speaker_segments")
+            if speaker_segments:
+                segments = align_speakers(segments, transcription_data.get("words", []), speaker_segments)
+            
+            topic_spans = await self._assign_topics(segments)
+            
             logger.info(f"Transcription completed for episode {episode.id}")
             
-            return {
+            result = {
                 "transcript": transcription_data["text"],
                 "language": transcription_data["language"],
                 "confidence": self._calculate_confidence(transcription_data),
                 "diarization_data": transcription_data.get("diarization"),
-                "segments": segments
+                "segments": segments,
+                "topic_spans": topic_spans
             }
             
+            # A degraded run without speakers should not be served again
+            if cache_key and not (transcription_data.get("diarization") or {}).get("failed"):
+                await self.result_cache.set(cache_key, result)
+            
+            if settings.TRANSCRIPTION_CHECKPOINTS_ENABLED:
+                await self.checkpoints.clear(checkpoint_plan, chunks)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Transcription failed for episode {episode.id}: {e}")
             episode.status = "failed"
             raise
     
-    async def _perform_diarization(self, audio_file_path: str) -> Dict[str, Any]:
-        """Perform speaker diarization using pyannote.audio"""
+    async def _speech_audio(self, prepared: PreparedAudio):
+        """Speech-only copy of the prepared audio and the timeline that maps it back"""
+        if not settings.VAD_ENABLED:
+            return prepared.path, SpeechTimeline(offset_ms=prepared.offset_ms)
+        
+        regions = await asyncio.to_thread(self.voice_activity_detector.detect, prepared.path)
+        skipped_ms = prepared.duration_ms - sum(region.duration_ms for region in regions)
+        if skipped_ms < settings.VAD_MIN_SILENCE_MS:
+            return prepared.path, SpeechTimeline(offset_ms=prepared.offset_ms)
+        
+        speech_path = await asyncio.to_thread(write_speech_audio, prepared.path, regions)
+        logger.info(f"Skipping {skipped_ms / 1000:.0f}s of non-speech audio before ASR")
+        return speech_path, SpeechTimeline(regions, offset_ms=prepared.offset_ms)
+    
+    async def _transcribe_chunks(
+        self,
+        audio_path: str,
+        language: str,
+        audio_hash: str,
+        timeline: SpeechTimeline,
+        episode_id: str,
+        on_partial: Optional[PartialCallback] = None,
+        diarization_task: Optional[asyncio.Task] = None
+    ):
+        """
+        Transcribe overlapping silence-aligned chunks concurrently and stitch the results
+        
+        Each chunk is checkpointed as it completes, so a retry of the same audio only
+        transcribes the chunks that are still missing. Its finalized segments are
+        published straight away rather than after the whole episode.
+        
+        Returns:
+            Stitched transcription data, the checkpoint plan key and the planned chunks
+        """
+        if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+            chunks = await asyncio.to_thread(self.chunker.plan, audio_path)
+        else:
+            chunks = self.chunker.single(audio_path)
+        
+        plan = plan_key(audio_hash, language, self.asr_backend.model_id, timeline.regions, chunks)
+        completed = {}
+        if settings.TRANSCRIPTION_CHECKPOINTS_ENABLED:
+            completed = await self.checkpoints.load(plan, chunks)
+            if completed:
+                logger.info(f"Resuming transcription with {len(completed)}/{len(chunks)} chunks already done")
+        
+        finished = 0
+        publishing = []
+        
+        async def transcribe_chunk(chunk):
+            nonlocal finished
+            if chunk.index in completed:
+                result = completed[chunk.index]
+            else:
+                async with self.transcription_semaphore:
+                    result = await self.asr_backend.transcribe(audio_path, chunk, language)
+                logger.debug(f"Transcribed chunk {chunk.index + 1}/{len(chunks)}")
+                if settings.TRANSCRIPTION_CHECKPOINTS_ENABLED:
+                    await self.checkpoints.save(plan, chunk, result)
+            
+            finished += 1
+            # Publishing may wait for speaker turns, which must not hold up the remaining chunks
+            publishing.append(asyncio.create_task(self._publish_partial(
+                episode_id, chunk, result, timeline, finished, len(chunks), on_partial, diarization_task
+            )))
+            return result
+        
+        # Let every chunk finish or fail so all completed work is checkpointed before raising
+        results = await asyncio.gather(*(transcribe_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            for task in publishing:
+                task.cancel()
+            logger.error(f"{len(failures)}/{len(chunks)} transcription chunks failed; completed chunks are checkpointed")
+            raise failures[0]
+        await asyncio.gather(*publishing)
+        
+        return stitch_chunk_results(chunks, results, chunks[-1].end_ms), plan, chunks
+    
+    async def _publish_partial(
+        self,
+        episode_id: str,
+        chunk: AudioChunk,
+        result: Dict[str, Any],
+        timeline: SpeechTimeline,
+        finished: int,
+        total: int,
+        on_partial: Optional[PartialCallback],
+        diarization_task: Optional[asyncio.Task] = None
+    ):
+        """Push a chunk's overlap-free segments, on the episode timeline, to listeners"""
         try:
+            # Ownership of overlapping segments is decided per chunk, so these never change later
+            partial = timeline.remap_result(trim_chunk_result(chunk, result))
+            segments = await self._create_segments(partial)
+            
+            await websocket_manager.send_transcription_partial(episode_id, chunk.index, total, segments)
+            await websocket_manager.send_transcription_progress(
+                episode_id,
+                finished / total * 100,
+                f"Transcribed {finished}/{total} chunks"
+            )
+            if on_partial:
+                if diarization_task is not None:
+                    # Listeners get segments as they will be stored: split wherever the speaker changes.
+                    # Words never cross chunk ownership, so aligning per chunk matches the final pass.
+                    diarization = await asyncio.shield(diarization_task)
+                    if diarization.get("speaker_segments"):
+                        segments = align_speakers(segments, partial.get("words", []), diarization["speaker_segments"])
+                await on_partial(segments)
+        except Exception as e:
+            logger.warning(f"Failed to publish partial transcript for episode {episode_id}: {e}")
+    
+    async def _perform_diarization(
+        self,
+        audio_path: str,
+        timeline: SpeechTimeline,
+        episode_id: str
+    ) -> Dict[str, Any]:
+        """Perform speaker diarization using pyannote.audio in a worker process"""
+        try:
+            async def report_progress(step_name: str, completed: int, total: int):
+                logger.debug(f"Diarization {step_name} for episode {episode_id}: {completed}/{total}")
+                await websocket_manager.send_diarization_progress(episode_id, step_name, completed, total)
+            
             # Run diarization
-            diarization = self.diarization_pipeline(audio_file_path)
+            speaker_segments = await self.diarization_pool.diarize(
+                audio_path,
+                on_progress=report_progress
+            )
             
-            # Extract speaker segments
-            speaker_segments = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                speaker_segments.append({
-                    "start": turn.start,
-                    "end": turn.end,
-                    "speaker": speaker
-                })
+            # Map turns back onto the original episode timeline
+            timeline.remap_turns(speaker_segments)
             
             return {
                 "speaker_segments": speaker_segments,
@@ -131,7 +361,7 @@ async def _perform_diarization(self, audio_file_path: str) -> Dict[str, Any]:
             
         except Exception as e:
             logger.error(f"Diarization failed: {e}")
-            return {"speaker_segments": [], "num_speakers": 0}
+            return {"speaker_segments": [], "num_speakers": 0, "failed": True}
     
     async def _create_segments(self, transcription_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create transcript segments from transcription data"""
@@ -142,29 +372,26 @@ async def _create_segments(self, transcription_data: Dict[str, Any]) -> List[Dic
                 "start_ms": int(segment["start"] * 1000),
                 "end_ms": int(segment["end"] * 1000),
                 "text": segment["text"],
-                "confidence": segment.get("avg_logprob", 0.0),
-                "topic": await self._extract_topic(segment["text"])
+                "confidence": segment.get("avg_logprob", 0.0)
             }
             segments.append(segment_data)
         
         return segments
     
-    async def _extract_topic(self, text: str) -> str:
-        """Extract topic from segment text using AI"""
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "Extract a short topic (1-3 words) from this text segment."},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=10,
-                temperature=0.1
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.warning(f"Topic extraction failed: {e}")
-            return "general"
+    async def _assign_topics(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Set each segment's topic with the configured engine; returns topic spans when the engine finds them"""
+        if settings.TOPIC_ENGINE == "local":
+            # In-process TextTiling keeps topic labeling off the network
+            spans = await asyncio.to_thread(self.topic_segmenter.segment, segments)
+            assign_span_topics(segments, spans)
+            return spans
+        
+        # Label topics in batches rather than one completion per segment
+        topics = await self.topic_labeler.label([segment["text"] for segment in segments])
+        for segment_data, topic in zip(segments, topics):
+            segment_data["topic"] = topic
+        # Per-segment labels are not boundaries, so the LLM engine produces no spans
+        return []
     
     def _calculate_confidence(self, transcription_data: Dict[str, Any]) -> float:
         """Calculate overall transcription confidence"""
@@ -175,11 +402,16 @@ def _calculate_confidence(self, transcription_data: Dict[str, Any]) -> float:
         total_confidence = sum(segment.get("avg_logprob", 0.0) for segment in segments)
         return total_confidence / len(segments)
     
-    async def process_episode(self, episode: Episode, audio_file_path: str) -> Transcript:
+    async def process_episode(
+        self,
+        episode: Episode,
+        audio_file_path: str,
+        on_partial: Optional[PartialCallback] = None
+    ) -> Transcript:
         """Process episode transcription end-to-end"""
         try:
             # Transcribe audio
-            transcription_result = await self.transcribe_audio(audio_file_path, episode)
+            transcription_result = await self.transcribe_audio(audio_file_path, episode, on_partial=on_partial)
             
             # Create transcript record
             transcript = Transcript(
@@ -188,7 +420,8 @@ async def process_episode(self, episode: Episode, audio_file_path: str) -> Trans
                 text=transcription_result["transcript"],
                 language=transcription_result["language"],
                 confidence=transcription_result["confidence"],
-                diarization_data=transcription_result.get("diarization_data")
+                diarization_data=transcription_result.get("diarization_data"),
+                topic_spans=transcription_result.get("topic_spans") or []
             )
             
             # Create transcript segments
@@ -201,6 +434,7 @@ async def process_episode(self, episode: Episode, audio_file_path: str) -> Trans
                     end_ms=segment_data["end_ms"],
                     text=segment_data["text"],
                     confidence=segment_data["confidence"],
+                    speaker=segment_data.get("speaker"),
                     topic=segment_data["topic"]
                 )
                 segments.append(segment)
@@ -214,3 +448,12 @@ async def process_episode(self, episode: Episode, audio_file_path: str) -> Trans
             logger.error(f"Episode processing failed: {e}")
             episode.status = "failed"
             raise
+
+_transcription_service: Optional[TranscriptionService] = None
+
+def get_transcription_service() -> TranscriptionService:
+    """Shared service so MAX_CONCURRENT_TRANSCRIPTIONS bounds every episode in the process"""
+    global _transcription_service
+    if _transcription_service is None:
+        _transcription_service = TranscriptionService()
+    return _transcription_service
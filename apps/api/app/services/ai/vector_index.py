@@ -0,0 +1,78 @@
+"""
+EchoPress AI Backend - Vector Index
+In-memory exact cosine search over one episode's segment embeddings
+"""
+
+import asyncio
+import logging
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-normalize in place; all-zero rows stay zero and never match"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+class NumpyVectorIndex:
+    """Episode documents and a contiguous, L2-normalized float32 matrix of their embeddings"""
+    
+    def __init__(self, documents: List[Document], vectors: Sequence[Sequence[float]], embeddings: Embeddings):
+        if len(documents) != len(vectors):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(documents)} documents")
+        self.documents = documents
+        self.embeddings = embeddings
+        if not documents:
+            # An episode without segments gives a 1-D empty array; keep the index 2-D and empty
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        else:
+            self.matrix = _normalize(np.ascontiguousarray(np.asarray(vectors, dtype=np.float32)))
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def search_by_vectors(
+        self,
+        queries: Sequence[Sequence[float]],
+        k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Exact top-k cosine search for many queries with one matrix-matrix product
+        
+        Args:
+            queries: Query embeddings, one per row
+            k: Results per query
+            
+        Returns:
+            (document, cosine similarity) pairs per query, most similar first
+        """
+        if not len(queries) or not len(self.documents) or k <= 0:
+            return [[] for _ in queries]
+        
+        scores = _normalize(np.asarray(queries, dtype=np.float32).copy()) @ self.matrix.T
+        k = min(k, scores.shape[1])
+        # argpartition finds the top k in linear time; only those k are then sorted
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            # Ties break on document order so results are deterministic
+            ordered = candidates[np.lexsort((candidates, -row[candidates]))]
+            results.append([(self.documents[index], float(row[index])) for index in ordered])
+        return results
+    
+    def similarity_search_by_vector(self, embedding: Sequence[float], k: int = 4) -> List[Document]:
+        return [document for document, _ in self.search_by_vectors([embedding], k)[0]]
+    
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """Same call shape as PGVector.similarity_search"""
+        return self.similarity_search_by_vector(self.embeddings.embed_query(query), k)
+    
+    async def asimilarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """Non-blocking similarity_search: async embedding, search on a worker thread"""
+        embedding = await self.embeddings.aembed_query(query)
+        return await asyncio.to_thread(self.similarity_search_by_vector, embedding, k)
@@ -0,0 +1,214 @@
+"""
+EchoPress AI Backend - Voice Activity Detection
+Frame-wise speech detection that keeps music beds and dead air away from ASR and diarization
+"""
+
+import bisect
+import logging
+import os
+import tempfile
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import soundfile as sf
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPEECH_BAND_HZ = (300.0, 3400.0)
+MODULATION_WINDOW_MS = 1000
+SMOOTHING_WINDOW_MS = 300
+# Voiced frames come in syllable bursts, so a window only needs a share of them to count as speech
+MIN_VOICED_FRACTION = 0.3
+BLOCK_SECONDS = 60
+
+class SpeechRegion(BaseModel):
+    """A stretch of detected speech on the input timeline"""
+    start_ms: int = Field(description="Region start")
+    end_ms: int = Field(description="Region end")
+    
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+class VoiceActivityDetector:
+    """Classifies short frames as speech from energy, speech-band ratio, flatness and syllabic modulation"""
+    
+    def __init__(
+        self,
+        frame_ms: int = 30,
+        energy_offset_db: float = 12.0,
+        min_energy_db: float = -55.0,
+        min_band_ratio: float = 0.25,
+        max_flatness: float = 0.5,
+        min_modulation_db: float = 4.0,
+        min_speech_ms: int = 250,
+        min_silence_ms: int = 1000,
+        padding_ms: int = 300
+    ):
+        self.frame_ms = frame_ms
+        self.energy_offset_db = energy_offset_db
+        self.min_energy_db = min_energy_db
+        self.min_band_ratio = min_band_ratio
+        self.max_flatness = max_flatness
+        self.min_modulation_db = min_modulation_db
+        self.min_speech_ms = min_speech_ms
+        self.min_silence_ms = min_silence_ms
+        self.padding_ms = padding_ms
+    
+    def detect(self, wav_path: str) -> List[SpeechRegion]:
+        """
+        Find speech regions in a mono WAV
+        
+        Args:
+            wav_path: Path to a decoded mono WAV
+            
+        Returns:
+            Sorted, non-overlapping speech regions; the whole file if no speech is found
+        """
+        info = sf.info(wav_path)
+        duration_ms = info.frames * 1000 // info.samplerate
+        energy_db, band_ratio, flatness = self._frame_features(wav_path, info.samplerate)
+        if energy_db.size == 0:
+            return [SpeechRegion(start_ms=0, end_ms=duration_ms)]
+        
+        # Adaptive gate: frames well above the episode's own noise floor
+        noise_floor = np.percentile(energy_db, 10)
+        loud = energy_db > max(noise_floor + self.energy_offset_db, self.min_energy_db)
+        
+        voiced = loud & (band_ratio > self.min_band_ratio) & (flatness < self.max_flatness)
+        
+        # Speech rises and falls at syllable rate; sustained music beds stay level
+        modulation = self._rolling_std(energy_db, max(1, MODULATION_WINDOW_MS // self.frame_ms))
+        
+        smoothing = max(1, SMOOTHING_WINDOW_MS // self.frame_ms)
+        voiced_share = np.convolve(voiced.astype(np.float32), np.ones(smoothing, dtype=np.float32) / smoothing, mode="same")
+        speech = (voiced_share >= MIN_VOICED_FRACTION) & (modulation > self.min_modulation_db)
+        regions = self._regions(speech, duration_ms)
+        
+        if not regions:
+            logger.warning("No speech detected, keeping the full audio")
+            return [SpeechRegion(start_ms=0, end_ms=duration_ms)]
+        
+        speech_ms = sum(region.duration_ms for region in regions)
+        logger.info(f"Detected {len(regions)} speech regions covering {speech_ms / 1000:.0f}s of {duration_ms / 1000:.0f}s")
+        return regions
+    
+    def _frame_features(self, wav_path: str, sample_rate: int):
+        """Per-frame energy (dB), speech-band energy ratio and spectral flatness, one block at a time"""
+        frame = sample_rate * self.frame_ms // 1000
+        window = np.hanning(frame).astype(np.float32)
+        frequencies = np.fft.rfftfreq(frame, 1 / sample_rate)
+        band = (frequencies >= SPEECH_BAND_HZ[0]) & (frequencies <= SPEECH_BAND_HZ[1])
+        
+        energy, ratio, flatness = [], [], []
+        block_size = frame * (BLOCK_SECONDS * 1000 // self.frame_ms)
+        for block in sf.blocks(wav_path, blocksize=block_size, dtype="float32", always_2d=False):
+            if block.ndim > 1:
+                block = block.mean(axis=1)
+            usable = len(block) // frame * frame
+            if not usable:
+                continue
+            frames = block[:usable].reshape(-1, frame)
+            
+            power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2 + 1e-12
+            total_power = power.sum(axis=1)
+            energy.append(10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12))
+            ratio.append(power[:, band].sum(axis=1) / total_power)
+            flatness.append(np.exp(np.mean(np.log(power), axis=1)) / (total_power / power.shape[1]))
+        
+        if not energy:
+            return np.array([]), np.array([]), np.array([])
+        return np.concatenate(energy), np.concatenate(ratio), np.concatenate(flatness)
+    
+    def _rolling_std(self, values: np.ndarray, window: int) -> np.ndarray:
+        """Centered rolling standard deviation via cumulative sums"""
+        padded = np.pad(values.astype(np.float64), (window // 2, window - 1 - window // 2), mode="edge")
+        cumulative = np.concatenate([[0.0], np.cumsum(padded)])
+        cumulative_sq = np.concatenate([[0.0], np.cumsum(padded ** 2)])
+        total = cumulative[window:] - cumulative[:-window]
+        total_sq = cumulative_sq[window:] - cumulative_sq[:-window]
+        variance = np.maximum(total_sq / window - (total / window) ** 2, 0.0)
+        return np.sqrt(variance)
+    
+    def _regions(self, speech: np.ndarray, duration_ms: int) -> List[SpeechRegion]:
+        """Turn a frame mask into padded regions, bridging short pauses and dropping blips"""
+        edges = np.diff(np.concatenate([[0], speech.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * self.frame_ms
+        ends = np.flatnonzero(edges == -1) * self.frame_ms
+        
+        merged: List[List[int]] = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if merged and start - merged[-1][1] < self.min_silence_ms:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+        
+        regions: List[SpeechRegion] = []
+        for start, end in merged:
+            if end - start < self.min_speech_ms:
+                continue
+            start, end = max(0, start - self.padding_ms), min(duration_ms, end + self.padding_ms)
+            if regions and start <= regions[-1].end_ms:
+                regions[-1].end_ms = end
+            else:
+                regions.append(SpeechRegion(start_ms=start, end_ms=end))
+        return regions
+
+def write_speech_audio(wav_path: str, regions: List[SpeechRegion], output_path: Optional[str] = None) -> str:
+    """Concatenate speech regions into a new WAV without loading the whole file"""
+    if output_path is None:
+        handle, output_path = tempfile.mkstemp(suffix=".wav", dir=settings.AUDIO_WORK_DIR)
+        os.close(handle)
+    
+    with sf.SoundFile(wav_path) as source:
+        with sf.SoundFile(output_path, "w", samplerate=source.samplerate, channels=source.channels, subtype="PCM_16", format="WAV") as target:
+            for region in regions:
+                source.seek(region.start_ms * source.samplerate // 1000)
+                remaining = region.duration_ms * source.samplerate // 1000
+                while remaining > 0:
+                    block = source.read(min(remaining, source.samplerate * BLOCK_SECONDS), dtype="int16")
+                    if not len(block):
+                        break
+                    target.write(block)
+                    remaining -= len(block)
+    return output_path
+
+class SpeechTimeline:
+    """Maps times on speech-only audio back onto the original episode timeline"""
+    
+    def __init__(self, regions: Optional[List[SpeechRegion]] = None, offset_ms: int = 0):
+        # Regions sit on the preprocessed timeline, which starts offset_ms into the episode
+        self.regions = regions or [SpeechRegion(start_ms=0, end_ms=2 ** 62)]
+        self.offset_ms = offset_ms
+        self.compact_starts: List[int] = []
+        position = 0
+        for region in self.regions:
+            self.compact_starts.append(position)
+            position += region.duration_ms
+    
+    def to_original(self, seconds: float, is_end: bool = False) -> float:
+        """Original-timeline seconds for a time on the speech-only audio"""
+        compact_ms = seconds * 1000
+        # An end that lands exactly on a join belongs to the region before it
+        if is_end:
+            index = bisect.bisect_left(self.compact_starts, compact_ms) - 1
+        else:
+            index = bisect.bisect_right(self.compact_starts, compact_ms) - 1
+        index = max(0, index)
+        original_ms = self.regions[index].start_ms + (compact_ms - self.compact_starts[index])
+        return (original_ms + self.offset_ms) / 1000
+    
+    def remap_result(self, transcription_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Move stitched segment and word timestamps onto the original timeline"""
+        for item in transcription_data.get("segments", []) + transcription_data.get("words", []):
+            item["start"], item["end"] = self.to_original(item["start"]), self.to_original(item["end"], is_end=True)
+        return transcription_data
+    
+    def remap_turns(self, turns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Move diarization turns onto the original timeline"""
+        for turn in turns:
+            turn["start"], turn["end"] = self.to_original(turn["start"]), self.to_original(turn["end"], is_end=True)
+        return turns
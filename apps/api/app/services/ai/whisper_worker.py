@@ -0,0 +1,482 @@
+"""
+EchoPress AI Backend - Local Whisper Workers
+CPU Whisper inference in a dedicated process pool, batching windows across concurrent callers
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (wav_path, start_ms, end_ms, language)
+WhisperRequest = Tuple[str, int, int, Optional[str]]
+
+# whisper.transcribe's defaults for falling back to sampling and skipping silence
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+# Loaded once per worker process by _init_worker
+_model = None
+
+def _init_worker(model_name: str, quantize: bool, num_threads: int):
+    """Load Whisper once when a worker process starts, optionally with int8 linear layers"""
+    global _model
+    import torch
+    import whisper
+    
+    torch.set_num_threads(num_threads)
+    model = whisper.load_model(model_name, device="cpu")
+    if quantize:
+        model = _quantize_int8(model)
+    _model = model
+
+def _quantize_int8(model):
+    """
+    Dynamically quantize every projection of the model to int8
+    
+    quantize_dynamic only converts exact nn.Linear instances, and whisper builds its
+    layers from whisper.model.Linear, a subclass whose only difference is casting the
+    weights to the input dtype. On fp32 CPU that cast is a no-op, so each layer is
+    swapped for a plain nn.Linear sharing its parameters before quantizing.
+    """
+    import torch
+    import whisper
+    
+    swaps = [
+        (parent, name, child)
+        for parent in model.modules()
+        for name, child in parent.named_children()
+        if type(child) is whisper.model.Linear
+    ]
+    for parent, name, child in swaps:
+        linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+        linear.weight = child.weight
+        linear.bias = child.bias
+        setattr(parent, name, linear)
+    
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    converted = sum(
+        isinstance(module, torch.ao.nn.quantized.dynamic.Linear) for module in quantized.modules()
+    )
+    if not converted:
+        raise RuntimeError("int8 quantization converted no Whisper layers")
+    logger.info(f"Quantized {converted} Whisper linear layers to int8")
+    return quantized
+
+def _read_window(wav_path: str, start_ms: int, end_ms: int):
+    import soundfile as sf
+    
+    with sf.SoundFile(wav_path) as source:
+        source.seek(start_ms * source.samplerate // 1000)
+        return source.read((end_ms - start_ms) * source.samplerate // 1000, dtype="float32")
+
+def _to_verbose_json(result: Dict[str, Any], duration_s: float) -> Dict[str, Any]:
+    """Reshape whisper.transcribe output like the API's verbose_json response"""
+    segments, words = [], []
+    for segment in result.get("segments", []):
+        segments.append({
+            "id": segment["id"],
+            "seek": segment.get("seek", 0),
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"],
+            "tokens": segment.get("tokens", []),
+            "temperature": segment.get("temperature", 0.0),
+            "avg_logprob": segment.get("avg_logprob", 0.0),
+            "compression_ratio": segment.get("compression_ratio", 0.0),
+            "no_speech_prob": segment.get("no_speech_prob", 0.0)
+        })
+        words.extend(
+            {"word": word["word"], "start": word["start"], "end": word["end"]}
+            for word in segment.get("words", [])
+        )
+    return {
+        "text": result.get("text", ""),
+        "language": result.get("language"),
+        "duration": duration_s,
+        "segments": segments,
+        "words": words
+    }
+
+class _WindowDecoder:
+    """One window's progress through whisper.transcribe's seek loop, 30 s of mel at a time"""
+    
+    def __init__(self, request_id: int, request: WhisperRequest):
+        from whisper.audio import N_FRAMES, N_SAMPLES, log_mel_spectrogram
+        
+        wav_path, start_ms, end_ms, language = request
+        self.request_id = request_id
+        self.duration_s = (end_ms - start_ms) / 1000
+        # English-only models have no language tokens to detect with
+        self.language = language if language or _model.is_multilingual else "en"
+        audio = _read_window(wav_path, start_ms, end_ms)
+        self.mel = log_mel_spectrogram(audio, _model.dims.n_mels, padding=N_SAMPLES)
+        self.content_frames = self.mel.shape[-1] - N_FRAMES
+        self.seek = 0
+        self.segments: List[Dict[str, Any]] = []
+        self.last_speech_timestamp = 0.0
+        self.segment_size = 0
+        self.mel_segment = None
+    
+    @property
+    def done(self) -> bool:
+        return self.seek >= self.content_frames
+    
+    def next_segment(self):
+        """Mel frames for the next decoding step, padded to Whisper's 30 s input"""
+        from whisper.audio import N_FRAMES, pad_or_trim
+        
+        self.segment_size = min(N_FRAMES, self.content_frames - self.seek)
+        self.mel_segment = pad_or_trim(self.mel[:, self.seek:self.seek + self.segment_size], N_FRAMES)
+        return self.mel_segment
+    
+    def advance(self, result):
+        """Turn one decoded step into segments with word timings and move the seek forward"""
+        import torch
+        from whisper.audio import FRAMES_PER_SECOND, HOP_LENGTH, N_FRAMES, SAMPLE_RATE
+        from whisper.timing import add_word_timestamps
+        from whisper.tokenizer import get_tokenizer
+        
+        if self.language is None:
+            # Detected on the first step and kept, as whisper.transcribe does
+            self.language = result.language
+        tokenizer = get_tokenizer(
+            _model.is_multilingual,
+            num_languages=_model.num_languages,
+            language=self.language,
+            task="transcribe"
+        )
+        
+        input_stride = N_FRAMES // _model.dims.n_audio_ctx
+        time_precision = input_stride * HOP_LENGTH / SAMPLE_RATE
+        time_offset = self.seek * HOP_LENGTH / SAMPLE_RATE
+        previous_seek = self.seek
+        
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            self.seek += self.segment_size
+            return
+        
+        def new_segment(start: float, end: float, tokens) -> Dict[str, Any]:
+            tokens = tokens.tolist()
+            return {
+                "seek": previous_seek,
+                "start": start,
+                "end": end,
+                "text": tokenizer.decode([token for token in tokens if token < tokenizer.eot]),
+                "tokens": tokens,
+                "temperature": result.temperature,
+                "avg_logprob": result.avg_logprob,
+                "compression_ratio": result.compression_ratio,
+                "no_speech_prob": result.no_speech_prob
+            }
+        
+        tokens = torch.tensor(result.tokens)
+        timestamp_tokens = tokens.ge(tokenizer.timestamp_begin)
+        single_timestamp_ending = timestamp_tokens[-2:].tolist() == [False, True]
+        consecutive = torch.where(timestamp_tokens[:-1] & timestamp_tokens[1:])[0] + 1
+        
+        current_segments = []
+        if len(consecutive) > 0:
+            slices = consecutive.tolist()
+            if single_timestamp_ending:
+                slices.append(len(tokens))
+            last_slice = 0
+            for current_slice in slices:
+                sliced_tokens = tokens[last_slice:current_slice]
+                start_position = sliced_tokens[0].item() - tokenizer.timestamp_begin
+                end_position = sliced_tokens[-1].item() - tokenizer.timestamp_begin
+                current_segments.append(new_segment(
+                    time_offset + start_position * time_precision,
+                    time_offset + end_position * time_precision,
+                    sliced_tokens
+                ))
+                last_slice = current_slice
+            if single_timestamp_ending:
+                self.seek += self.segment_size
+            else:
+                # Resume from the last complete segment so a cut-off sentence is decoded again
+                self.seek += (tokens[last_slice - 1].item() - tokenizer.timestamp_begin) * input_stride
+        else:
+            duration = self.segment_size * HOP_LENGTH / SAMPLE_RATE
+            timestamps = tokens[timestamp_tokens.nonzero().flatten()]
+            if len(timestamps) > 0 and timestamps[-1].item() != tokenizer.timestamp_begin:
+                duration = (timestamps[-1].item() - tokenizer.timestamp_begin) * time_precision
+            current_segments.append(new_segment(time_offset, time_offset + duration, tokens))
+            self.seek += self.segment_size
+        
+        add_word_timestamps(
+            segments=current_segments,
+            model=_model,
+            tokenizer=tokenizer,
+            mel=self.mel_segment,
+            num_frames=self.segment_size,
+            last_speech_timestamp=self.last_speech_timestamp
+        )
+        word_ends = [word["end"] for segment in current_segments for word in segment["words"]]
+        if word_ends:
+            self.last_speech_timestamp = word_ends[-1]
+            if not single_timestamp_ending:
+                seek_shift = round((word_ends[-1] - time_offset) * FRAMES_PER_SECOND)
+                if seek_shift > 0:
+                    self.seek = previous_seek + seek_shift
+        
+        self.segments.extend(
+            segment for segment in current_segments
+            if segment["start"] != segment["end"] and segment["text"].strip()
+        )
+    
+    def result(self) -> Dict[str, Any]:
+        segments = [{"id": index, **segment} for index, segment in enumerate(self.segments)]
+        return _to_verbose_json(
+            {"text": "".join(segment["text"] for segment in segments), "language": self.language, "segments": segments},
+            self.duration_s
+        )
+
+def _needs_fallback(result) -> bool:
+    """Whether whisper.transcribe would retry a step at a higher temperature"""
+    if result.no_speech_prob > NO_SPEECH_THRESHOLD:
+        return False
+    return result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD
+
+def _decode_with_fallback(mel_batch, language: Optional[str]) -> List[Any]:
+    """Decode a batch of 30 s steps, re-decoding only the steps that fail the quality checks"""
+    from whisper.decoding import DecodingOptions
+    
+    results: List[Any] = [None] * len(mel_batch)
+    pending = list(range(len(mel_batch)))
+    for temperature in FALLBACK_TEMPERATURES:
+        options = DecodingOptions(language=language, task="transcribe", temperature=temperature, fp16=False)
+        retry = []
+        for index, result in zip(pending, _model.decode(mel_batch[pending], options)):
+            results[index] = result
+            if _needs_fallback(result):
+                retry.append(index)
+        pending = retry
+        if not pending:
+            break
+    return results
+
+def _transcribe_batch(requests: List[Tuple[int, WhisperRequest]], results) -> None:
+    """
+    Decode windows from different callers together, one 30 s step at a time
+    
+    Every step runs the encoder and decoder once for all unfinished windows that share a
+    language. A window's result is posted to the results queue as soon as its last step
+    is done, so a short window never waits for the longest one in its batch. Steps are
+    not conditioned on the previous step's text, since that prompt cannot differ per
+    window within one decode call.
+    """
+    import torch
+    
+    if _model is None:
+        raise RuntimeError("Whisper model not loaded in worker")
+    
+    active: List[_WindowDecoder] = []
+    for request_id, request in requests:
+        try:
+            active.append(_WindowDecoder(request_id, request))
+        except Exception as e:
+            results.put((request_id, None, f"{type(e).__name__}: {e}"))
+    
+    while True:
+        remaining = []
+        for decoder in active:
+            if decoder.done:
+                results.put((decoder.request_id, decoder.result(), None))
+            else:
+                remaining.append(decoder)
+        active = remaining
+        if not active:
+            return
+        
+        failed: Set[int] = set()
+        groups: Dict[Optional[str], List[_WindowDecoder]] = {}
+        for decoder in active:
+            groups.setdefault(decoder.language, []).append(decoder)
+        
+        for language, decoders in groups.items():
+            try:
+                decoded = _decode_with_fallback(torch.stack([decoder.next_segment() for decoder in decoders]), language)
+            except Exception as e:
+                for decoder in decoders:
+                    results.put((decoder.request_id, None, f"{type(e).__name__}: {e}"))
+                    failed.add(decoder.request_id)
+                continue
+            for decoder, result in zip(decoders, decoded):
+                try:
+                    decoder.advance(result)
+                except Exception as e:
+                    results.put((decoder.request_id, None, f"{type(e).__name__}: {e}"))
+                    failed.add(decoder.request_id)
+        active = [decoder for decoder in active if decoder.request_id not in failed]
+
+def _drain(results) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Everything posted so far; each get is a blocking round trip to the manager process"""
+    messages = []
+    while True:
+        try:
+            messages.append(results.get_nowait())
+        except queue.Empty:
+            return messages
+
+class WhisperPool:
+    """Process pool of Whisper workers fed by a coalescing request queue"""
+    
+    def __init__(
+        self,
+        max_workers: int,
+        model_name: str,
+        quantize: bool = True,
+        batch_size: int = 4,
+        batch_wait: float = 0.05,
+        threads_per_worker: int = 4,
+        poll_interval: float = 0.1
+    ):
+        # spawn avoids inheriting torch thread state from the API process
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(model_name, quantize, threads_per_worker)
+        )
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.poll_interval = poll_interval
+        self._manager = None
+        self._results = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+    
+    async def transcribe(
+        self,
+        wav_path: str,
+        start_ms: int,
+        end_ms: int,
+        language: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Queue one window; concurrent callers, across episodes, share decoding batches"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((wav_path, start_ms, end_ms, language), future))
+        return await future
+    
+    async def _dispatch(self):
+        """Coalesce queued windows into batches and keep every worker busy"""
+        loop = asyncio.get_running_loop()
+        if self._manager is None:
+            # Starting the manager process blocks, so it stays off the event loop
+            self._manager = await asyncio.to_thread(self.mp_context.Manager)
+            self._results = await asyncio.to_thread(self._manager.Queue)
+        relay = asyncio.create_task(self._relay())
+        slots = asyncio.Semaphore(self.max_workers)
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await slots.acquire()
+                requests = []
+                for request, future in batch:
+                    # Callers that gave up while queued are not decoded
+                    if future.done():
+                        continue
+                    request_id = next(self._ids)
+                    self._pending[request_id] = future
+                    requests.append((request_id, request))
+                if not requests:
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._run_batch(requests, slots))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+        finally:
+            relay.cancel()
+    
+    async def _run_batch(self, requests: List[Tuple[int, WhisperRequest]], slots: asyncio.Semaphore):
+        """Run one batch on a worker; windows resolve through the relay as they finish"""
+        error: Optional[BaseException] = None
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self.executor, _transcribe_batch, requests, self._results
+            )
+        except Exception as e:
+            error = e
+        finally:
+            slots.release()
+        
+        # Results posted just before the batch returned may not have been relayed yet
+        await self._relay_once()
+        for request_id, _ in requests:
+            future = self._pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_exception(error or RuntimeError("Local Whisper returned no result for the window"))
+    
+    async def _relay(self):
+        """Resolve callers from worker results until cancelled"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self._relay_once()
+    
+    async def _relay_once(self):
+        for request_id, result, error in await asyncio.to_thread(_drain, self._results):
+            future = self._pending.pop(request_id, None)
+            if future is None or future.done():
+                continue
+            if error:
+                future.set_exception(RuntimeError(f"Local Whisper failed: {error}"))
+            else:
+                future.set_result(result)
+    
+    def shutdown(self):
+        """Stop the dispatcher and worker processes"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+_whisper_pool: Optional[WhisperPool] = None
+
+def get_whisper_pool(
+    max_workers: int,
+    model_name: str,
+    quantize: bool = True,
+    batch_size: int = 4
+) -> WhisperPool:
+    """Shared pool so every TranscriptionService batches into the same loaded workers"""
+    global _whisper_pool
+    if _whisper_pool is None:
+        _whisper_pool = WhisperPool(max_workers, model_name, quantize=quantize, batch_size=batch_size)
+    return _whisper_pool
+
+def shutdown_whisper_pool():
+    """Stop the shared pool if it was started"""
+    global _whisper_pool
+    if _whisper_pool is not None:
+        _whisper_pool.shutdown()
+        _whisper_pool = None
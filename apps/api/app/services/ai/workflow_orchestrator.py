@@ -18,8 +18,9 @@
 from app.models.transcript import Transcript, TranscriptSegment
 from app.models.draft import Draft
 from app.models.brand_voice import BrandVoice
-from app.services.ai.transcription_service import TranscriptionService
+from app.services.ai.transcription_service import get_transcription_service
 from app.services.ai.content_generation_service import ContentGenerationService, BlogPostDraft
+from app.services.ai.embedding_pipeline import SegmentEmbeddingPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class WorkflowState(BaseModel):
     audio_file_path: Optional[str] = Field(default=None, description="Path to audio file")
     transcript: Optional[Transcript] = Field(default=None, description="Generated transcript")
     segments: List[TranscriptSegment] = Field(default_factory=list, description="Transcript segments")
+    segment_embeddings: Dict[str, List[float]] = Field(default_factory=dict, description="Segment embeddings computed during transcription, keyed by text")
     brand_voice: Optional[BrandVoice] = Field(default=None, description="Brand voice configuration")
     blog_post: Optional[BlogPostDraft] = Field(default=None, description="Generated blog post")
     draft: Optional[Draft] = Field(default=None, description="Final draft")
@@ -42,7 +44,7 @@ class WorkflowOrchestrator:
     """Orchestrates the end-to-end podcast to blog conversion workflow"""
     
     def __init__(self):
-        self.transcription_service = TranscriptionService()
+        self.transcription_service = get_transcription_service()
         self.content_generation_service = ContentGenerationService()
         self.graph = self._build_workflow_graph()
         self.memory = MemorySaver()
@@ -136,15 +138,23 @@ async def _transcribe_audio(self, state: WorkflowState) -> WorkflowState:
             state.progress = 25.0
             state.status = "transcribing"
             
-            # Perform transcription
-            transcript, segments = await self.transcription_service.process_episode(
-                state.episode,
-                state.audio_file_path
-            )
+            # Embed finalized segments while later chunks are still being transcribed
+            embedding_pipeline = SegmentEmbeddingPipeline(self.content_generation_service.embeddings)
+            embedding_pipeline.start()
+            try:
+                transcript, segments = await self.transcription_service.process_episode(
+                    state.episode,
+                    state.audio_file_path,
+                    on_partial=embedding_pipeline.feed
+                )
+            except Exception:
+                embedding_pipeline.cancel()
+                raise
             
             # Update state
             state.transcript = transcript
             state.segments = segments
+            state.segment_embeddings = await embedding_pipeline.close()
             state.episode.status = "drafting"
             state.status = "transcribed"
             state.progress = 50.0
@@ -170,7 +180,9 @@ async def _generate_content(self, state: WorkflowState) -> WorkflowState:
                 episode=state.episode,
                 transcript=state.transcript,
                 segments=state.segments,
-                brand_voice=state.brand_voice
+                brand_voice=state.brand_voice,
+                precomputed_embeddings=state.segment_embeddings,
+                stream=settings.GENERATION_STREAMING
             )
             
             # Update state
@@ -7,6 +7,14 @@
 from datetime import datetime
 import logging
 
+from app.core.config import settings
+from app.models.brand_voice import BrandVoice
+from app.models.episode import Episode
+from app.models.transcript import Transcript, TranscriptSegment
+from app.services.brand_voices import BrandVoiceService
+from app.services.episodes import EpisodeService
+from app.services.transcripts import TranscriptService
+
 logger = logging.getLogger(__name__)
 
 class DraftService:
@@ -95,6 +103,107 @@ async def revise_draft(
             "created_at": datetime.now()
         }
     
+    async def regenerate_draft(
+        self,
+        draft_id: str,
+        user_id: str,
+        sections: Optional[List[int]] = None,
+        introduction: bool = False,
+        conclusion: bool = False,
+        key_takeaways: bool = False,
+        changed_sections: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Regenerate selected parts of a draft, or the whole draft when nothing is selected"""
+        # Imported lazily so CRUD callers don't pay for loading the LLM stack
+        from app.services.ai.content_generation_service import BlogPostDraft, ContentGenerationService
+        
+        draft = await self.get_draft(draft_id)
+        if not draft:
+            return None
+        episode_data = await EpisodeService().get_episode(draft["episode_id"], user_id)
+        if not episode_data:
+            return None
+        
+        episode = Episode(
+            id=episode_data["id"],
+            title=episode_data.get("title"),
+            description=episode_data.get("description"),
+            audio_url=episode_data.get("audio_url"),
+            status=episode_data.get("status"),
+            workspace_id=episode_data.get("workspace_id"),
+            user_id=user_id
+        )
+        
+        transcript_service = TranscriptService()
+        transcript_data = await transcript_service.get_transcript(f"transcript_{episode.id}")
+        if not transcript_data:
+            raise ValueError("Episode has no transcript to regenerate from")
+        transcript = Transcript(
+            id=transcript_data["id"],
+            episode_id=episode.id,
+            text=transcript_data.get("text", ""),
+            language=transcript_data.get("language"),
+            confidence=transcript_data.get("confidence"),
+            topic_spans=transcript_data.get("topic_spans")
+        )
+        segments = [
+            TranscriptSegment(
+                id=segment_data.get("id"),
+                transcript_id=transcript.id,
+                start_ms=segment_data["start_ms"],
+                end_ms=segment_data["end_ms"],
+                text=segment_data["text"],
+                confidence=segment_data.get("confidence"),
+                speaker=segment_data.get("speaker"),
+                topic=segment_data.get("topic"),
+                vector=segment_data.get("vector"),
+                vector_hash=segment_data.get("vector_hash")
+            )
+            for segment_data in await transcript_service.get_segments(transcript.id)
+        ]
+        
+        brand_voice = None
+        if draft.get("brand_voice_id"):
+            brand_voice_data = await BrandVoiceService().get_brand_voice(draft["brand_voice_id"])
+            if brand_voice_data:
+                brand_voice = BrandVoice(
+                    id=brand_voice_data["id"],
+                    name=brand_voice_data.get("name"),
+                    tone=brand_voice_data.get("tone"),
+                    style_guide=brand_voice_data.get("style_guide")
+                )
+        
+        content_service = ContentGenerationService()
+        partial = bool(sections or introduction or conclusion or key_takeaways or changed_sections)
+        if partial and draft.get("generation_state"):
+            blog_post = await content_service.regenerate_blog_post(
+                episode,
+                transcript,
+                segments,
+                BlogPostDraft.model_validate(draft["generation_state"]),
+                sections=sections,
+                introduction=introduction,
+                conclusion=conclusion,
+                key_takeaways=key_takeaways,
+                changed_sections=changed_sections,
+                brand_voice=brand_voice,
+                stream=settings.GENERATION_STREAMING
+            )
+        else:
+            # Drafts saved before generation state was stored can only be regenerated whole
+            blog_post = await content_service.generate_blog_post(
+                episode,
+                transcript,
+                segments,
+                brand_voice,
+                fresh=True,
+                stream=settings.GENERATION_STREAMING
+            )
+        
+        draft_data = content_service.draft_fields(blog_post)
+        draft_data["version"] = draft.get("version", 1) + 1
+        return await self.update_draft(draft_id, draft_data)
+    
     async def delete_draft(
         self,
         draft_id: str
@@ -3,12 +3,18 @@
 Business logic for transcript management
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 import logging
 
+from app.models.episode import Episode
+from app.services.episodes import EpisodeService
+
 logger = logging.getLogger(__name__)
 
+# Episodes with a retry in flight in this process, so repeated requests don't start duplicate jobs
+_running_retries: Set[str] = set()
+
 class TranscriptService:
     """Service for managing transcripts"""
     
@@ -30,6 +36,7 @@ async def create_transcript(
             "language": transcript_data.get("language", "en"),
             "confidence": transcript_data.get("confidence", 0.0),
             "diarization_data": transcript_data.get("diarization_data"),
+            "topic_spans": transcript_data.get("topic_spans", []),
             "created_at": datetime.now()
         }
     
@@ -100,6 +107,81 @@ async def get_segments(
         # This is a placeholder implementation
         return []
     
+    async def retry_transcription(
+        self,
+        episode_id: str,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Claim a transcription retry; the caller runs resume_transcription in the background when started"""
+        episode_data = await EpisodeService().get_episode(episode_id, user_id)
+        if not episode_data:
+            return None
+        
+        already_running = episode_id in _running_retries
+        _running_retries.add(episode_id)
+        return {
+            "episode_id": episode_id,
+            "status": "transcribing",
+            "already_running": already_running
+        }
+    
+    async def resume_transcription(
+        self,
+        episode_id: str,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Re-run transcription, resuming from any checkpointed chunks"""
+        try:
+            return await self._resume_transcription(episode_id, user_id)
+        except Exception as e:
+            # Runs after the response was sent, so the log is the only place the failure surfaces
+            logger.error(f"Transcription retry failed for episode {episode_id}: {e}")
+        finally:
+            _running_retries.discard(episode_id)
+    
+    async def _resume_transcription(
+        self,
+        episode_id: str,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        # Imported lazily so CRUD callers don't pay for loading the ASR stack
+        from app.services.ai.transcription_service import get_transcription_service
+        
+        episode_data = await EpisodeService().get_episode(episode_id, user_id)
+        if not episode_data:
+            return None
+        
+        episode = Episode(
+            id=episode_data["id"],
+            title=episode_data.get("title"),
+            audio_url=episode_data.get("audio_url"),
+            status=episode_data.get("status"),
+            workspace_id=episode_data.get("workspace_id"),
+            user_id=user_id
+        )
+        # Completed chunks are reused, so only the missing ones hit Whisper again
+        transcript, segments = await get_transcription_service().process_episode(episode, episode.audio_url)
+        
+        transcript_data = await self.create_transcript(episode_id, {
+            "text": transcript.text,
+            "language": transcript.language,
+            "confidence": transcript.confidence,
+            "diarization_data": transcript.diarization_data,
+            "topic_spans": transcript.topic_spans
+        })
+        transcript_data["segments"] = [
+            await self.create_segment(transcript.id, {
+                "start_ms": segment.start_ms,
+                "end_ms": segment.end_ms,
+                "text": segment.text,
+                "confidence": segment.confidence,
+                "speaker": segment.speaker,
+                "topic": segment.topic
+            })
+            for segment in segments
+        ]
+        return transcript_data
+    
     async def delete_transcript(
         self,
         transcript_id: str
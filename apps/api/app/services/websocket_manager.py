@@ -6,7 +6,7 @@
 import asyncio
 import logging
 import json
-from typing import Dict, Set, Optional, Any
+from typing import Dict, Set, Optional, Any, List
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from enum import Enum
@@ -21,6 +21,8 @@ class WebSocketEventType(Enum):
     WORKFLOW_ERROR = "workflow_error"
     WORKFLOW_COMPLETED = "workflow_completed"
     TRANSCRIPTION_PROGRESS = "transcription_progress"
+    TRANSCRIPTION_PARTIAL = "transcription_partial"
+    DIARIZATION_PROGRESS = "diarization_progress"
     CONTENT_GENERATION_PROGRESS = "content_generation_progress"
     DRAFT_READY = "draft_ready"
 
@@ -183,6 +185,36 @@ async def send_transcription_progress(self, episode_id: str, progress: float, me
         }
         await self.broadcast_to_episode(episode_id, ws_message)
     
+    async def send_diarization_progress(self, episode_id: str, step: str, completed: int, total: int):
+        """Send speaker diarization step progress"""
+        message = {
+            "type": WebSocketEventType.DIARIZATION_PROGRESS.value,
+            "episode_id": episode_id,
+            "step": step,
+            "progress": completed / total * 100 if total else 100.0,
+            "message": f"Diarization {step}: {completed}/{total}",
+            "timestamp": datetime.now().isoformat()
+        }
+        await self.broadcast_to_episode(episode_id, message)
+    
+    async def send_transcription_partial(
+        self,
+        episode_id: str,
+        chunk_index: int,
+        total_chunks: int,
+        segments: List[Dict[str, Any]]
+    ):
+        """Send the finalized segments of one transcription chunk"""
+        message = {
+            "type": WebSocketEventType.TRANSCRIPTION_PARTIAL.value,
+            "episode_id": episode_id,
+            "chunk_index": chunk_index,
+            "total_chunks": total_chunks,
+            "segments": segments,
+            "timestamp": datetime.now().isoformat()
+        }
+        await self.broadcast_to_episode(episode_id, message)
+    
     async def send_content_generation_progress(self, episode_id: str, progress: float, message: str):
         """Send content generation progress update"""
         ws_message = {
@@ -194,6 +226,18 @@ async def send_content_generation_progress(self, episode_id: str, progress: floa
         }
         await self.broadcast_to_episode(episode_id, ws_message)
     
+    async def send_content_generation_delta(self, episode_id: str, part: str, delta: str, done: bool = False):
+        """Send newly generated text for one part of a draft, e.g. introduction or section:<index>"""
+        ws_message = {
+            "type": WebSocketEventType.CONTENT_GENERATION_PROGRESS.value,
+            "episode_id": episode_id,
+            "part": part,
+            "delta": delta,
+            "done": done,
+            "timestamp": datetime.now().isoformat()
+        }
+        await self.broadcast_to_episode(episode_id, ws_message)
+    
     async def send_draft_ready(self, episode_id: str, draft_id: str, title: str):
         """Send draft ready notification"""
         message = {
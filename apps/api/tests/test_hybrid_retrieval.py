@@ -0,0 +1,97 @@
+"""
+Tests for BM25 keyword search, reciprocal-rank fusion and hybrid ranking
+"""
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from langchain.schema import Document
+
+from app.services.ai.hybrid_retrieval import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize
+from app.services.ai.vector_index import NumpyVectorIndex
+
+TEXTS = [
+    "We priced the product per seat from day one",
+    "Hiring our first engineers took almost a year",
+    "Remote culture needs written decisions",
+    "Seat pricing broke down for larger customers, so pricing moved to usage",
+    "Thanks for listening, see you next week"
+]
+
+def _documents(texts):
+    return [
+        Document(page_content=text, metadata={"start_ms": index * 10000, "end_ms": (index + 1) * 10000})
+        for index, text in enumerate(texts)
+    ]
+
+def test_tokenize_keeps_decimals_and_contractions_whole():
+    assert tokenize("It's 3.5x faster, isn't it?") == ["it's", "3.5x", "faster", "isn't", "it"]
+
+def test_bm25_ranks_more_term_matches_first():
+    results = BM25Index(TEXTS).search("seat pricing")
+    
+    assert [doc_id for doc_id, _ in results] == [3, 0]
+    assert results[0][1] > results[1][1] > 0
+
+def test_bm25_omits_documents_sharing_no_term():
+    assert BM25Index(TEXTS).search("podcast microphones") == []
+
+def test_bm25_truncates_to_k():
+    results = BM25Index(["alpha beta", "alpha", "alpha gamma", "delta"]).search("alpha", k=2)
+    
+    assert len(results) == 2
+    assert all(doc_id != 3 for doc_id, _ in results)
+
+def test_rrf_rewards_documents_ranked_by_both_lists():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+    
+    assert [doc_id for doc_id, _ in fused] == [1, 3, 2, 4]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+def test_rrf_breaks_ties_by_document_order():
+    fused = reciprocal_rank_fusion([[5, 2], [2, 5]], k=60)
+    
+    assert [doc_id for doc_id, _ in fused] == [2, 5]
+
+def test_rank_fuses_keyword_and_vector_rankings():
+    documents = _documents(TEXTS)
+    # Document 2 is the vector match; only keywords find document 3
+    vectors = [[1.0, 0.0, 0.0] if index != 2 else [0.0, 1.0, 0.0] for index in range(len(documents))]
+    retriever = HybridRetriever(
+        documents,
+        BM25Index(TEXTS),
+        NumpyVectorIndex(documents, vectors, embeddings=None),
+        candidates=3
+    )
+    
+    ranked = retriever.rank(["pricing"], [[0.0, 1.0, 0.0]])[0]
+    
+    # Each list's best ties at 1 / 61 and breaks by document order; the cut keeps the candidate budget
+    assert [doc_id for doc_id, _ in ranked] == [2, 3, 0]
+    assert ranked[0][1] == pytest.approx(1 / 61)
+
+def test_keyword_only_retrieval_without_vector_store():
+    retriever = HybridRetriever(_documents(TEXTS), BM25Index(TEXTS), None)
+    
+    results = retriever.search(["hiring engineers"], k=1)
+    
+    assert [doc.page_content for doc in results[0]] == [TEXTS[1]]
+
+def test_scope_brings_in_span_passages_without_query_terms():
+    retriever = HybridRetriever(_documents(TEXTS), BM25Index(TEXTS), None)
+    
+    unscoped = retriever.rank(["seat"])[0]
+    scoped = retriever.rank(["seat"], scopes=[(10000, 30000)])[0]
+    
+    assert {doc_id for doc_id, _ in unscoped} == {0, 3}
+    # The span list fuses in-span passages level with the keyword hits
+    assert [doc_id for doc_id, _ in scoped] == [0, 1, 2, 3]
+
+def test_plan_gives_sections_distinct_passages():
+    retriever = HybridRetriever(_documents(TEXTS), BM25Index(TEXTS), None)
+    
+    # The first section can only cite passage 3; the second would also rank it first
+    plans = retriever.plan(["usage", "seat"], k=1, reuse_penalty=1.0)
+    
+    assert [[doc.page_content for doc in plan] for plan in plans] == [[TEXTS[3]], [TEXTS[0]]]
@@ -0,0 +1,50 @@
+"""
+Tests for planning citations across the sections of a draft
+"""
+
+import numpy as np
+
+from app.services.ai.retrieval_planner import plan_section_citations
+
+def _positions(doc_ids):
+    return {doc_id: row for row, doc_id in enumerate(doc_ids)}
+
+def test_zero_diversity_is_plain_top_k():
+    rankings = [[(4, 0.9), (1, 0.8), (7, 0.5)]]
+    
+    plans = plan_section_citations(rankings, np.eye(3), _positions([1, 4, 7]), k=2, diversity=0.0)
+    
+    assert plans == [[4, 1]]
+
+def test_diversity_skips_near_duplicate_of_chosen_passage():
+    rankings = [[(0, 1.0), (1, 0.95), (2, 0.7)]]
+    # Passage 1 repeats passage 0 almost word for word
+    similarity = np.array([
+        [1.0, 0.98, 0.1],
+        [0.98, 1.0, 0.1],
+        [0.1, 0.1, 1.0]
+    ])
+    
+    plans = plan_section_citations(rankings, similarity, _positions([0, 1, 2]), k=2, diversity=0.5, reuse_penalty=0.0)
+    
+    assert plans == [[0, 2]]
+
+def test_reuse_penalty_spreads_a_shared_best_passage():
+    rankings = [[(0, 1.0), (1, 0.9)], [(0, 1.0), (2, 0.9)]]
+    
+    plans = plan_section_citations(rankings, np.eye(3), _positions([0, 1, 2]), k=1, diversity=0.0, reuse_penalty=0.5)
+    
+    # The first section takes the shared passage; the second falls back to its own
+    assert plans == [[0], [2]]
+
+def test_sections_take_turns_before_later_picks():
+    rankings = [[(0, 1.0), (1, 0.99)], [(1, 1.0), (0, 0.99)]]
+    
+    plans = plan_section_citations(rankings, np.eye(2), _positions([0, 1]), k=1, diversity=0.0, reuse_penalty=0.5)
+    
+    assert plans == [[0], [1]]
+
+def test_section_without_candidates_gets_an_empty_plan():
+    plans = plan_section_citations([[(0, 1.0)], []], np.eye(1), _positions([0]), k=3)
+    
+    assert plans == [[0], []]
@@ -0,0 +1,59 @@
+"""
+Tests for speaker alignment of transcript segments
+"""
+
+from app.services.ai.speaker_alignment import align_speakers
+
+def _words(*spoken):
+    """Words from (text, start, end) tuples, times in seconds"""
+    return [{"word": f" {text}", "start": start, "end": end} for text, start, end in spoken]
+
+def _segment(words, end_ms):
+    return {
+        "start_ms": 0,
+        "end_ms": end_ms,
+        "text": "".join(word["word"] for word in words)
+    }
+
+def test_single_run_keeps_segment_whole():
+    words = _words(("We", 0.0, 0.5), ("started", 0.5, 1.2), ("early.", 1.2, 2.0))
+    turns = [{"start": 0.0, "end": 2.0, "speaker": "A"}]
+    
+    segment = _segment(words, 2000)
+    aligned = align_speakers([segment], words, turns)
+    
+    assert len(aligned) == 1
+    assert aligned[0]["speaker"] == "A"
+    assert aligned[0]["text"] == segment["text"]
+
+def test_short_opening_folds_into_only_other_run():
+    words = _words(("Yeah.", 0.0, 0.3), ("So", 0.4, 0.8), ("the", 0.8, 1.2), ("idea", 1.2, 2.0), ("was", 2.0, 3.0))
+    turns = [
+        {"start": 0.0, "end": 0.35, "speaker": "B"},
+        {"start": 0.35, "end": 3.0, "speaker": "A"}
+    ]
+    
+    segment = _segment(words, 3000)
+    aligned = align_speakers([segment], words, turns)
+    
+    assert len(aligned) == 1
+    assert aligned[0]["speaker"] == "A"
+    assert aligned[0]["text"] == segment["text"]
+
+def test_short_opening_joins_following_run_before_split():
+    words = _words(
+        ("Yeah.", 0.0, 0.3),
+        ("We", 0.4, 1.0), ("raised", 1.0, 2.0), ("early.", 2.0, 3.0),
+        ("Why", 3.2, 4.0), ("then?", 4.0, 5.5)
+    )
+    turns = [
+        {"start": 0.0, "end": 0.35, "speaker": "B"},
+        {"start": 0.35, "end": 3.1, "speaker": "A"},
+        {"start": 3.1, "end": 5.5, "speaker": "C"}
+    ]
+    
+    aligned = align_speakers([_segment(words, 5500)], words, turns)
+    
+    assert [piece["speaker"] for piece in aligned] == ["A", "C"]
+    assert [piece["text"] for piece in aligned] == ["Yeah. We raised early.", "Why then?"]
+    assert [(piece["start_ms"], piece["end_ms"]) for piece in aligned] == [(0, 3200), (3200, 5500)]
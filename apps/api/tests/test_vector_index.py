@@ -0,0 +1,53 @@
+"""
+Tests for exact in-memory cosine search over segment embeddings
+"""
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from langchain.schema import Document
+
+from app.services.ai.vector_index import NumpyVectorIndex
+
+def _documents(count):
+    return [Document(page_content=f"segment {index}", metadata={"start_ms": index * 1000}) for index in range(count)]
+
+def test_results_are_ordered_by_cosine_similarity():
+    index = NumpyVectorIndex(_documents(3), [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]], embeddings=None)
+    
+    results = index.search_by_vectors([[0.0, 2.0]], k=3)[0]
+    
+    assert [doc.page_content for doc, _ in results] == ["segment 2", "segment 1", "segment 0"]
+    assert [score for _, score in results] == pytest.approx([1.0, 0.8, 0.0])
+
+def test_ties_keep_document_order():
+    index = NumpyVectorIndex(_documents(3), [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]], embeddings=None)
+    
+    results = index.search_by_vectors([[1.0, 0.0]], k=2)[0]
+    
+    assert [doc.page_content for doc, _ in results] == ["segment 0", "segment 1"]
+
+def test_many_queries_are_answered_in_one_call():
+    index = NumpyVectorIndex(_documents(2), [[1.0, 0.0], [0.0, 1.0]], embeddings=None)
+    
+    results = index.search_by_vectors([[1.0, 0.1], [0.1, 1.0]], k=1)
+    
+    assert [[doc.page_content for doc, _ in matches] for matches in results] == [["segment 0"], ["segment 1"]]
+
+def test_zero_vectors_never_match():
+    index = NumpyVectorIndex(_documents(2), [[0.0, 0.0], [0.0, 1.0]], embeddings=None)
+    
+    results = index.search_by_vectors([[1.0, 0.0]], k=2)[0]
+    
+    assert [score for _, score in results] == pytest.approx([0.0, 0.0])
+
+def test_empty_index_returns_empty_results():
+    index = NumpyVectorIndex([], [], embeddings=None)
+    
+    assert len(index) == 0
+    assert index.search_by_vectors([[1.0, 0.0]], k=3) == [[]]
+
+def test_mismatched_vectors_are_rejected():
+    with pytest.raises(ValueError):
+        NumpyVectorIndex(_documents(2), [[1.0, 0.0]], embeddings=None)
@@ -87,6 +87,7 @@ CREATE TABLE transcripts (
     language VARCHAR(10) DEFAULT 'en',
     confidence FLOAT,
     diarization_data JSONB,
+    topic_spans JSONB DEFAULT '[]',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -101,6 +102,7 @@ CREATE TABLE transcript_segments (
     text TEXT NOT NULL,
     confidence FLOAT,
     vector vector(1536), -- OpenAI embedding vector
+    vector_hash VARCHAR(64), -- sha256 of embedding model + text the vector was computed from
     topic VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -116,6 +118,7 @@ CREATE TABLE drafts (
     status draft_status DEFAULT 'draft',
     seo_data JSONB DEFAULT '{}',
     citations JSONB DEFAULT '[]',
+    generation_state JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );